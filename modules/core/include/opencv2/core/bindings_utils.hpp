@@ -43,6 +43,21 @@ AsyncArray testAsyncException()
     return p.getArrayResult();
 }
 
+CV_WRAP static inline
+size_t testVectorOfPoint2f(const std::vector<Point2f>& points)
+{
+    return points.size();
+}
+
+CV_WRAP static inline
+size_t testVectorOfVectorOfPoint(const std::vector<std::vector<Point> >& contours)
+{
+    size_t total = 0;
+    for (size_t i = 0; i < contours.size(); i++)
+        total += contours[i].size();
+    return total;
+}
+
 //! @}
 }} // namespace
 
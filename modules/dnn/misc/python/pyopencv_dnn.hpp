@@ -77,50 +77,74 @@ PyObject* pyopencv_from(const dnn::LayerParams& lp)
     return dict;
 }
 
+// Python layer interface:
+//   __init__(self, params, blobs)
+//   getMemoryShapes(self, inputs) -> list of output shapes, the outputs are allocated by the engine
+//   forward(self, inputs) -> list of outputs, they are copied into the engine's blobs
+//   forward(self, inputs, outputs) -> None, the outputs are written in-place,
+//     if the class sets forwardOutputs = True
+// The inputs and the outputs are numpy views of the layer's blobs (no copies), valid during the call only:
+// the memory of the blobs is reused by other layers. The inputs are read-only.
 class pycvLayer CV_FINAL : public dnn::Layer
 {
 public:
-    pycvLayer(const dnn::LayerParams &params, PyObject* pyLayer) : Layer(params)
+    pycvLayer(const dnn::LayerParams &params, PyObject* pyLayer) : Layer(params), forwardFn(NULL), outputsArg(false)
     {
-        PyGILState_STATE gstate;
-        gstate = PyGILState_Ensure();
+        PyEnsureGIL gil;
 
         PyObject* args = PyTuple_New(2);
         CV_Assert(!PyTuple_SetItem(args, 0, pyopencv_from(params)));
         CV_Assert(!PyTuple_SetItem(args, 1, pyopencv_from(params.blobs)));
         o = PyObject_CallObject(pyLayer, args);
-
         Py_DECREF(args);
-        PyGILState_Release(gstate);
-        if (!o)
+        if (o)
+        {
+            forwardFn = PyObject_GetAttrString(o, "forward");
+            outputsArg = forwardFn && acceptsOutputs(o);
+        }
+        if (!o || !forwardFn || PyErr_Occurred())
+        {
+            PyErr_Print();
+            Py_CLEAR(forwardFn);
+            Py_CLEAR(o);
             CV_Error(Error::StsError, "Failed to create an instance of custom layer");
+        }
+    }
+
+    ~pycvLayer()
+    {
+        if (!Py_IsInitialized())
+            return;
+        PyEnsureGIL gil;
+        Py_XDECREF(forwardFn);
+        Py_XDECREF(o);
     }
 
     static void registerLayer(const std::string& type, PyObject* o)
     {
-        std::map<std::string, std::vector<PyObject*> >::iterator it = pyLayers.find(type);
-        if (it != pyLayers.end())
+        std::map<std::string, std::vector<PyObject*> >::iterator it = pyLayers().find(type);
+        if (it != pyLayers().end())
             it->second.push_back(o);
         else
-            pyLayers[type] = std::vector<PyObject*>(1, o);
+            pyLayers()[type] = std::vector<PyObject*>(1, o);
     }
 
     static void unregisterLayer(const std::string& type)
     {
-        std::map<std::string, std::vector<PyObject*> >::iterator it = pyLayers.find(type);
-        if (it != pyLayers.end())
+        std::map<std::string, std::vector<PyObject*> >::iterator it = pyLayers().find(type);
+        if (it != pyLayers().end())
         {
             if (it->second.size() > 1)
                 it->second.pop_back();
             else
-                pyLayers.erase(it);
+                pyLayers().erase(it);
         }
     }
 
     static Ptr<dnn::Layer> create(dnn::LayerParams &params)
     {
-        std::map<std::string, std::vector<PyObject*> >::iterator it = pyLayers.find(params.type);
-        if (it == pyLayers.end())
+        std::map<std::string, std::vector<PyObject*> >::iterator it = pyLayers().find(params.type);
+        if (it == pyLayers().end())
             CV_Error(Error::StsNotImplemented, "Layer with a type \"" + params.type +
                                                "\" is not implemented");
         CV_Assert(!it->second.empty());
@@ -132,58 +156,129 @@ public:
                                  std::vector<std::vector<int> > &outputs,
                                  std::vector<std::vector<int> > &) const CV_OVERRIDE
     {
-        PyGILState_STATE gstate;
-        gstate = PyGILState_Ensure();
+        // the shapes are requested for every allocation of the network, Python is called once per input shapes
+        if (!cachedOutputShapes.empty() && inputs == cachedInputShapes)
+        {
+            outputs = cachedOutputShapes;
+            return false;
+        }
 
-        PyObject* args = PyList_New(inputs.size());
-        for(size_t i = 0; i < inputs.size(); ++i)
-            PyList_SetItem(args, i, pyopencv_from_generic_vec(inputs[i]));
+        bool ok = false;
+        {
+            PyEnsureGIL gil;
 
-        PyObject* res = PyObject_CallMethodObjArgs(o, PyString_FromString("getMemoryShapes"), args, NULL);
-        Py_DECREF(args);
-        PyGILState_Release(gstate);
-        if (!res)
+            PyObject* args = PyList_New(inputs.size());
+            for(size_t i = 0; i < inputs.size(); ++i)
+                PyList_SetItem(args, i, pyopencv_from_generic_vec(inputs[i]));
+
+            PyObject* res = PyObject_CallMethod(o, (char*)"getMemoryShapes", (char*)"(O)", args);
+            Py_DECREF(args);
+            if (res)
+                ok = pyopencv_to_generic_vec(res, outputs, ArgInfo("", 0));
+            else
+                PyErr_Print();
+            Py_XDECREF(res);
+        }
+        if (!ok)
             CV_Error(Error::StsNotImplemented, "Failed to call \"getMemoryShapes\" method");
-        CV_Assert(pyopencv_to_generic_vec(res, outputs, ArgInfo("", 0)));
+        cachedInputShapes = inputs;
+        cachedOutputShapes = outputs;
         return false;
     }
 
     virtual void forward(InputArrayOfArrays inputs_arr, OutputArrayOfArrays outputs_arr, OutputArrayOfArrays) CV_OVERRIDE
     {
-        PyGILState_STATE gstate;
-        gstate = PyGILState_Ensure();
-
         std::vector<Mat> inputs, outputs;
         inputs_arr.getMatVector(inputs);
         outputs_arr.getMatVector(outputs);
 
-        PyObject* args = pyopencv_from(inputs);
-        PyObject* res = PyObject_CallMethodObjArgs(o, PyString_FromString("forward"), args, NULL);
-        Py_DECREF(args);
-        PyGILState_Release(gstate);
-        if (!res)
-            CV_Error(Error::StsNotImplemented, "Failed to call \"forward\" method");
+        // GIL is taken once for the call and the conversions
+        std::string error;
+        {
+            PyEnsureGIL gil;
 
-        std::vector<Mat> pyOutputs;
-        CV_Assert(pyopencv_to(res, pyOutputs, ArgInfo("", 0)));
+            PyObject* pyInputs = viewsOf(inputs, false);
+            PyObject* pyOutputs = outputsArg ? viewsOf(outputs, true) : NULL;
+            PyObject* res = NULL;
+            if (pyInputs && (pyOutputs || !outputsArg))
+                res = PyObject_CallFunctionObjArgs(forwardFn, pyInputs, pyOutputs, NULL);
+            Py_XDECREF(pyInputs);
+            Py_XDECREF(pyOutputs);
+            if (!res)
+            {
+                PyErr_Print();
+                error = "Failed to call \"forward\" method";
+            }
+            else if (res != Py_None || !outputsArg)
+            {
+                std::vector<Mat> results;
+                if (!pyopencv_to(res, results, ArgInfo("", 0)))
+                    error = "\"forward\" method must return a list of arrays";
+                else
+                    error = copyResults(results, outputs);
+            }
+            Py_XDECREF(res);
+        }
+        if (!error.empty())
+            CV_Error(Error::StsNotImplemented, error);
+    }
+
+private:
+    // the layer opts in to forward(inputs, outputs) by the forwardOutputs attribute,
+    // the signature of "forward" is not inspected (it may be any callable)
+    static bool acceptsOutputs(PyObject* layer)
+    {
+        if (!PyObject_HasAttrString(layer, "forwardOutputs"))
+            return false;
+        PyObject* flag = PyObject_GetAttrString(layer, "forwardOutputs");
+        int res = flag ? PyObject_IsTrue(flag) : -1;
+        Py_XDECREF(flag);
+        return res > 0;  // errors are reported by the constructor
+    }
+
+    static PyObject* viewsOf(const std::vector<Mat>& blobs, bool writeable)
+    {
+        PyObject* list = PyList_New(blobs.size());
+        for (size_t i = 0; list && i < blobs.size(); ++i)
+        {
+            // blobs without reference counter are converted as before (copy)
+            PyObject* item = blobs[i].u ? pyopencv_wrap_Mat(blobs[i], writeable) : pyopencv_from(blobs[i]);
+            if (!item)
+                Py_CLEAR(list);
+            else
+                PyList_SetItem(list, i, item);
+        }
+        return list;
+    }
 
-        CV_Assert(pyOutputs.size() == outputs.size());
+    static std::string copyResults(const std::vector<Mat>& results, std::vector<Mat>& outputs)
+    {
+        if (results.size() != outputs.size())
+            return "\"forward\" method returned a wrong number of outputs";
         for (size_t i = 0; i < outputs.size(); ++i)
         {
-            CV_Assert(pyOutputs[i].size == outputs[i].size);
-            CV_Assert(pyOutputs[i].type() == outputs[i].type());
-            pyOutputs[i].copyTo(outputs[i]);
+            if (results[i].size != outputs[i].size || results[i].type() != outputs[i].type())
+                return "\"forward\" method returned an output with a wrong shape or type";
+            if (results[i].data != outputs[i].data)  // the output view is returned
+                results[i].copyTo(outputs[i]);
         }
+        return std::string();
     }
 
-private:
     // Map layers types to python classes.
-    static std::map<std::string, std::vector<PyObject*> > pyLayers;
+    // The header is included by every shard of the bindings, so the map is a function-local static.
+    static std::map<std::string, std::vector<PyObject*> >& pyLayers()
+    {
+        static std::map<std::string, std::vector<PyObject*> > layers;
+        return layers;
+    }
+
     PyObject* o;  // Instance of implemented python layer.
+    PyObject* forwardFn;  // Bound "forward" method.
+    bool outputsArg;  // forward(inputs, outputs) is implemented (forwardOutputs = True).
+    mutable std::vector<std::vector<int> > cachedInputShapes, cachedOutputShapes;
 };
 
-std::map<std::string, std::vector<PyObject*> > pycvLayer::pyLayers;
-
 static PyObject *pyopencv_cv_dnn_registerLayer(PyObject*, PyObject *args, PyObject *kw)
 {
     const char *keywords[] = { "type", "class", NULL };
@@ -1,4 +1,5 @@
 #!/usr/bin/env python
+import functools
 import os
 import cv2 as cv
 import numpy as np
@@ -275,6 +276,48 @@ class dnn_test(NewOpenCVTests):
                 self.assertTrue(ret)
                 normAssert(self, refs[i], result, 'Index: %d' % i, 1e-10)
 
+    def test_custom_layer(self):
+        class ScaleLayer(object):
+            forwardOutputs = True
+
+            def __init__(self, params, blobs):
+                pass
+
+            def getMemoryShapes(self, inputs):
+                return inputs
+
+            # outputs are preallocated, inputs are read-only views of the blobs
+            def forward(self, inputs, outputs):
+                assert not inputs[0].flags.writeable
+                np.multiply(inputs[0], 2, out=outputs[0])
+
+        class LegacyScaleLayer(ScaleLayer):
+            forwardOutputs = False
+
+            def forward(self, inputs):
+                return [inputs[0] * 2]
+
+        class VarargsScaleLayer(ScaleLayer):
+            # forward() is not inspected, the outputs are passed by forwardOutputs only
+            def forward(self, *args):
+                np.multiply(args[0][0], 2, out=args[1][0])
+
+        class CallableScaleLayer(LegacyScaleLayer):
+            def __init__(self, params, blobs):
+                self.forward = functools.partial(LegacyScaleLayer.forward, self)
+
+        proto = b'input: "data" input_dim: 1 input_dim: 2 input_dim: 3 input_dim: 4 ' \
+                b'layer { name: "scale" type: "PyScale" bottom: "data" top: "scale" }'
+        inp = np.random.standard_normal([1, 2, 3, 4]).astype(np.float32)
+        for layer in [ScaleLayer, LegacyScaleLayer, VarargsScaleLayer, CallableScaleLayer]:
+            cv.dnn_registerLayer('PyScale', layer)
+            try:
+                net = cv.dnn.readNetFromCaffe(np.frombuffer(proto, np.uint8))
+                net.setInput(inp)
+                out = net.forward()
+            finally:
+                cv.dnn_unregisterLayer('PyScale')
+            normAssert(self, out, inp * 2)
 
 if __name__ == '__main__':
     NewOpenCVTests.bootstrap()
@@ -519,9 +519,9 @@ class JavaWrapperGenerator(object):
         for hdr in common_headers:
             logging.info("\n===== Common header : %s =====", hdr)
             includes.append('#include "' + hdr + '"')
-        for hdr in srcfiles:
-            decls = parser.parse(hdr)
-            self.namespaces = parser.namespaces
+        parsed = parser.parse_headers(srcfiles, cache_dir=os.path.join(output_path, 'hdr_parser_cache'))
+        self.namespaces = parser.namespaces
+        for hdr, decls in zip(srcfiles, parsed):
             logging.info("\n\n===== Header: %s =====", hdr)
             logging.info("Namespaces: %s", parser.namespaces)
             if decls:
@@ -717,8 +717,8 @@ class JSWrapperGenerator(object):
     def gen(self, dst_file, src_files, core_bindings):
         # step 1: scan the headers and extract classes, enums and functions
         headers = []
-        for hdr in src_files:
-            decls = self.parser.parse(hdr)
+        parsed = self.parser.parse_headers(src_files, cache_dir=os.path.join(os.path.dirname(os.path.abspath(dst_file)), 'hdr_parser_cache'))
+        for hdr, decls in zip(src_files, parsed):
             # print(hdr);
             # self.print_decls(decls);
             if len(decls) == 0:
@@ -19,7 +19,11 @@ if(NOT WIN32 AND NOT APPLE AND NOT OPENCV_PYTHON_SKIP_LINKER_EXCLUDE_LIBS)
   set(CMAKE_MODULE_LINKER_FLAGS "${CMAKE_MODULE_LINKER_FLAGS} -Wl,--exclude-libs=ALL")
 endif()
 
-ocv_add_library(${the_module} MODULE ${PYTHON_SOURCE_DIR}/src2/cv2.cpp ${cv2_generated_hdrs} ${opencv_userdef_hdrs} ${cv2_custom_hdr})
+# shards of the generated wrappers, see OPENCV_PYTHON_BINDINGS_SHARDS
+if(OPENCV_PYTHON_BINDINGS_SOURCES)
+  set_source_files_properties(${OPENCV_PYTHON_BINDINGS_SOURCES} PROPERTIES GENERATED TRUE)
+endif()
+ocv_add_library(${the_module} MODULE ${PYTHON_SOURCE_DIR}/src2/cv2.cpp ${OPENCV_PYTHON_BINDINGS_SOURCES} ${cv2_generated_hdrs} ${opencv_userdef_hdrs} ${cv2_custom_hdr})
 if(TARGET gen_opencv_python_source)
   add_dependencies(${the_module} gen_opencv_python_source)
 endif()
@@ -78,6 +78,9 @@ def bootstrap():
     del sys.modules['cv2']
     import cv2
 
+    # Python submodules of the package (cv2.aio) are imported from the loader directory
+    cv2.__path__ = [LOADER_DIR]
+
     try:
         import sys
         del sys.OpenCV_LOADER
@@ -0,0 +1,217 @@
+'''
+cv2.aio - asyncio interface of the OpenCV functions.
+
+Every function of the cv2 module and of its submodules is available here as
+a coroutine function with the same name and arguments:
+
+    gray = await cv2.aio.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    net_out = await cv2.aio.call(net.forwardAsync)
+
+The calls are executed by a bounded thread pool, so the event loop is not
+blocked while OpenCV is working (the wrappers release GIL). The number of calls
+submitted from one event loop and not finished yet is limited: when the limit
+is reached, the next call waits for a free slot (backpressure).
+
+Cancellation of a call which has not been started yet removes it from the
+executor queue. A running OpenCV call can't be interrupted, its result is
+dropped. cv2.AsyncArray results (Net.forwardAsync, ...) are awaited without
+blocking the event loop.
+
+The module is a part of the cv2 package (see __init__.py), it is imported on
+the first access of cv2.aio. The coroutine functions are made on the first
+access of the name. It is installed with the Python 3.5+ loader only: the
+builds with OPENCV_SKIP_PYTHON_LOADER have no cv2.aio.
+'''
+
+import asyncio
+import concurrent.futures
+import functools
+import os
+import sys
+import threading
+import types
+import weakref
+
+import cv2 as _cv2  # the native module
+
+_lock = threading.Lock()
+_executor = None
+_own_executor = None
+_max_workers = max(1, min(4, os.cpu_count() or 1))
+_max_pending = 0
+_limits = weakref.WeakKeyDictionary()  # event loop -> (limit, semaphore)
+
+_WAIT_SLICE_NS = 50 * 1000 * 1000  # period of the cancellation checks in wait()
+
+
+def setMaxWorkers(max_workers):
+    '''
+    Sets the number of threads of the default executor.
+    '''
+    global _max_workers, _own_executor
+    if max_workers < 1:
+        raise ValueError('max_workers must be positive')
+    with _lock:
+        _max_workers = int(max_workers)
+        old, _own_executor = _own_executor, None
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+def setExecutor(executor):
+    '''
+    Sets the concurrent.futures.Executor for the calls. None restores the default
+    thread pool (see setMaxWorkers).
+    '''
+    global _executor
+    if executor is not None and not isinstance(executor, concurrent.futures.Executor):
+        raise TypeError('executor must be concurrent.futures.Executor or None')
+    with _lock:
+        _executor = executor
+
+
+def getExecutor():
+    '''
+    Returns the executor of the calls.
+    '''
+    global _own_executor
+    with _lock:
+        if _executor is not None:
+            return _executor
+        if _own_executor is None:
+            _own_executor = concurrent.futures.ThreadPoolExecutor(_max_workers, thread_name_prefix='cv2.aio')
+        return _own_executor
+
+
+def setMaxPending(max_pending):
+    '''
+    Sets the maximal number of unfinished calls per event loop.
+    0 means twice the number of workers of the default executor.
+    '''
+    global _max_pending
+    if max_pending < 0:
+        raise ValueError('max_pending must be non-negative')
+    with _lock:
+        _max_pending = int(max_pending)
+
+
+def getMaxPending():
+    '''
+    Returns the effective limit of unfinished calls per event loop.
+    '''
+    with _lock:
+        return _max_pending or 2 * _max_workers
+
+
+def _get_semaphore(loop):
+    limit = getMaxPending()
+    entry = _limits.get(loop)
+    if entry is None or entry[0] != limit:
+        # calls in flight release the previous semaphore
+        entry = (limit, asyncio.Semaphore(limit))
+        _limits[loop] = entry
+    return entry[1]
+
+
+def _release(loop, semaphore, _future):
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:  # event loop is closed
+        pass
+
+
+async def _submit(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    semaphore = _get_semaphore(loop)
+    await semaphore.acquire()
+    try:
+        future = getExecutor().submit(fn, *args, **kwargs)
+    except BaseException:
+        semaphore.release()
+        raise
+    # the slot is free when the call is really finished, not when the awaiting task is cancelled
+    future.add_done_callback(functools.partial(_release, loop, semaphore))
+    return await asyncio.wrap_future(future, loop=loop)
+
+
+async def wait(async_array):
+    '''
+    Waits for cv2.AsyncArray and returns its result.
+    '''
+    while not async_array.wait_for(0):
+        await _submit(async_array.wait_for, _WAIT_SLICE_NS)
+    return async_array.get()
+
+
+async def call(fn, *args, **kwargs):
+    '''
+    Calls fn(*args, **kwargs) in the executor. cv2.AsyncArray result is awaited.
+    '''
+    result = await _submit(fn, *args, **kwargs)
+    if isinstance(result, _cv2.AsyncArray):
+        return await wait(result)
+    return result
+
+
+def _resolve(path):
+    obj = _cv2
+    for name in path:
+        obj = getattr(obj, name)
+    return obj
+
+
+def _make_wrapper(path):
+    async def wrapper(*args, **kwargs):
+        return await call(_resolve(path), *args, **kwargs)
+    wrapper.__name__ = path[-1]
+    wrapper.__qualname__ = path[-1]
+    wrapper.__doc__ = 'Asynchronous cv2.%s(), see help(cv2.%s)' % (('.'.join(path),) * 2)
+    return wrapper
+
+
+def _is_exported(obj):
+    # functions and submodules of the native module
+    return isinstance(obj, types.BuiltinFunctionType) or \
+        (isinstance(obj, types.ModuleType) and obj is not sys.modules[__name__])
+
+
+def _lookup(path, name):
+    # coroutine function for the function of the native module, namespace for the submodule
+    obj = getattr(_resolve(path), name, None) if not name.startswith('__') else None
+    if not _is_exported(obj):
+        raise AttributeError("module '%s' has no attribute '%s'" % ('.'.join([__name__] + path), name))
+    if isinstance(obj, types.ModuleType):
+        return _Namespace(path + [name])
+    return _make_wrapper(path + [name])
+
+
+def _names(path):
+    module = _resolve(path)
+    return [name for name in dir(module) if not name.startswith('__') and _is_exported(getattr(module, name))]
+
+
+class _Namespace(object):
+    def __init__(self, path):
+        self.__name__ = '.'.join([__name__] + path)
+        self._path = path
+
+    def __repr__(self):
+        return '<namespace %r>' % self.__name__
+
+    def __getattr__(self, name):
+        value = _lookup(self._path, name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(_names(self._path))
+
+
+def __getattr__(name):
+    value = _lookup([], name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_names([])))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+'''
+Event loop latency while OpenCV functions are called from asyncio code
+(Python 3.7+).
+
+A ticker task sleeps for 1 ms in a loop and records how late it wakes up.
+The same batch of GaussianBlur calls is executed directly in the coroutine
+(blocking the event loop) and through cv.aio (the executor threads).
+
+Usage:
+    perf_aio.py [-n N] [--size WxH] [--workers N]
+'''
+
+from __future__ import print_function
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+import cv2 as cv
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100.0))]
+
+
+async def ticker(delays, stop):
+    while not stop.is_set():
+        t = time.perf_counter()
+        await asyncio.sleep(0.001)
+        delays.append(time.perf_counter() - t - 0.001)
+
+
+async def run(workload, images):
+    delays = []
+    stop = asyncio.Event()
+    tick = asyncio.ensure_future(ticker(delays, stop))
+    await asyncio.sleep(0.01)
+    t = time.perf_counter()
+    await workload(images)
+    elapsed = time.perf_counter() - t
+    stop.set()
+    await tick
+    return elapsed, delays
+
+
+async def blocking(images):
+    for img in images:
+        cv.GaussianBlur(img, (31, 31), 0)
+        await asyncio.sleep(0)
+
+
+async def offloaded(images):
+    await asyncio.gather(*[cv.aio.GaussianBlur(img, (31, 31), 0) for img in images])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the event loop latency with cv.aio')
+    parser.add_argument('-n', type=int, default=64, help='Number of calls (default: %(default)s)')
+    parser.add_argument('--size', default='1280x720', help='Image size (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=0, help='Executor threads, 0 - default (default: %(default)s)')
+    args = parser.parse_args()
+
+    if args.workers:
+        cv.aio.setMaxWorkers(args.workers)
+    w, h = [int(v) for v in args.size.split('x')]
+    images = [np.random.randint(0, 256, (h, w, 3), np.uint8) for _ in range(args.n)]
+
+    print('{} calls of GaussianBlur on {}x{}, max pending calls: {}'.format(args.n, w, h, cv.aio.getMaxPending()))
+    print('{:>10}  {:>10}  {:>10}  {:>10}  {:>10}'.format('mode', 'total, ms', 'p50, ms', 'p99, ms', 'max, ms'))
+    for name, workload in [('blocking', blocking), ('cv.aio', offloaded)]:
+        elapsed, delays = asyncio.run(run(workload, images))
+        print('{:>10}  {:10.1f}  {:10.2f}  {:10.2f}  {:10.2f}'.format(
+            name, elapsed * 1e3, percentile(delays, 50) * 1e3, percentile(delays, 99) * 1e3, max(delays) * 1e3))
+
+
+if __name__ == '__main__':
+    main()
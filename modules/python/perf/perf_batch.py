@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+'''
+Throughput of a Python loop over images compared with cv.utils.batch(),
+which releases GIL once and runs the calls with parallel_for_().
+
+Usage:
+    perf_batch.py [-n N] [--size WxH]
+'''
+
+from __future__ import print_function
+
+import argparse
+
+import numpy as np
+import cv2 as cv
+
+from perf_common import measure
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of batch calls')
+    parser.add_argument('-n', type=int, default=256, help='Number of images in the batch (default: %(default)s)')
+    parser.add_argument('--size', default='160x120', help='Image size (default: %(default)s)')
+    args = parser.parse_args()
+
+    w, h = [int(v) for v in args.size.split('x')]
+    images = [np.random.randint(0, 256, (h, w, 3), np.uint8) for _ in range(args.n)]
+    cases = [
+        ('resize', cv.resize, ((64, 64),), dict(interpolation=cv.INTER_AREA)),
+        ('cvtColor', cv.cvtColor, (cv.COLOR_BGR2GRAY,), {}),
+        ('GaussianBlur', cv.GaussianBlur, ((5, 5), 0), {}),
+    ]
+
+    print('{} images of {}x{}, {} threads'.format(args.n, w, h, cv.getNumThreads()))
+    print('{:>14}  {:>12}  {:>12}  {:>8}'.format('function', 'loop, us', 'batch, us', 'speedup'))
+    for name, fn, fn_args, fn_kw in cases:
+        t_loop = measure(lambda: [fn(img, *fn_args, **fn_kw) for img in images])
+        t_batch = measure(lambda: cv.utils.batch(fn, images, *fn_args, **fn_kw))
+        print('{:>14}  {:12.1f}  {:12.1f}  {:7.2f}x'.format(name, t_loop * 1e-3, t_batch * 1e-3, t_loop / t_batch))
+
+
+if __name__ == '__main__':
+    main()
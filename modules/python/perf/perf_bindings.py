@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+'''
+Overhead of the Python boundary of the generated wrappers.
+
+Representative wrappers are called with tiny inputs, so the time is spent in
+argument parsing, overload selection, ndarray <-> Mat and vector conversions
+and building of the results, not in the algorithms:
+
+    noArgGetter      - function/method without arguments returning a number
+    scalarOnly       - numeric arguments and result
+    oneMat           - one ndarray in, one ndarray out
+    threeOverloads   - function with Mat/UMat/GpuMat variants (the variant is selected by the argument type)
+    vectorPoint2fIn  - std::vector<Point2f> argument
+    vectorKeyPointOut - std::vector<KeyPoint> result
+
+Results are printed in ns/call. With --output they are also written as
+a Google Test XML log with the performance metrics of the OpenCV perf tests,
+so the runs of different builds can be compared by modules/ts/misc/summary.py:
+
+    perf_bindings.py -o before.xml
+    perf_bindings.py -o after.xml
+    python modules/ts/misc/summary.py -u ns before.xml after.xml
+
+Usage:
+    perf_bindings.py [-o FILE.xml] [-f REGEX] [--samples N]
+'''
+
+from __future__ import print_function
+
+import argparse
+import datetime
+import math
+import platform
+import re
+import sys
+import timeit
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import cv2 as cv
+
+from perf_common import print_results
+
+
+TICK_FREQUENCY = 10**9  # metrics are stored in nanoseconds
+
+
+def make_cases():
+    '''
+    Returns the list of (name, value_param, fn, args).
+    '''
+    orb = cv.ORB_create()
+    img = np.zeros((4, 4), np.uint8)
+    points = [(float(i), float(i)) for i in range(16)]
+    return [
+        ('noArgGetter', 'function', cv.getNumThreads, ()),
+        ('noArgGetter', 'method', orb.getMaxFeatures, ()),
+        ('scalarOnly', 'int', cv.getOptimalDFTSize, (100,)),
+        ('oneMat', '4x4 8UC1', cv.bitwise_not, (img,)),
+        ('threeOverloads', 'Mat', cv.cuda.createContinuous, (4, 4, cv.CV_8UC1, img)),
+        ('threeOverloads', 'UMat', cv.cuda.createContinuous, (4, 4, cv.CV_8UC1, cv.UMat(img))),
+        ('vectorPoint2fIn', '16 tuples', cv.utils.testVectorOfPoint2f, (points,)),
+        ('vectorPoint2fIn', '16 ndarray', cv.utils.testVectorOfPoint2f, (np.float32(points).reshape(-1, 1, 2),)),
+        ('vectorKeyPointOut', '16', cv.KeyPoint_convert, (points,)),
+    ]
+
+
+def run_case(fn, args, samples):
+    '''
+    Returns the list of ns/call values, one per sample.
+    '''
+    timer = timeit.Timer(lambda: fn(*args))
+    number, _ = timer.autorange()
+    number = max(1, number // 10)  # ~20 ms per sample
+    return [t * 1e9 / number for t in timer.repeat(repeat=samples, number=number)]
+
+
+def metrics(values):
+    values = sorted(values)
+    n = len(values)
+    mean = sum(values) / n
+    gmean = math.exp(sum(math.log(v) for v in values) / n)
+    median = values[n // 2] if n % 2 else (values[n // 2 - 1] + values[n // 2]) / 2
+    stddev = math.sqrt(sum((v - mean) ** 2 for v in values) / n)
+    gstddev = math.sqrt(sum(math.log(v / gmean) ** 2 for v in values) / n)
+    return dict(samples=n, outliers=0, frequency=TICK_FREQUENCY, min=int(round(values[0])),
+                median=int(round(median)), gmean=int(round(gmean)), mean=int(round(mean)),
+                stddev=int(round(stddev)), gstddev=gstddev)
+
+
+def write_xml(filename, results, elapsed):
+    '''
+    Writes the results as Google Test XML log (see modules/ts/misc/testlog_parser.py).
+    '''
+    root = ET.Element('testsuites', {
+        'tests': str(len(results)), 'failures': '0', 'disabled': '0', 'errors': '0',
+        'timestamp': datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+        'time': '%.3f' % elapsed, 'name': 'AllTests',
+        'cv_module_name': 'python_bindings',
+        'cv_version': cv.__version__,
+        'cv_python_version': platform.python_version(),
+        'cv_numpy_version': np.__version__,
+        'cv_cpu_count': str(cv.getNumberOfCPUs()),
+    })
+    suite = ET.SubElement(root, 'testsuite', {
+        'name': 'Bindings', 'tests': str(len(results)), 'failures': '0', 'disabled': '0', 'errors': '0',
+        'time': '%.3f' % elapsed,
+    })
+    index = {}
+    for name, param, m in results:
+        i = index.setdefault(name, 0)
+        index[name] = i + 1
+        attrs = {'name': '%s/%d' % (name, i), 'value_param': param, 'status': 'run',
+                 'time': '%.3f' % (m['mean'] * m['samples'] * 1e-9), 'classname': 'Bindings'}
+        attrs.update((k, str(v)) for k, v in m.items())
+        ET.SubElement(suite, 'testcase', attrs)
+    ET.ElementTree(root).write(filename, encoding='UTF-8', xml_declaration=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the Python bindings overhead')
+    parser.add_argument('-o', '--output', metavar='FILE', help='Write the results into XML file for summary.py')
+    parser.add_argument('-f', '--filter', metavar='REGEX', help='Run the cases with matching "name::param" only')
+    parser.add_argument('--samples', type=int, default=10, help='Number of samples per case (default: %(default)s)')
+    args = parser.parse_args()
+
+    expr = re.compile(args.filter) if args.filter else None
+    start = timeit.default_timer()
+    results = []
+    for name, param, fn, fn_args in make_cases():
+        if expr and not expr.search(name + '::' + param):
+            continue
+        results.append((name, param, metrics(run_case(fn, fn_args, args.samples))))
+    elapsed = timeit.default_timer() - start
+
+    print_results('Binding overhead (median of %d samples):' % args.samples,
+                  [(name + ' (' + param + ')', m['median']) for name, param, m in results])
+    if args.output:
+        write_xml(args.output, results, elapsed)
+        print('Results are written into', args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+'''
+Per-frame time of a cvtColor -> GaussianBlur -> Canny pipeline with and
+without the pool of numpy output buffers (cv.setNumpyBufferPool).
+
+Usage:
+    perf_buffer_pool.py [--pool-mb N]
+'''
+
+from __future__ import print_function
+
+import argparse
+
+import numpy as np
+import cv2 as cv
+
+from perf_common import measure
+
+
+def pipeline(frame):
+    gray = cv.cvtColor(frame, cv.COLOR_BGR2GRAY)
+    blurred = cv.GaussianBlur(gray, (5, 5), 0)
+    return cv.Canny(blurred, 50, 150)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the numpy buffer pool')
+    parser.add_argument('--pool-mb', type=int, default=64, help='Pool budget in megabytes (default: %(default)s)')
+    args = parser.parse_args()
+
+    print('{:>10}  {:>12}  {:>12}  {:>8}'.format('frame', 'no pool, us', 'pool, us', 'speedup'))
+    for w, h in [(320, 240), (640, 480), (1280, 720), (1920, 1080)]:
+        frame = np.random.randint(0, 256, (h, w, 3), np.uint8)
+        cv.setNumpyBufferPool(0)
+        t_base = measure(pipeline, frame)
+        cv.setNumpyBufferPool(args.pool_mb << 20)
+        t_pool = measure(pipeline, frame)
+        stats = cv.getNumpyBufferPoolStats()
+        cv.setNumpyBufferPool(0)
+        print('{:>10}  {:12.1f}  {:12.1f}  {:7.2f}x   hits={hits} misses={misses} evictions={evictions}'.format(
+            '%dx%d' % (w, h), t_base * 1e-3, t_pool * 1e-3, t_base / t_pool, **stats))
+
+
+if __name__ == '__main__':
+    main()
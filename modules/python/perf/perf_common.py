@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+'''
+Common routines for the microbenchmarks of the Python bindings.
+
+The benchmarks call the wrapped functions with tiny inputs, so the measured
+time is dominated by the cost of the Python <-> C++ boundary
+(argument parsing, overload selection and conversions).
+'''
+
+from __future__ import print_function
+
+import timeit
+
+
+def measure(fn, *args, **kw):
+    '''
+    Returns the time of a single fn(*args, **kw) call in nanoseconds.
+    The number of calls per repetition is calibrated to take ~0.2 sec,
+    the best of 5 repetitions is reported.
+    '''
+    call = lambda: fn(*args, **kw)
+    timer = timeit.Timer(call)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=5, number=number))
+    return best * 1e9 / number
+
+
+def print_results(title, results):
+    '''
+    Prints the list of (name, ns_per_call) pairs as a table.
+    '''
+    print(title)
+    width = max([len(name) for name, _ in results] + [4])
+    for name, ns in results:
+        print('    {}  {:10.1f} ns/call'.format(name.ljust(width), ns))
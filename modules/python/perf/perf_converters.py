@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+'''
+Conversion time of point sequences passed as std::vector arguments.
+
+Python lists of (x, y) tuples are compared with the equivalent numpy arrays
+for 10^3 - 10^6 points. Tuple subclasses are not handled by the bulk
+conversion of plain lists/tuples, so they show the cost of the generic
+per-item path.
+
+Usage:
+    perf_converters.py [--max-points N]
+'''
+
+from __future__ import print_function
+
+import argparse
+
+import numpy as np
+import cv2 as cv
+
+from perf_common import measure
+
+
+class PointTuple(tuple):
+    pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of point sequence conversions')
+    parser.add_argument('--max-points', type=int, default=10**6, help='Largest number of points (default: %(default)s)')
+    args = parser.parse_args()
+
+    sizes = [n for n in [10**3, 10**4, 10**5, 10**6] if n <= args.max_points]
+    print('{:>8}  {:>24}  {:>12}  {:>12}  {:>12}'.format('points', 'case', 'ns/call', 'ns/point', 'vs ndarray'))
+    for n in sizes:
+        pts = [(float(i % 640), float(i // 640)) for i in range(n)]
+        arr = np.float32(pts).reshape(-1, 1, 2)
+        contours = [pts[i:i + 100] for i in range(0, n, 100)]
+        cases = [
+            ('ndarray', cv.utils.testVectorOfPoint2f, arr),
+            ('list of tuples', cv.utils.testVectorOfPoint2f, pts),
+            ('list of lists', cv.utils.testVectorOfPoint2f, [list(p) for p in pts]),
+            ('list of tuple subclass', cv.utils.testVectorOfPoint2f, [PointTuple(p) for p in pts]),
+            ('contours (100 points)', cv.utils.testVectorOfVectorOfPoint, contours),
+        ]
+        base = None
+        for name, fn, data in cases:
+            ns = measure(fn, data)
+            base = base or ns
+            print('{:>8}  {:>24}  {:12.0f}  {:12.2f}  {:11.1f}x'.format(n, name, ns, ns / n, ns / base))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+'''
+Time of the element moving functions (flip, transpose, copyTo) called with
+int64 and float16 arrays, compared with the natively supported int32 and
+float32 arrays of the same shape.
+
+int64 arrays are passed to these functions as 8-byte data without the cast
+to int32, float16 arrays are mapped to CV_16F. cv.utils.trackConversions()
+reports the implicit copies made by each case.
+
+Usage:
+    perf_dtypes.py [--size WxH]
+'''
+
+from __future__ import print_function
+
+import argparse
+
+import numpy as np
+import cv2 as cv
+
+from perf_common import measure
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of int64 and float16 array arguments')
+    parser.add_argument('--size', default='1920x1080', help='Array size (default: %(default)s)')
+    args = parser.parse_args()
+
+    w, h = [int(v) for v in args.size.split('x')]
+    functions = [
+        ('flip', lambda a: cv.flip(a, 0)),
+        ('transpose', lambda a: cv.transpose(a)),
+        ('copyTo', lambda a: cv.copyTo(a, None)),
+    ]
+    dtypes = [np.int32, np.int64, np.float32, np.float16]
+
+    print('{}x{} arrays'.format(w, h))
+    print('{:>10}  {:>8}  {:>12}  {:>12}  {:>14}'.format('function', 'dtype', 'us/call', 'GB/s', 'copied bytes'))
+    for name, fn in functions:
+        for dtype in dtypes:
+            a = np.random.randint(0, 100, (h, w)).astype(dtype)
+            with cv.utils.trackConversions() as records:
+                fn(a)
+            ns = measure(fn, a)
+            print('{:>10}  {:>8}  {:12.1f}  {:12.2f}  {:14d}'.format(
+                name, np.dtype(dtype).name, ns * 1e-3, 2.0 * a.nbytes / ns, sum(r['bytes'] for r in records)))
+
+
+if __name__ == '__main__':
+    main()
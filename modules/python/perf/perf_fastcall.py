@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+'''
+Calls per second of small wrapped functions, dominated by the argument parsing.
+
+Generated wrappers use METH_FASTCALL calling convention with precomputed
+keywords tables where Python supports it (3.7+, non-limited API).
+To get the "before" numbers build the bindings with -DCVPY_DISABLE_FASTCALL
+in CMAKE_CXX_FLAGS and run this script against both builds.
+
+Usage:
+    perf_fastcall.py
+'''
+
+from __future__ import print_function
+
+import numpy as np
+import cv2 as cv
+
+from perf_common import measure
+
+
+def main():
+    a = np.float32([[1, 2], [3, 4]])
+    b = np.float32([[4, 3], [2, 1]])
+    contour = np.float32([[0, 0], [10, 0], [10, 10], [0, 10]])
+
+    cases = [
+        ('norm(a)', lambda: cv.norm(a)),
+        ('norm(a, b, NORM_L1)', lambda: cv.norm(a, b, cv.NORM_L1)),
+        ('norm(src1=a, normType=NORM_L1)', lambda: cv.norm(src1=a, normType=cv.NORM_L1)),
+        ('pointPolygonTest', lambda: cv.pointPolygonTest(contour, (5, 5), False)),
+        ('pointPolygonTest(measureDist=True)', lambda: cv.pointPolygonTest(contour, (5, 5), measureDist=True)),
+        ('getRotationMatrix2D', lambda: cv.getRotationMatrix2D((5, 5), 30, 1.0)),
+    ]
+
+    print('Calls per second:')
+    width = max([len(name) for name, _ in cases])
+    for name, fn in cases:
+        ns = measure(fn)
+        print('    {}  {:12.0f} calls/s  ({:.1f} ns/call)'.format(name.ljust(width), 1e9 / ns, ns))
+
+
+if __name__ == '__main__':
+    main()
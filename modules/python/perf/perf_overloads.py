@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+'''
+Per-call overhead of the overloaded wrappers for each overload position.
+
+cv.resize and cv.remap have Mat, UMat (and GpuMat for CUDA builds) variants.
+The reported time of the UMat/GpuMat calls should stay close to the Mat one,
+as the variant is selected by the type of the array argument.
+
+Usage:
+    perf_overloads.py
+'''
+
+from __future__ import print_function
+
+import numpy as np
+import cv2 as cv
+
+from perf_common import measure, print_results
+
+
+def main():
+    img = np.zeros((4, 4), np.uint8)
+    mapx = np.zeros((4, 4), np.float32)
+    mapy = np.zeros((4, 4), np.float32)
+    arrays = [('Mat (variant 0)', img, mapx, mapy),
+              ('UMat (variant 1)', cv.UMat(img), cv.UMat(mapx), cv.UMat(mapy))]
+    if cv.cuda.getCudaEnabledDeviceCount() > 0:
+        upload = lambda a: cv.cuda_GpuMat(a)
+        arrays.append(('GpuMat', upload(img), upload(mapx), upload(mapy)))
+
+    results = []
+    for name, src, mx, my in arrays:
+        results.append(('resize ' + name, measure(cv.resize, src, (4, 4))))
+    for name, src, mx, my in arrays:
+        results.append(('remap ' + name, measure(cv.remap, src, mx, my, cv.INTER_NEAREST)))
+    print_results('Overloaded function call overhead:', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -26,6 +26,16 @@ set(PYTHON_LOADER_FILES
     "setup.py" "cv2/__init__.py"
     "cv2/load_config_py2.py" "cv2/load_config_py3.py"
 )
+# cv2.aio (async/await syntax) is a module of the loader package, it requires Python 3.5+ loader.
+# There is no cv2 package with OPENCV_SKIP_PYTHON_LOADER, so cv2.aio is not available then.
+if(DEFINED PYTHON)  # installed loader of the ${PYTHON} bindings
+  set(__python_loader_version "${${PYTHON}_VERSION_STRING}")
+else()  # build tree loader: Python 2 bindings never import cv2.aio
+  set(__python_loader_version "${PYTHON3_VERSION_STRING}")
+endif()
+if(__python_loader_version AND NOT __python_loader_version VERSION_LESS "3.5")
+  list(APPEND PYTHON_LOADER_FILES "cv2/aio.py")
+endif()
 foreach(fname ${PYTHON_LOADER_FILES})
   get_filename_component(__dir "${fname}" DIRECTORY)
   file(COPY "${PYTHON_SOURCE_DIR}/package/${fname}" DESTINATION "${__loader_path}/${__dir}")
@@ -1,1422 +1,260 @@
-//warning number '5033' not a valid compiler warning in vc12
-#if defined(_MSC_VER) && (_MSC_VER > 1800)
-// eliminating duplicated round() declaration
-#define HAVE_ROUND 1
-#pragma warning(push)
-#pragma warning(disable:5033)  // 'register' is no longer a supported storage class
-#endif
-
-// #define CVPY_DYNAMIC_INIT
-// #define Py_DEBUG
-
-#if defined(CVPY_DYNAMIC_INIT) && !defined(Py_DEBUG)
-#   define Py_LIMITED_API 0x03030000
-#endif
-
-#include <math.h>
-#include <Python.h>
-
-#if PY_MAJOR_VERSION < 3
-#undef CVPY_DYNAMIC_INIT
-#endif
-
-#if defined(_MSC_VER) && (_MSC_VER > 1800)
-#pragma warning(pop)
-#endif
-
-#define MODULESTR "cv2"
-#define NPY_NO_DEPRECATED_API NPY_1_7_API_VERSION
-
-#include <numpy/ndarrayobject.h>
-
-#include "pyopencv_generated_include.h"
-#include "opencv2/core/types_c.h"
-#include "opencv2/opencv_modules.hpp"
-#include "pycompat.hpp"
-#include <map>
-
-#include <type_traits>  // std::enable_if
-
-template<typename T, class TEnable = void>  // TEnable is used for SFINAE checks
-struct PyOpenCV_Converter
-{
-    //static inline bool to(PyObject* obj, T& p, const char* name);
-    //static inline PyObject* from(const T& src);
-};
-
-template<typename T> static
-bool pyopencv_to(PyObject* obj, T& p, const char* name = "<unknown>") { return PyOpenCV_Converter<T>::to(obj, p, name); }
-
-template<typename T> static
-PyObject* pyopencv_from(const T& src) { return PyOpenCV_Converter<T>::from(src); }
-
-static PyObject* opencv_error = NULL;
-
-static int failmsg(const char *fmt, ...)
-{
-    char str[1000];
-
-    va_list ap;
-    va_start(ap, fmt);
-    vsnprintf(str, sizeof(str), fmt, ap);
-    va_end(ap);
-
-    PyErr_SetString(PyExc_TypeError, str);
-    return 0;
-}
-
-struct ArgInfo
-{
-    const char * name;
-    bool outputarg;
-    // more fields may be added if necessary
-
-    ArgInfo(const char * name_, bool outputarg_)
-        : name(name_)
-        , outputarg(outputarg_) {}
-
-    // to match with older pyopencv_to function signature
-    operator const char *() const { return name; }
-};
-
-class PyAllowThreads
-{
-public:
-    PyAllowThreads() : _state(PyEval_SaveThread()) {}
-    ~PyAllowThreads()
-    {
-        PyEval_RestoreThread(_state);
-    }
-private:
-    PyThreadState* _state;
-};
-
-class PyEnsureGIL
-{
-public:
-    PyEnsureGIL() : _state(PyGILState_Ensure()) {}
-    ~PyEnsureGIL()
-    {
-        PyGILState_Release(_state);
-    }
-private:
-    PyGILState_STATE _state;
-};
-
-#define ERRWRAP2(expr) \
-try \
-{ \
-    PyAllowThreads allowThreads; \
-    expr; \
-} \
-catch (const cv::Exception &e) \
-{ \
-    PyObject_SetAttrString(opencv_error, "file", PyString_FromString(e.file.c_str())); \
-    PyObject_SetAttrString(opencv_error, "func", PyString_FromString(e.func.c_str())); \
-    PyObject_SetAttrString(opencv_error, "line", PyInt_FromLong(e.line)); \
-    PyObject_SetAttrString(opencv_error, "code", PyInt_FromLong(e.code)); \
-    PyObject_SetAttrString(opencv_error, "msg", PyString_FromString(e.msg.c_str())); \
-    PyObject_SetAttrString(opencv_error, "err", PyString_FromString(e.err.c_str())); \
-    PyErr_SetString(opencv_error, e.what()); \
-    return 0; \
-}
-
-using namespace cv;
-
-typedef std::vector<uchar> vector_uchar;
-typedef std::vector<char> vector_char;
-typedef std::vector<int> vector_int;
-typedef std::vector<float> vector_float;
-typedef std::vector<double> vector_double;
-typedef std::vector<size_t> vector_size_t;
-typedef std::vector<Point> vector_Point;
-typedef std::vector<Point2f> vector_Point2f;
-typedef std::vector<Point3f> vector_Point3f;
-typedef std::vector<Size> vector_Size;
-typedef std::vector<Vec2f> vector_Vec2f;
-typedef std::vector<Vec3f> vector_Vec3f;
-typedef std::vector<Vec4f> vector_Vec4f;
-typedef std::vector<Vec6f> vector_Vec6f;
-typedef std::vector<Vec4i> vector_Vec4i;
-typedef std::vector<Rect> vector_Rect;
-typedef std::vector<Rect2d> vector_Rect2d;
-typedef std::vector<RotatedRect> vector_RotatedRect;
-typedef std::vector<KeyPoint> vector_KeyPoint;
-typedef std::vector<Mat> vector_Mat;
-typedef std::vector<std::vector<Mat> > vector_vector_Mat;
-typedef std::vector<UMat> vector_UMat;
-typedef std::vector<DMatch> vector_DMatch;
-typedef std::vector<String> vector_String;
-typedef std::vector<Scalar> vector_Scalar;
-
-typedef std::vector<std::vector<char> > vector_vector_char;
-typedef std::vector<std::vector<Point> > vector_vector_Point;
-typedef std::vector<std::vector<Point2f> > vector_vector_Point2f;
-typedef std::vector<std::vector<Point3f> > vector_vector_Point3f;
-typedef std::vector<std::vector<DMatch> > vector_vector_DMatch;
-typedef std::vector<std::vector<KeyPoint> > vector_vector_KeyPoint;
-
-static PyObject* failmsgp(const char *fmt, ...)
-{
-  char str[1000];
-
-  va_list ap;
-  va_start(ap, fmt);
-  vsnprintf(str, sizeof(str), fmt, ap);
-  va_end(ap);
-
-  PyErr_SetString(PyExc_TypeError, str);
-  return 0;
-}
-
-class NumpyAllocator : public MatAllocator
-{
-public:
-    NumpyAllocator() { stdAllocator = Mat::getStdAllocator(); }
-    ~NumpyAllocator() {}
-
-    UMatData* allocate(PyObject* o, int dims, const int* sizes, int type, size_t* step) const
-    {
-        UMatData* u = new UMatData(this);
-        u->data = u->origdata = (uchar*)PyArray_DATA((PyArrayObject*) o);
-        npy_intp* _strides = PyArray_STRIDES((PyArrayObject*) o);
-        for( int i = 0; i < dims - 1; i++ )
-            step[i] = (size_t)_strides[i];
-        step[dims-1] = CV_ELEM_SIZE(type);
-        u->size = sizes[0]*step[0];
-        u->userdata = o;
-        return u;
-    }
-
-    UMatData* allocate(int dims0, const int* sizes, int type, void* data, size_t* step, AccessFlag flags, UMatUsageFlags usageFlags) const CV_OVERRIDE
-    {
-        if( data != 0 )
-        {
-            // issue #6969: CV_Error(Error::StsAssert, "The data should normally be NULL!");
-            // probably this is safe to do in such extreme case
-            return stdAllocator->allocate(dims0, sizes, type, data, step, flags, usageFlags);
-        }
-        PyEnsureGIL gil;
-
-        int depth = CV_MAT_DEPTH(type);
-        int cn = CV_MAT_CN(type);
-        const int f = (int)(sizeof(size_t)/8);
-        int typenum = depth == CV_8U ? NPY_UBYTE : depth == CV_8S ? NPY_BYTE :
-        depth == CV_16U ? NPY_USHORT : depth == CV_16S ? NPY_SHORT :
-        depth == CV_32S ? NPY_INT : depth == CV_32F ? NPY_FLOAT :
-        depth == CV_64F ? NPY_DOUBLE : f*NPY_ULONGLONG + (f^1)*NPY_UINT;
-        int i, dims = dims0;
-        cv::AutoBuffer<npy_intp> _sizes(dims + 1);
-        for( i = 0; i < dims; i++ )
-            _sizes[i] = sizes[i];
-        if( cn > 1 )
-            _sizes[dims++] = cn;
-        PyObject* o = PyArray_SimpleNew(dims, _sizes.data(), typenum);
-        if(!o)
-            CV_Error_(Error::StsError, ("The numpy array of typenum=%d, ndims=%d can not be created", typenum, dims));
-        return allocate(o, dims0, sizes, type, step);
-    }
-
-    bool allocate(UMatData* u, AccessFlag accessFlags, UMatUsageFlags usageFlags) const CV_OVERRIDE
-    {
-        return stdAllocator->allocate(u, accessFlags, usageFlags);
-    }
-
-    void deallocate(UMatData* u) const CV_OVERRIDE
-    {
-        if(!u)
-            return;
-        PyEnsureGIL gil;
-        CV_Assert(u->urefcount >= 0);
-        CV_Assert(u->refcount >= 0);
-        if(u->refcount == 0)
-        {
-            PyObject* o = (PyObject*)u->userdata;
-            Py_XDECREF(o);
-            delete u;
-        }
-    }
-
-    const MatAllocator* stdAllocator;
-};
-
-NumpyAllocator g_numpyAllocator;
-
-
-enum { ARG_NONE = 0, ARG_MAT = 1, ARG_SCALAR = 2 };
-
-// special case, when the converter needs full ArgInfo structure
-static bool pyopencv_to(PyObject* o, Mat& m, const ArgInfo info)
-{
-    bool allowND = true;
-    if(!o || o == Py_None)
-    {
-        if( !m.data )
-            m.allocator = &g_numpyAllocator;
-        return true;
-    }
-
-    if( PyInt_Check(o) )
-    {
-        double v[] = {static_cast<double>(PyInt_AsLong((PyObject*)o)), 0., 0., 0.};
-        m = Mat(4, 1, CV_64F, v).clone();
-        return true;
-    }
-    if( PyFloat_Check(o) )
-    {
-        double v[] = {PyFloat_AsDouble((PyObject*)o), 0., 0., 0.};
-        m = Mat(4, 1, CV_64F, v).clone();
-        return true;
-    }
-    if( PyTuple_Check(o) )
-    {
-        int i, sz = (int)PyTuple_Size((PyObject*)o);
-        m = Mat(sz, 1, CV_64F);
-        for( i = 0; i < sz; i++ )
-        {
-            PyObject* oi = PyTuple_GetItem(o, i);
-            if( PyInt_Check(oi) )
-                m.at<double>(i) = (double)PyInt_AsLong(oi);
-            else if( PyFloat_Check(oi) )
-                m.at<double>(i) = (double)PyFloat_AsDouble(oi);
-            else
-            {
-                failmsg("%s is not a numerical tuple", info.name);
-                m.release();
-                return false;
-            }
-        }
-        return true;
-    }
-
-    if( !PyArray_Check(o) )
-    {
-        failmsg("%s is not a numpy array, neither a scalar", info.name);
-        return false;
-    }
-
-    PyArrayObject* oarr = (PyArrayObject*) o;
-
-    bool needcopy = false, needcast = false;
-    int typenum = PyArray_TYPE(oarr), new_typenum = typenum;
-    int type = typenum == NPY_UBYTE ? CV_8U :
-               typenum == NPY_BYTE ? CV_8S :
-               typenum == NPY_USHORT ? CV_16U :
-               typenum == NPY_SHORT ? CV_16S :
-               typenum == NPY_INT ? CV_32S :
-               typenum == NPY_INT32 ? CV_32S :
-               typenum == NPY_FLOAT ? CV_32F :
-               typenum == NPY_DOUBLE ? CV_64F : -1;
-
-    if( type < 0 )
-    {
-        if( typenum == NPY_INT64 || typenum == NPY_UINT64 || typenum == NPY_LONG )
-        {
-            needcopy = needcast = true;
-            new_typenum = NPY_INT;
-            type = CV_32S;
-        }
-        else
-        {
-            failmsg("%s data type = %d is not supported", info.name, typenum);
-            return false;
-        }
-    }
-
-#ifndef CV_MAX_DIM
-    const int CV_MAX_DIM = 32;
-#endif
-
-    int ndims = PyArray_NDIM(oarr);
-    if(ndims >= CV_MAX_DIM)
-    {
-        failmsg("%s dimensionality (=%d) is too high", info.name, ndims);
-        return false;
-    }
-
-    int size[CV_MAX_DIM+1];
-    size_t step[CV_MAX_DIM+1];
-    size_t elemsize = CV_ELEM_SIZE1(type);
-    const npy_intp* _sizes = PyArray_DIMS(oarr);
-    const npy_intp* _strides = PyArray_STRIDES(oarr);
-    bool ismultichannel = ndims == 3 && _sizes[2] <= CV_CN_MAX;
-
-    for( int i = ndims-1; i >= 0 && !needcopy; i-- )
-    {
-        // these checks handle cases of
-        //  a) multi-dimensional (ndims > 2) arrays, as well as simpler 1- and 2-dimensional cases
-        //  b) transposed arrays, where _strides[] elements go in non-descending order
-        //  c) flipped arrays, where some of _strides[] elements are negative
-        // the _sizes[i] > 1 is needed to avoid spurious copies when NPY_RELAXED_STRIDES is set
-        if( (i == ndims-1 && _sizes[i] > 1 && (size_t)_strides[i] != elemsize) ||
-            (i < ndims-1 && _sizes[i] > 1 && _strides[i] < _strides[i+1]) )
-            needcopy = true;
-    }
-
-    if( ismultichannel && _strides[1] != (npy_intp)elemsize*_sizes[2] )
-        needcopy = true;
-
-    if (needcopy)
-    {
-        if (info.outputarg)
-        {
-            failmsg("Layout of the output array %s is incompatible with cv::Mat (step[ndims-1] != elemsize or step[1] != elemsize*nchannels)", info.name);
-            return false;
-        }
-
-        if( needcast ) {
-            o = PyArray_Cast(oarr, new_typenum);
-            oarr = (PyArrayObject*) o;
-        }
-        else {
-            oarr = PyArray_GETCONTIGUOUS(oarr);
-            o = (PyObject*) oarr;
-        }
-
-        _strides = PyArray_STRIDES(oarr);
-    }
-
-    // Normalize strides in case NPY_RELAXED_STRIDES is set
-    size_t default_step = elemsize;
-    for ( int i = ndims - 1; i >= 0; --i )
-    {
-        size[i] = (int)_sizes[i];
-        if ( size[i] > 1 )
-        {
-            step[i] = (size_t)_strides[i];
-            default_step = step[i] * size[i];
-        }
-        else
-        {
-            step[i] = default_step;
-            default_step *= size[i];
-        }
-    }
-
-    // handle degenerate case
-    if( ndims == 0) {
-        size[ndims] = 1;
-        step[ndims] = elemsize;
-        ndims++;
-    }
-
-    if( ismultichannel )
-    {
-        ndims--;
-        type |= CV_MAKETYPE(0, size[2]);
-    }
-
-    if( ndims > 2 && !allowND )
-    {
-        failmsg("%s has more than 2 dimensions", info.name);
-        return false;
-    }
-
-    m = Mat(ndims, size, type, PyArray_DATA(oarr), step);
-    m.u = g_numpyAllocator.allocate(o, ndims, size, type, step);
-    m.addref();
-
-    if( !needcopy )
-    {
-        Py_INCREF(o);
-    }
-    m.allocator = &g_numpyAllocator;
-
-    return true;
-}
-
-template<>
-bool pyopencv_to(PyObject* o, Mat& m, const char* name)
-{
-    return pyopencv_to(o, m, ArgInfo(name, 0));
-}
-
-template<typename _Tp, int m, int n>
-bool pyopencv_to(PyObject* o, Matx<_Tp, m, n>& mx, const ArgInfo info)
-{
-    Mat tmp;
-    if (!pyopencv_to(o, tmp, info)) {
-        return false;
-    }
-
-    tmp.copyTo(mx);
-    return true;
-}
-
-template<typename _Tp, int m, int n>
-bool pyopencv_to(PyObject* o, Matx<_Tp, m, n>& mx, const char* name)
-{
-    return pyopencv_to(o, mx, ArgInfo(name, 0));
-}
-
-template<>
-PyObject* pyopencv_from(const Mat& m)
-{
-    if( !m.data )
-        Py_RETURN_NONE;
-    Mat temp, *p = (Mat*)&m;
-    if(!p->u || p->allocator != &g_numpyAllocator)
-    {
-        temp.allocator = &g_numpyAllocator;
-        ERRWRAP2(m.copyTo(temp));
-        p = &temp;
-    }
-    PyObject* o = (PyObject*)p->u->userdata;
-    Py_INCREF(o);
-    return o;
-}
-
-template<typename _Tp, int m, int n>
-PyObject* pyopencv_from(const Matx<_Tp, m, n>& matx)
-{
-    return pyopencv_from(Mat(matx));
-}
-
-template<typename T>
-struct PyOpenCV_Converter< cv::Ptr<T> >
-{
-    static PyObject* from(const cv::Ptr<T>& p)
-    {
-        if (!p)
-            Py_RETURN_NONE;
-        return pyopencv_from(*p);
-    }
-    static bool to(PyObject *o, Ptr<T>& p, const char *name)
-    {
-        if (!o || o == Py_None)
-            return true;
-        p = makePtr<T>();
-        return pyopencv_to(o, *p, name);
-    }
-};
-
-template<>
-bool pyopencv_to(PyObject* obj, void*& ptr, const char* name)
-{
-    CV_UNUSED(name);
-    if (!obj || obj == Py_None)
-        return true;
-
-    if (!PyLong_Check(obj))
-        return false;
-    ptr = PyLong_AsVoidPtr(obj);
-    return ptr != NULL && !PyErr_Occurred();
-}
-
-static PyObject* pyopencv_from(void*& ptr)
-{
-    return PyLong_FromVoidPtr(ptr);
-}
-
-struct SafeSeqItem
-{
-    PyObject * item;
-    SafeSeqItem(PyObject *obj, size_t idx) { item = PySequence_GetItem(obj, idx); }
-    ~SafeSeqItem() { Py_XDECREF(item); }
-};
-
-static bool pyopencv_to(PyObject *o, Scalar& s, const ArgInfo info)
-{
-    if(!o || o == Py_None)
-        return true;
-    if (PySequence_Check(o)) {
-        if (4 < PySequence_Size(o))
-        {
-            failmsg("Scalar value for argument '%s' is longer than 4", info.name);
-            return false;
-        }
-        for (Py_ssize_t i = 0; i < PySequence_Size(o); i++) {
-            SafeSeqItem item_wrap(o, i);
-            PyObject *item = item_wrap.item;
-            if (PyFloat_Check(item) || PyInt_Check(item)) {
-                s[(int)i] = PyFloat_AsDouble(item);
-            } else {
-                failmsg("Scalar value for argument '%s' is not numeric", info.name);
-                return false;
-            }
-        }
-    } else {
-        if (PyFloat_Check(o) || PyInt_Check(o)) {
-            s[0] = PyFloat_AsDouble(o);
-        } else {
-            failmsg("Scalar value for argument '%s' is not numeric", info.name);
-            return false;
-        }
-    }
-    return true;
-}
-
-template<>
-bool pyopencv_to(PyObject *o, Scalar& s, const char *name)
-{
-    return pyopencv_to(o, s, ArgInfo(name, 0));
-}
-
-template<>
-PyObject* pyopencv_from(const Scalar& src)
-{
-    return Py_BuildValue("(dddd)", src[0], src[1], src[2], src[3]);
-}
-
-template<>
-PyObject* pyopencv_from(const bool& value)
-{
-    return PyBool_FromLong(value);
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, bool& value, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    int _val = PyObject_IsTrue(obj);
-    if(_val < 0)
-        return false;
-    value = _val > 0;
-    return true;
-}
-
-template<>
-PyObject* pyopencv_from(const size_t& value)
-{
-    return PyLong_FromSize_t(value);
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, size_t& value, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    value = (int)PyLong_AsUnsignedLong(obj);
-    return value != (size_t)-1 || !PyErr_Occurred();
-}
-
-template<>
-PyObject* pyopencv_from(const int& value)
-{
-    return PyInt_FromLong(value);
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, int& value, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    if(PyInt_Check(obj))
-        value = (int)PyInt_AsLong(obj);
-    else if(PyLong_Check(obj))
-        value = (int)PyLong_AsLong(obj);
-    else
-        return false;
-    return value != -1 || !PyErr_Occurred();
-}
-
-// There is conflict between "size_t" and "unsigned int".
-// They are the same type on some 32-bit platforms.
-template<typename T>
-struct PyOpenCV_Converter
-    < T, typename std::enable_if< std::is_same<unsigned int, T>::value && !std::is_same<unsigned int, size_t>::value >::type >
-{
-    static inline PyObject* from(const unsigned int& value)
-    {
-        return PyLong_FromUnsignedLong(value);
-    }
-
-    static inline bool to(PyObject* obj, unsigned int& value, const char* name)
-    {
-        CV_UNUSED(name);
-        if(!obj || obj == Py_None)
-            return true;
-        if(PyInt_Check(obj))
-            value = (unsigned int)PyInt_AsLong(obj);
-        else if(PyLong_Check(obj))
-            value = (unsigned int)PyLong_AsLong(obj);
-        else
-            return false;
-        return value != (unsigned int)-1 || !PyErr_Occurred();
-    }
-};
-
-template<>
-PyObject* pyopencv_from(const uchar& value)
-{
-    return PyInt_FromLong(value);
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, uchar& value, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    int ivalue = (int)PyInt_AsLong(obj);
-    value = cv::saturate_cast<uchar>(ivalue);
-    return ivalue != -1 || !PyErr_Occurred();
-}
-
-template<>
-PyObject* pyopencv_from(const double& value)
-{
-    return PyFloat_FromDouble(value);
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, double& value, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    if(!!PyInt_CheckExact(obj))
-        value = (double)PyInt_AS_LONG(obj);
-    else
-        value = PyFloat_AsDouble(obj);
-    return !PyErr_Occurred();
-}
-
-template<>
-PyObject* pyopencv_from(const float& value)
-{
-    return PyFloat_FromDouble(value);
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, float& value, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    if(!!PyInt_CheckExact(obj))
-        value = (float)PyInt_AS_LONG(obj);
-    else
-        value = (float)PyFloat_AsDouble(obj);
-    return !PyErr_Occurred();
-}
-
-template<>
-PyObject* pyopencv_from(const int64& value)
-{
-    return PyLong_FromLongLong(value);
-}
-
-template<>
-PyObject* pyopencv_from(const String& value)
-{
-    return PyString_FromString(value.empty() ? "" : value.c_str());
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, String &value, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    std::string str;
-    if (getUnicodeString(obj, str))
-    {
-        value = str;
-        return true;
-    }
-    return false;
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, Size& sz, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    return PyArg_ParseTuple(obj, "ii", &sz.width, &sz.height) > 0;
-}
-
-template<>
-PyObject* pyopencv_from(const Size& sz)
-{
-    return Py_BuildValue("(ii)", sz.width, sz.height);
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, Size_<float>& sz, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    return PyArg_ParseTuple(obj, "ff", &sz.width, &sz.height) > 0;
-}
-
-template<>
-PyObject* pyopencv_from(const Size_<float>& sz)
-{
-    return Py_BuildValue("(ff)", sz.width, sz.height);
-}
-
-template<>
-PyObject* pyopencv_from(const Rect& r)
-{
-    return Py_BuildValue("(iiii)", r.x, r.y, r.width, r.height);
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, Rect2d& r, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    return PyArg_ParseTuple(obj, "dddd", &r.x, &r.y, &r.width, &r.height) > 0;
-}
-
-template<>
-PyObject* pyopencv_from(const Rect2d& r)
-{
-    return Py_BuildValue("(dddd)", r.x, r.y, r.width, r.height);
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, Range& r, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    while (PySequence_Check(obj))
-    {
-        if (2 != PySequence_Size(obj))
-        {
-            failmsg("Range value for argument '%s' is longer than 2", name);
-            return false;
-        }
-        {
-            SafeSeqItem item_wrap(obj, 0);
-            PyObject *item = item_wrap.item;
-            if (PyInt_Check(item)) {
-                r.start = (int)PyInt_AsLong(item);
-            } else {
-                failmsg("Range.start value for argument '%s' is not integer", name);
-                break;
-            }
-        }
-        {
-            SafeSeqItem item_wrap(obj, 1);
-            PyObject *item = item_wrap.item;
-            if (PyInt_Check(item)) {
-                r.end = (int)PyInt_AsLong(item);
-            } else {
-                failmsg("Range.end value for argument '%s' is not integer", name);
-                break;
-            }
-        }
-        return true;
-    }
-    if(PyObject_Size(obj) == 0)
-    {
-        r = Range::all();
-        return true;
-    }
-    return PyArg_ParseTuple(obj, "ii", &r.start, &r.end) > 0;
-}
-
-template<>
-PyObject* pyopencv_from(const Range& r)
-{
-    return Py_BuildValue("(ii)", r.start, r.end);
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, Point& p, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    if(PyComplex_Check(obj))
-    {
-        p.x = saturate_cast<int>(PyComplex_RealAsDouble(obj));
-        p.y = saturate_cast<int>(PyComplex_ImagAsDouble(obj));
-        return true;
-    }
-    return PyArg_ParseTuple(obj, "ii", &p.x, &p.y) > 0;
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, Point2f& p, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    if (PyComplex_Check(obj))
-    {
-        p.x = saturate_cast<float>(PyComplex_RealAsDouble(obj));
-        p.y = saturate_cast<float>(PyComplex_ImagAsDouble(obj));
-        return true;
-    }
-    return PyArg_ParseTuple(obj, "ff", &p.x, &p.y) > 0;
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, Point2d& p, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    if(PyComplex_Check(obj))
-    {
-        p.x = PyComplex_RealAsDouble(obj);
-        p.y = PyComplex_ImagAsDouble(obj);
-        return true;
-    }
-    return PyArg_ParseTuple(obj, "dd", &p.x, &p.y) > 0;
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, Point3f& p, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    return PyArg_ParseTuple(obj, "fff", &p.x, &p.y, &p.z) > 0;
-}
-
-template<>
-bool pyopencv_to(PyObject* obj, Point3d& p, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-    return PyArg_ParseTuple(obj, "ddd", &p.x, &p.y, &p.z) > 0;
-}
-
-template<>
-PyObject* pyopencv_from(const Point& p)
-{
-    return Py_BuildValue("(ii)", p.x, p.y);
-}
-
-template<>
-PyObject* pyopencv_from(const Point2f& p)
-{
-    return Py_BuildValue("(dd)", p.x, p.y);
-}
-
-template<>
-PyObject* pyopencv_from(const Point3f& p)
-{
-    return Py_BuildValue("(ddd)", p.x, p.y, p.z);
-}
-
-static bool pyopencv_to(PyObject* obj, Vec4d& v, ArgInfo info)
-{
-    CV_UNUSED(info);
-    if (!obj)
-        return true;
-    return PyArg_ParseTuple(obj, "dddd", &v[0], &v[1], &v[2], &v[3]) > 0;
-}
-template<>
-bool pyopencv_to(PyObject* obj, Vec4d& v, const char* name)
-{
-    return pyopencv_to(obj, v, ArgInfo(name, 0));
-}
+#include "cv2.hpp"
 
-static bool pyopencv_to(PyObject* obj, Vec4f& v, ArgInfo info)
-{
-    CV_UNUSED(info);
-    if (!obj)
-        return true;
-    return PyArg_ParseTuple(obj, "ffff", &v[0], &v[1], &v[2], &v[3]) > 0;
-}
-template<>
-bool pyopencv_to(PyObject* obj, Vec4f& v, const char* name)
-{
-    return pyopencv_to(obj, v, ArgInfo(name, 0));
-}
-
-static bool pyopencv_to(PyObject* obj, Vec4i& v, ArgInfo info)
-{
-    CV_UNUSED(info);
-    if (!obj)
-        return true;
-    return PyArg_ParseTuple(obj, "iiii", &v[0], &v[1], &v[2], &v[3]) > 0;
-}
-template<>
-bool pyopencv_to(PyObject* obj, Vec4i& v, const char* name)
-{
-    return pyopencv_to(obj, v, ArgInfo(name, 0));
-}
-
-static bool pyopencv_to(PyObject* obj, Vec3d& v, ArgInfo info)
-{
-    CV_UNUSED(info);
-    if (!obj)
-        return true;
-    return PyArg_ParseTuple(obj, "ddd", &v[0], &v[1], &v[2]) > 0;
-}
-template<>
-bool pyopencv_to(PyObject* obj, Vec3d& v, const char* name)
-{
-    return pyopencv_to(obj, v, ArgInfo(name, 0));
-}
-
-static bool pyopencv_to(PyObject* obj, Vec3f& v, ArgInfo info)
-{
-    CV_UNUSED(info);
-    if (!obj)
-        return true;
-    return PyArg_ParseTuple(obj, "fff", &v[0], &v[1], &v[2]) > 0;
-}
-template<>
-bool pyopencv_to(PyObject* obj, Vec3f& v, const char* name)
-{
-    return pyopencv_to(obj, v, ArgInfo(name, 0));
-}
-
-static bool pyopencv_to(PyObject* obj, Vec3i& v, ArgInfo info)
-{
-    CV_UNUSED(info);
-    if (!obj)
-        return true;
-    return PyArg_ParseTuple(obj, "iii", &v[0], &v[1], &v[2]) > 0;
-}
-template<>
-bool pyopencv_to(PyObject* obj, Vec3i& v, const char* name)
-{
-    return pyopencv_to(obj, v, ArgInfo(name, 0));
-}
+// State shared with the generated code, see the declarations in cv2.hpp
+PyObject* opencv_error = NULL;
 
-static bool pyopencv_to(PyObject* obj, Vec2d& v, ArgInfo info)
-{
-    CV_UNUSED(info);
-    if (!obj)
-        return true;
-    return PyArg_ParseTuple(obj, "dd", &v[0], &v[1]) > 0;
-}
-template<>
-bool pyopencv_to(PyObject* obj, Vec2d& v, const char* name)
-{
-    return pyopencv_to(obj, v, ArgInfo(name, 0));
-}
-
-static bool pyopencv_to(PyObject* obj, Vec2f& v, ArgInfo info)
-{
-    CV_UNUSED(info);
-    if (!obj)
-        return true;
-    return PyArg_ParseTuple(obj, "ff", &v[0], &v[1]) > 0;
-}
-template<>
-bool pyopencv_to(PyObject* obj, Vec2f& v, const char* name)
-{
-    return pyopencv_to(obj, v, ArgInfo(name, 0));
-}
+cvpy_CallStats* g_callStatsList = NULL;
+bool g_callStatsEnabled = false;
+const char* g_convertingFunction = NULL;
 
-static bool pyopencv_to(PyObject* obj, Vec2i& v, ArgInfo info)
-{
-    CV_UNUSED(info);
-    if (!obj)
-        return true;
-    return PyArg_ParseTuple(obj, "ii", &v[0], &v[1]) > 0;
-}
-template<>
-bool pyopencv_to(PyObject* obj, Vec2i& v, const char* name)
+// Never destroyed: pooled buffers can be released by arrays alive until the interpreter shutdown
+NumpyBufferPool& getNumpyBufferPool()
 {
-    return pyopencv_to(obj, v, ArgInfo(name, 0));
+    static NumpyBufferPool* pool = new NumpyBufferPool();
+    return *pool;
 }
 
-template<>
-PyObject* pyopencv_from(const Vec4d& v)
-{
-    return Py_BuildValue("(dddd)", v[0], v[1], v[2], v[3]);
-}
+NumpyAllocator g_numpyAllocator;
 
-template<>
-PyObject* pyopencv_from(const Vec4f& v)
-{
-    return Py_BuildValue("(ffff)", v[0], v[1], v[2], v[3]);
-}
+thread_local pyopencv_OpaqueInt64Scope* g_opaqueInt64Scope = NULL;
 
-template<>
-PyObject* pyopencv_from(const Vec4i& v)
-{
-    return Py_BuildValue("(iiii)", v[0], v[1], v[2], v[3]);
-}
+thread_local bool g_finalArgError = false;
 
-template<>
-PyObject* pyopencv_from(const Vec3d& v)
-{
-    return Py_BuildValue("(ddd)", v[0], v[1], v[2]);
-}
+std::vector<PyObject*> g_conversionTrackers;
 
-template<>
-PyObject* pyopencv_from(const Vec3f& v)
-{
-    return Py_BuildValue("(fff)", v[0], v[1], v[2]);
-}
+bool g_zeroCopyExport = false;
 
-template<>
-PyObject* pyopencv_from(const Vec3i& v)
-{
-    return Py_BuildValue("(iii)", v[0], v[1], v[2]);
-}
+bool g_structuredArrays = false;
 
-template<>
-PyObject* pyopencv_from(const Vec2d& v)
+static PyObject* pycvToDLPack(PyObject*, PyObject* o)
 {
-    return Py_BuildValue("(dd)", v[0], v[1]);
+    if (!PyArray_Check(o))
+    {
+        PyObject* arr = pyopencv_buffer_to_ndarray(o);
+        if (!arr)
+            return failmsgp("toDLPack argument must be numpy array or an object with buffer interface");
+        PyObject* capsule = pyopencv_ndarray_to_dlpack((PyArrayObject*)arr);
+        Py_DECREF(arr);
+        return capsule;
+    }
+    return pyopencv_ndarray_to_dlpack((PyArrayObject*)o);
 }
 
-template<>
-PyObject* pyopencv_from(const Vec2f& v)
+static PyObject* pycvFromDLPack(PyObject*, PyObject* o)
 {
-    return Py_BuildValue("(ff)", v[0], v[1]);
+    PyObject* arr = pyopencv_dlpack_to_ndarray(o);
+    if (!arr && !PyErr_Occurred())
+        return failmsgp("fromDLPack argument must be an object with __dlpack__() method or 'dltensor' capsule");
+    return arr;
 }
 
-template<>
-PyObject* pyopencv_from(const Vec2i& v)
+pyopencv_OpaqueInt64Scope::pyopencv_OpaqueInt64Scope() : typenum(-1), prev(g_opaqueInt64Scope)
 {
-    return Py_BuildValue("(ii)", v[0], v[1]);
+    g_opaqueInt64Scope = this;
 }
 
-template<>
-PyObject* pyopencv_from(const Point2d& p)
+pyopencv_OpaqueInt64Scope::~pyopencv_OpaqueInt64Scope()
 {
-    return Py_BuildValue("(dd)", p.x, p.y);
+    g_opaqueInt64Scope = prev;
 }
 
-template<>
-PyObject* pyopencv_from(const Point3d& p)
+// pyopencv_8byte_typenum() of an array or an object with buffer interface (classified by its format)
+static int pyopencv_8byte_typenum_any(PyObject* o)
 {
-    return Py_BuildValue("(ddd)", p.x, p.y, p.z);
+    if (!o || PyArray_Check(o))
+        return o ? pyopencv_8byte_typenum(o) : -1;
+    PyObject* arr = pyopencv_buffer_to_ndarray(o);
+    if (!arr)
+    {
+        PyErr_Clear();  // the conversion of the argument reports the error
+        return -1;
+    }
+    int res = pyopencv_8byte_typenum(arr);
+    Py_DECREF(arr);
+    return res;
 }
 
-template<typename _Tp> struct pyopencvVecConverter
+bool pyopencv_OpaqueInt64Scope::start(std::initializer_list<PyObject*> arrays, std::initializer_list<PyObject*> vectors)
 {
-    typedef typename DataType<_Tp>::channel_type _Cp;
-    static inline bool copyOneItem(PyObject *obj, size_t start, int channels, _Cp * data)
+    std::vector<int> types;
+    for (std::initializer_list<PyObject*>::const_iterator it = arrays.begin(); it != arrays.end(); ++it)
+        types.push_back(pyopencv_8byte_typenum_any(*it));
+    for (std::initializer_list<PyObject*>::const_iterator it = vectors.begin(); it != vectors.end(); ++it)
     {
-        for(size_t j = 0; (int)j < channels; j++ )
+        PyObject* o = *it;
+        // only lists and tuples are expanded: the other sequences (bytes, memoryview, ...) are single arrays
+        if (!o || !(PyList_CheckExact(o) || PyTuple_CheckExact(o)))
         {
-            SafeSeqItem sub_item_wrap(obj, start + j);
-            PyObject* item_ij = sub_item_wrap.item;
-            if( PyInt_Check(item_ij))
-            {
-                int v = (int)PyInt_AsLong(item_ij);
-                if( v == -1 && PyErr_Occurred() )
-                    return false;
-                data[j] = saturate_cast<_Cp>(v);
-            }
-            else if( PyLong_Check(item_ij))
-            {
-                int v = (int)PyLong_AsLong(item_ij);
-                if( v == -1 && PyErr_Occurred() )
-                    return false;
-                data[j] = saturate_cast<_Cp>(v);
-            }
-            else if( PyFloat_Check(item_ij))
-            {
-                double v = PyFloat_AsDouble(item_ij);
-                if( PyErr_Occurred() )
-                    return false;
-                data[j] = saturate_cast<_Cp>(v);
-            }
-            else
-                return false;
+            types.push_back(pyopencv_8byte_typenum_any(o));
+            continue;
         }
-        return true;
+        for (Py_ssize_t i = 0; i < PySequence_Fast_GET_SIZE(o); i++)
+            types.push_back(pyopencv_8byte_typenum_any(PySequence_Fast_GET_ITEM(o, i)));
     }
-    static bool to(PyObject* obj, std::vector<_Tp>& value, const ArgInfo info)
+    typenum = -1;
+    for (size_t i = 0; i < types.size(); i++)
     {
-        if(!obj || obj == Py_None)
-            return true;
-        if (PyArray_Check(obj))
+        if (types[i] < 0)
+            continue;
+        if (types[i] == NPY_DOUBLE || (typenum >= 0 && types[i] != typenum))
         {
-            Mat m;
-            pyopencv_to(obj, m, info);
-            m.copyTo(value);
-            return true;
-        }
-        else if (PySequence_Check(obj))
-        {
-            const int type = traits::Type<_Tp>::value;
-            const int depth = CV_MAT_DEPTH(type), channels = CV_MAT_CN(type);
-            size_t i, n = PySequence_Size(obj);
-            value.resize(n);
-            for (i = 0; i < n; i++ )
-            {
-                SafeSeqItem item_wrap(obj, i);
-                PyObject* item = item_wrap.item;
-                _Cp* data = (_Cp*)&value[i];
-
-                if( channels == 2 && PyComplex_Check(item) )
-                {
-                    data[0] = saturate_cast<_Cp>(PyComplex_RealAsDouble(item));
-                    data[1] = saturate_cast<_Cp>(PyComplex_ImagAsDouble(item));
-                }
-                else if( channels > 1 )
-                {
-                    if( PyArray_Check(item))
-                    {
-                        Mat src;
-                        pyopencv_to(item, src, info);
-                        if( src.dims != 2 || src.channels() != 1 ||
-                           ((src.cols != 1 || src.rows != channels) &&
-                            (src.cols != channels || src.rows != 1)))
-                            break;
-                        Mat dst(src.rows, src.cols, depth, data);
-                        src.convertTo(dst, type);
-                        if( dst.data != (uchar*)data )
-                            break;
-                    }
-                    else if (PySequence_Check(item))
-                    {
-                        if (!copyOneItem(item, 0, channels, data))
-                            break;
-                    }
-                    else
-                    {
-                        break;
-                    }
-                }
-                else if (channels == 1)
-                {
-                    if (!copyOneItem(obj, i, channels, data))
-                        break;
-                }
-                else
-                {
-                    break;
-                }
-            }
-            return i == n;
+            typenum = -1;  // the int64 arrays are cast to int32 as in the other functions
+            break;
         }
-        return false;
-    }
-
-    static PyObject* from(const std::vector<_Tp>& value)
-    {
-        if(value.empty())
-            return PyTuple_New(0);
-        int type = traits::Type<_Tp>::value;
-        int depth = CV_MAT_DEPTH(type), channels = CV_MAT_CN(type);
-        Mat src((int)value.size(), channels, depth, (uchar*)&value[0]);
-        return pyopencv_from(src);
+        typenum = types[i];
     }
-};
-
-template<typename _Tp>
-bool pyopencv_to(PyObject* obj, std::vector<_Tp>& value, const ArgInfo info)
-{
-    return pyopencvVecConverter<_Tp>::to(obj, value, info);
+    return true;
 }
 
-template<typename _Tp>
-PyObject* pyopencv_from(const std::vector<_Tp>& value)
+static void pyopencv_push_conversion_tracker(PyObject* records)
 {
-    return pyopencvVecConverter<_Tp>::from(value);
+    Py_INCREF(records);
+    g_conversionTrackers.push_back(records);
 }
 
-template<typename _Tp> static inline bool pyopencv_to_generic_vec(PyObject* obj, std::vector<_Tp>& value, const ArgInfo info)
+static void pyopencv_pop_conversion_tracker(PyObject* records)
 {
-    if(!obj || obj == Py_None)
-       return true;
-    if (!PySequence_Check(obj))
-        return false;
-    size_t n = PySequence_Size(obj);
-    value.resize(n);
-    for(size_t i = 0; i < n; i++ )
+    std::vector<PyObject*>::iterator it = std::find(g_conversionTrackers.begin(), g_conversionTrackers.end(), records);
+    if (it != g_conversionTrackers.end())
     {
-        SafeSeqItem item_wrap(obj, i);
-        if(!pyopencv_to(item_wrap.item, value[i], info))
-            return false;
+        g_conversionTrackers.erase(it);
+        Py_DECREF(records);
     }
-    return true;
 }
 
-template<typename _Tp> static inline PyObject* pyopencv_from_generic_vec(const std::vector<_Tp>& value)
+// Context manager returned by cv2.utils.trackConversions(), enters as the list of records
+struct pyopencv_ConversionTracker_t
 {
-    int i, n = (int)value.size();
-    PyObject* seq = PyList_New(n);
-    for( i = 0; i < n; i++ )
-    {
-        PyObject* item = pyopencv_from(value[i]);
-        if(!item)
-            break;
-        PyList_SetItem(seq, i, item);
-    }
-    if( i < n )
-    {
-        Py_DECREF(seq);
-        return 0;
-    }
-    return seq;
-}
+    PyObject_HEAD
+    PyObject* records;
+};
 
-template<>
-PyObject* pyopencv_from(const std::pair<int, double>& src)
+static void pyopencv_ConversionTracker_dealloc(PyObject* self)
 {
-    return Py_BuildValue("(id)", src.first, src.second);
+    PyObject* records = ((pyopencv_ConversionTracker_t*)self)->records;
+    pyopencv_pop_conversion_tracker(records);  // the context wasn't exited
+    Py_DECREF(records);
+    PyObject_Del(self);
 }
 
-template<typename _Tp, typename _Tr> struct pyopencvVecConverter<std::pair<_Tp, _Tr> >
-{
-    static bool to(PyObject* obj, std::vector<std::pair<_Tp, _Tr> >& value, const ArgInfo info)
-    {
-        return pyopencv_to_generic_vec(obj, value, info);
-    }
-
-    static PyObject* from(const std::vector<std::pair<_Tp, _Tr> >& value)
-    {
-        return pyopencv_from_generic_vec(value);
-    }
-};
-
-template<typename _Tp> struct pyopencvVecConverter<std::vector<_Tp> >
+static PyObject* pyopencv_ConversionTracker_enter(PyObject* self, PyObject*)
 {
-    static bool to(PyObject* obj, std::vector<std::vector<_Tp> >& value, const ArgInfo info)
-    {
-        return pyopencv_to_generic_vec(obj, value, info);
-    }
-
-    static PyObject* from(const std::vector<std::vector<_Tp> >& value)
-    {
-        return pyopencv_from_generic_vec(value);
-    }
-};
+    PyObject* records = ((pyopencv_ConversionTracker_t*)self)->records;
+    pyopencv_push_conversion_tracker(records);
+    Py_INCREF(records);
+    return records;
+}
 
-template<> struct pyopencvVecConverter<Mat>
+static PyObject* pyopencv_ConversionTracker_exit(PyObject* self, PyObject*)
 {
-    static bool to(PyObject* obj, std::vector<Mat>& value, const ArgInfo info)
-    {
-        return pyopencv_to_generic_vec(obj, value, info);
-    }
+    pyopencv_pop_conversion_tracker(((pyopencv_ConversionTracker_t*)self)->records);
+    Py_RETURN_FALSE;
+}
 
-    static PyObject* from(const std::vector<Mat>& value)
-    {
-        return pyopencv_from_generic_vec(value);
-    }
+static PyMethodDef pyopencv_ConversionTracker_methods[] = {
+  {"__enter__", (PyCFunction)pyopencv_ConversionTracker_enter, METH_NOARGS, NULL},
+  {"__exit__", (PyCFunction)pyopencv_ConversionTracker_exit, METH_VARARGS, NULL},
+  {NULL, NULL},
 };
 
-template<> struct pyopencvVecConverter<UMat>
-{
-    static bool to(PyObject* obj, std::vector<UMat>& value, const ArgInfo info)
-    {
-        return pyopencv_to_generic_vec(obj, value, info);
-    }
-
-    static PyObject* from(const std::vector<UMat>& value)
-    {
-        return pyopencv_from_generic_vec(value);
-    }
-};
+static const char* pyopencv_ConversionTracker_doc = "Context manager returned by trackConversions(), enters as the list of records";
 
-template<> struct pyopencvVecConverter<KeyPoint>
+#ifdef CVPY_DYNAMIC_INIT
+static PyType_Slot pyopencv_ConversionTracker_Slots[] =
 {
-    static bool to(PyObject* obj, std::vector<KeyPoint>& value, const ArgInfo info)
-    {
-        return pyopencv_to_generic_vec(obj, value, info);
-    }
-
-    static PyObject* from(const std::vector<KeyPoint>& value)
-    {
-        return pyopencv_from_generic_vec(value);
-    }
+    {Py_tp_dealloc, (void*)pyopencv_ConversionTracker_dealloc},
+    {Py_tp_methods, pyopencv_ConversionTracker_methods},
+    {Py_tp_doc, (void*)pyopencv_ConversionTracker_doc},
+    {0, 0}
 };
-
-template<> struct pyopencvVecConverter<DMatch>
+static PyType_Spec pyopencv_ConversionTracker_Spec =
 {
-    static bool to(PyObject* obj, std::vector<DMatch>& value, const ArgInfo info)
-    {
-        return pyopencv_to_generic_vec(obj, value, info);
-    }
-
-    static PyObject* from(const std::vector<DMatch>& value)
-    {
-        return pyopencv_from_generic_vec(value);
-    }
+    MODULESTR".utils.ConversionTracker",
+    sizeof(pyopencv_ConversionTracker_t),
+    0,
+    Py_TPFLAGS_DEFAULT,
+    pyopencv_ConversionTracker_Slots
 };
-
-template<> struct pyopencvVecConverter<String>
+#else
+static PyTypeObject pyopencv_ConversionTracker_TypeXXX =
 {
-    static bool to(PyObject* obj, std::vector<String>& value, const ArgInfo info)
-    {
-        return pyopencv_to_generic_vec(obj, value, info);
-    }
-
-    static PyObject* from(const std::vector<String>& value)
-    {
-        return pyopencv_from_generic_vec(value);
-    }
+    CVPY_TYPE_HEAD
+    MODULESTR".utils.ConversionTracker",
+    sizeof(pyopencv_ConversionTracker_t),
 };
+#endif
+static PyObject* pyopencv_ConversionTracker_TypePtr = NULL;
 
-template<> struct pyopencvVecConverter<RotatedRect>
+static PyObject* pycvTrackConversions(PyObject*, PyObject*)
 {
-    static bool to(PyObject* obj, std::vector<RotatedRect>& value, const ArgInfo info)
-    {
-        return pyopencv_to_generic_vec(obj, value, info);
-    }
-    static PyObject* from(const std::vector<RotatedRect>& value)
+    if (!pyopencv_ConversionTracker_TypePtr)
     {
-        return pyopencv_from_generic_vec(value);
+#ifdef CVPY_DYNAMIC_INIT
+        pyopencv_ConversionTracker_TypePtr = PyType_FromSpec(&pyopencv_ConversionTracker_Spec);
+#else
+        PyTypeObject* type = &pyopencv_ConversionTracker_TypeXXX;
+        type->tp_dealloc = pyopencv_ConversionTracker_dealloc;
+        type->tp_methods = pyopencv_ConversionTracker_methods;
+        type->tp_doc = pyopencv_ConversionTracker_doc;
+        type->tp_flags = Py_TPFLAGS_DEFAULT;
+        if (PyType_Ready(type) == 0)
+        {
+            CVPY_TYPE_INCREF(type);
+            pyopencv_ConversionTracker_TypePtr = (PyObject*)type;
+        }
+#endif
+        if (!pyopencv_ConversionTracker_TypePtr)
+            return NULL;
     }
-};
-
-template<>
-bool pyopencv_to(PyObject* obj, Rect& r, const char* name)
-{
-    CV_UNUSED(name);
-    if(!obj || obj == Py_None)
-        return true;
-
-    if (PyTuple_Check(obj))
-        return PyArg_ParseTuple(obj, "iiii", &r.x, &r.y, &r.width, &r.height) > 0;
-    else
+    PyObject* records = PyList_New(0);
+    if (!records)
+        return NULL;
+    pyopencv_ConversionTracker_t* tracker = PyObject_New(pyopencv_ConversionTracker_t, (PyTypeObject*)pyopencv_ConversionTracker_TypePtr);
+    if (!tracker)
     {
-        std::vector<int> value(4);
-        pyopencvVecConverter<int>::to(obj, value, ArgInfo(name, 0));
-        r = Rect(value[0], value[1], value[2], value[3]);
-        return true;
+        Py_DECREF(records);
+        return NULL;
     }
-
+    tracker->records = records;
+    return (PyObject*)tracker;
 }
 
-template<>
-bool pyopencv_to(PyObject *obj, TermCriteria& dst, const char *name)
+static PyObject* pycvSetZeroCopyExport(PyObject*, PyObject *args, PyObject *kw)
 {
-    CV_UNUSED(name);
-    if(!obj)
-        return true;
-    return PyArg_ParseTuple(obj, "iid", &dst.type, &dst.maxCount, &dst.epsilon) > 0;
-}
+    const char *keywords[] = { "enable", NULL };
+    PyObject *enable = NULL;
 
-template<>
-PyObject* pyopencv_from(const TermCriteria& src)
-{
-    return Py_BuildValue("(iid)", src.type, src.maxCount, src.epsilon);
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "O", (char**)keywords, &enable))
+        return NULL;
+    int value = PyObject_IsTrue(enable);
+    if (value < 0)
+        return NULL;
+    g_zeroCopyExport = value > 0;
+    Py_RETURN_NONE;
 }
 
-template<>
-bool pyopencv_to(PyObject *obj, RotatedRect& dst, const char *name)
+static PyObject* pycvGetZeroCopyExport(PyObject*, PyObject*)
 {
-    CV_UNUSED(name);
-    if(!obj)
-        return true;
-    return PyArg_ParseTuple(obj, "(ff)(ff)f", &dst.center.x, &dst.center.y, &dst.size.width, &dst.size.height, &dst.angle) > 0;
+    return PyBool_FromLong(g_zeroCopyExport);
 }
 
-template<>
-PyObject* pyopencv_from(const RotatedRect& src)
+static PyObject* pycvSetStructuredArrays(PyObject*, PyObject *args, PyObject *kw)
 {
-    return Py_BuildValue("((ff)(ff)f)", src.center.x, src.center.y, src.size.width, src.size.height, src.angle);
+    const char *keywords[] = { "enable", NULL };
+    PyObject *enable = NULL;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "O", (char**)keywords, &enable))
+        return NULL;
+    int value = PyObject_IsTrue(enable);
+    if (value < 0)
+        return NULL;
+    g_structuredArrays = value > 0;
+    Py_RETURN_NONE;
 }
 
-template<>
-PyObject* pyopencv_from(const Moments& m)
+static PyObject* pycvGetStructuredArrays(PyObject*, PyObject*)
 {
-    return Py_BuildValue("{s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d}",
-                         "m00", m.m00, "m10", m.m10, "m01", m.m01,
-                         "m20", m.m20, "m11", m.m11, "m02", m.m02,
-                         "m30", m.m30, "m21", m.m21, "m12", m.m12, "m03", m.m03,
-                         "mu20", m.mu20, "mu11", m.mu11, "mu02", m.mu02,
-                         "mu30", m.mu30, "mu21", m.mu21, "mu12", m.mu12, "mu03", m.mu03,
-                         "nu20", m.nu20, "nu11", m.nu11, "nu02", m.nu02,
-                         "nu30", m.nu30, "nu21", m.nu21, "nu12", m.nu12, "nu03", m.nu03);
+    return PyBool_FromLong(g_structuredArrays);
 }
 
 static int OnError(int status, const char *func_name, const char *err_msg, const char *file_name, int line, void *userdata)
@@ -1632,43 +470,132 @@ static PyObject *pycvCreateButton(PyObject*, PyObject *args, PyObject *kw)
 }
 #endif
 
-///////////////////////////////////////////////////////////////////////////////////////
+#include "pyopencv_generated_types_content.h"
+#include "pyopencv_generated_funcs.h"
+
+static PyObject* pyopencv_stack_arrays(PyObject* list)
+{
+    PyObject* numpy = PyImport_ImportModule("numpy");
+    if (!numpy)
+        return NULL;
+    PyObject* result = PyObject_CallMethod(numpy, (char*)"stack", (char*)"O", list);
+    Py_DECREF(numpy);
+    return result;
+}
 
-static int convert_to_char(PyObject *o, char *dst, const char *name = "no_name")
+// Stacks the list of results: [a0, a1, ...] -> array, [(a0, b0), (a1, b1), ...] -> (array, array)
+static PyObject* pyopencv_stack_batch_results(PyObject* results)
 {
-    std::string str;
-    if (getUnicodeString(o, str))
+    Py_ssize_t n = PyList_Size(results);
+    if (n == 0 || !PyTuple_Check(PyList_GetItem(results, 0)))
+        return pyopencv_stack_arrays(results);
+    Py_ssize_t nout = PyTuple_Size(PyList_GetItem(results, 0));
+    PyObject* stacked = PyTuple_New(nout);
+    for (Py_ssize_t k = 0; stacked && k < nout; k++)
     {
-        *dst = str[0];
-        return 1;
+        PyObject* column = PyList_New(n);
+        for (Py_ssize_t i = 0; column && i < n; i++)
+        {
+            PyObject* item = PyTuple_GetItem(PyList_GetItem(results, i), k);
+            Py_INCREF(item);
+            PyList_SetItem(column, i, item);
+        }
+        PyObject* array = column ? pyopencv_stack_arrays(column) : NULL;
+        Py_XDECREF(column);
+        if (!array)
+        {
+            Py_CLEAR(stacked);
+            break;
+        }
+        PyTuple_SetItem(stacked, k, array);
     }
-    (*dst) = 0;
-    return failmsg("Expected single character string for argument '%s'", name);
+    return stacked;
 }
 
-#ifdef __GNUC__
-#  pragma GCC diagnostic ignored "-Wunused-parameter"
-#  pragma GCC diagnostic ignored "-Wmissing-field-initializers"
-#endif
+static PyObject* pycvBatch(PyObject*, PyObject *args, PyObject *kw)
+{
+    Py_ssize_t nargs = PyTuple_Size(args);
+    if (nargs < 2)
+        return failmsgp("batch() requires a function and a sequence of arrays");
+    PyObject* fn = PyTuple_GetItem(args, 0);
+    PyObject* items = PyTuple_GetItem(args, 1);
 
+    static std::map<PyCFunction, pyopencv_BatchFn> batch_funcs;
+    if (batch_funcs.empty())
+    {
+        for (const pyopencv_BatchFunc* f = pyopencv_batch_funcs; f->wrapper != NULL; f++)
+            batch_funcs[f->wrapper] = f->batch;
+    }
+    std::map<PyCFunction, pyopencv_BatchFn>::const_iterator it =
+        PyCFunction_Check(fn) ? batch_funcs.find(PyCFunction_GetFunction(fn)) : batch_funcs.end();
+    if (it == batch_funcs.end())
+        return failmsgp("batch() supports only f(src, ...) -> dst, ... functions of cv2 with the input array as the first argument");
+    if (!PySequence_Check(items) || PyUnicode_Check(items))
+        return failmsgp("batch() requires a sequence of arrays");
 
-#include "pyopencv_generated_enums.h"
-#include "pyopencv_custom_headers.h"
+    bool stack = false;
+    PyObject* call_kw = kw ? PyDict_Copy(kw) : NULL;
+    PyObject* stack_obj = call_kw ? PyDict_GetItemString(call_kw, "stack") : NULL;
+    if (stack_obj)
+    {
+        stack = PyObject_IsTrue(stack_obj) > 0;
+        PyDict_DelItemString(call_kw, "stack");
+    }
 
-#ifdef CVPY_DYNAMIC_INIT
-#define CVPY_TYPE(NAME, STORAGE, SNAME, _1, _2) CVPY_TYPE_DECLARE_DYNAMIC(NAME, STORAGE, SNAME)
-#else
-#define CVPY_TYPE(NAME, STORAGE, SNAME, _1, _2) CVPY_TYPE_DECLARE(NAME, STORAGE, SNAME)
-#endif
-#include "pyopencv_generated_types.h"
-#undef CVPY_TYPE
+    PyObject* result = NULL;
+    Py_ssize_t n = PySequence_Size(items);
+    // the first item is passed as the regular 'src' argument,
+    // None for the empty sequence: the other arguments are checked anyway
+    PyObject* first = n > 0 ? PySequence_GetItem(items, 0) : n == 0 ? (Py_INCREF(Py_None), Py_None) : NULL;
+    if (first)
+    {
+        PyObject* call_args = PyTuple_New(nargs - 1);
+        PyTuple_SetItem(call_args, 0, first);
+        for (Py_ssize_t i = 2; i < nargs; i++)
+        {
+            PyObject* arg = PyTuple_GetItem(args, i);
+            Py_INCREF(arg);
+            PyTuple_SetItem(call_args, i - 1, arg);
+        }
+        result = it->second(items, call_args, call_kw);
+        Py_DECREF(call_args);
+    }
+    Py_XDECREF(call_kw);
+    if (result && stack && PyList_Size(result) > 0)
+    {
+        PyObject* stacked = pyopencv_stack_batch_results(result);
+        Py_DECREF(result);
+        result = stacked;
+    }
+    return result;
+}
 
-#include "pyopencv_generated_types_content.h"
-#include "pyopencv_generated_funcs.h"
 
+static PyObject* pycvSetNumpyBufferPool(PyObject*, PyObject *args, PyObject *kw)
+{
+    const char *keywords[] = { "max_bytes", NULL };
+    Py_ssize_t max_bytes = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "n", (char**)keywords, &max_bytes))
+        return NULL;
+    if (max_bytes < 0)
+    {
+        PyErr_SetString(PyExc_ValueError, "max_bytes must be non-negative");
+        return NULL;
+    }
+    getNumpyBufferPool().setMaxBytes((size_t)max_bytes);
+    Py_RETURN_NONE;
+}
+
+static PyObject* pycvGetNumpyBufferPoolStats(PyObject*, PyObject*)
+{
+    return getNumpyBufferPool().stats();
+}
 
 static PyMethodDef special_methods[] = {
   {"redirectError", CV_PY_FN_WITH_KW(pycvRedirectError), "redirectError(onError) -> None"},
+  {"setNumpyBufferPool", CV_PY_FN_WITH_KW(pycvSetNumpyBufferPool), "setNumpyBufferPool(max_bytes) -> None\n.   Reuse buffers of released output arrays, keeping up to max_bytes of them. 0 disables the pool. Resets the pool statistics"},
+  {"getNumpyBufferPoolStats", (PyCFunction)pycvGetNumpyBufferPoolStats, METH_NOARGS, "getNumpyBufferPoolStats() -> dict\n.   Statistics of the buffer pool: max_bytes, pooled_bytes, buffers, hits, misses, evictions"},
 #ifdef HAVE_OPENCV_HIGHGUI
   {"createTrackbar", (PyCFunction)pycvCreateTrackbar, METH_VARARGS, "createTrackbar(trackbarName, windowName, value, count, onChange) -> None"},
   {"createButton", CV_PY_FN_WITH_KW(pycvCreateButton), "createButton(buttonName, onChange [, userData, buttonType, initialButtonState]) -> None"},
@@ -1681,6 +608,74 @@ static PyMethodDef special_methods[] = {
   {NULL, NULL},
 };
 
+static PyObject* pycvEnableCallStats(PyObject*, PyObject *args, PyObject *kw)
+{
+    const char *keywords[] = { "enable", NULL };
+    PyObject *enable = NULL;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "O", (char**)keywords, &enable))
+        return NULL;
+    int value = PyObject_IsTrue(enable);
+    if (value < 0)
+        return NULL;
+#ifdef CVPY_DISABLE_CALL_STATS
+    if (value)
+    {
+        PyErr_SetString(PyExc_NotImplementedError, "Call statistics are disabled in this build (CVPY_DISABLE_CALL_STATS)");
+        return NULL;
+    }
+#endif
+    g_callStatsEnabled = value > 0;
+    Py_RETURN_NONE;
+}
+
+static PyObject* pycvGetCallStats(PyObject*, PyObject*)
+{
+    PyObject* result = PyDict_New();
+    if (!result)
+        return NULL;
+    const double scale = 1.0 / getTickFrequency();
+    for (cvpy_CallStats* s = g_callStatsList; s != NULL; s = s->next)
+    {
+        if (s->calls == 0 && s->errors == 0)
+            continue;
+        PyObject* item = Py_BuildValue("{s:L,s:L,s:d,s:d,s:d}",
+                                       "calls", (long long)s->calls, "errors", (long long)s->errors,
+                                       "convert_time", s->convertTicks * scale, "call_time", s->callTicks * scale,
+                                       "return_time", s->returnTicks * scale);
+        if (!item || PyDict_SetItemString(result, s->name, item) < 0)
+        {
+            Py_XDECREF(item);
+            Py_DECREF(result);
+            return NULL;
+        }
+        Py_DECREF(item);
+    }
+    return result;
+}
+
+static PyObject* pycvResetCallStats(PyObject*, PyObject*)
+{
+    for (cvpy_CallStats* s = g_callStatsList; s != NULL; s = s->next)
+        s->calls = s->errors = s->convertTicks = s->callTicks = s->returnTicks = 0;
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef utils_methods[] = {
+  {"setZeroCopyExport", CV_PY_FN_WITH_KW(pycvSetZeroCopyExport), "setZeroCopyExport(enable) -> None\n.   Return arrays sharing the memory of non-numpy Mat results instead of copying them"},
+  {"getZeroCopyExport", (PyCFunction)pycvGetZeroCopyExport, METH_NOARGS, "getZeroCopyExport() -> retval"},
+  {"setStructuredArrays", CV_PY_FN_WITH_KW(pycvSetStructuredArrays), "setStructuredArrays(enable) -> None\n.   Return vectors of KeyPoint and DMatch as numpy structured arrays instead of lists of objects"},
+  {"getStructuredArrays", (PyCFunction)pycvGetStructuredArrays, METH_NOARGS, "getStructuredArrays() -> retval"},
+  {"batch", CV_PY_FN_WITH_KW(pycvBatch), "batch(fn, images, *args, stack=False, **kwargs) -> list of results\n.   Calls fn(image, *args, **kwargs) for each image in parallel, with GIL released once for the whole batch.\n.   fn must take the input array as the first argument and return arrays (and optionally a number).\n.   With stack=True results are stacked into arrays"},
+  {"enableCallStats", CV_PY_FN_WITH_KW(pycvEnableCallStats), "enableCallStats(enable) -> None\n.   Collect the number of calls and the time spent in each wrapped function"},
+  {"getCallStats", (PyCFunction)pycvGetCallStats, METH_NOARGS, "getCallStats() -> dict\n.   Statistics of the called functions: calls, errors, convert_time, call_time and return_time (in seconds).\n.   Use json.dumps() to export them"},
+  {"resetCallStats", (PyCFunction)pycvResetCallStats, METH_NOARGS, "resetCallStats() -> None"},
+  {"trackConversions", (PyCFunction)pycvTrackConversions, METH_NOARGS, "trackConversions() -> context manager\n.   Record implicit copies and casts of array arguments while the context is active.\n.   The context is the list of records (dicts with function, argument, reason, dtype, shape and bytes keys)"},
+  {"toDLPack", (PyCFunction)pycvToDLPack, METH_O, "toDLPack(array) -> capsule\n.   Export the array as DLPack 'dltensor' capsule sharing the data (e.g. for torch.utils.dlpack.from_dlpack)"},
+  {"fromDLPack", (PyCFunction)pycvFromDLPack, METH_O, "fromDLPack(tensor) -> array\n.   Wrap DLPack tensor of CPU memory (an object with __dlpack__() or 'dltensor' capsule) into numpy array without copying"},
+  {NULL, NULL},
+};
+
 /************************************************************************/
 /* Module init */
 
@@ -1690,6 +685,10 @@ struct ConstDef
     long long val;
 };
 
+static ConstDef utils_consts[] = {
+  {NULL, 0}
+};
+
 static void init_submodule(PyObject * root, const char * name, PyMethodDef * methods, ConstDef * consts)
 {
   // traverse and create nested submodules
@@ -1731,6 +730,36 @@ static void init_submodule(PyObject * root, const char * name, PyMethodDef * met
 
 }
 
+#if PY_VERSION_HEX >= 0x03070000
+// Python submodules of the cv2 package (modules/python/package/cv2) are imported on the first access,
+// so "import cv2" doesn't import their dependencies (asyncio for cv2.aio)
+static const char * python_submodules[] = { "aio", NULL };
+
+static PyObject* pycvRootModuleGetattr(PyObject * module, PyObject * attr)
+{
+  std::string name;
+  if (getUnicodeString(attr, name))
+  {
+    for (const char ** submodule = python_submodules; *submodule != NULL; ++submodule)
+    {
+      if (name == *submodule)
+        return PyImport_ImportModule((std::string(MODULESTR ".") + name).c_str());
+    }
+  }
+  PyErr_Format(PyExc_AttributeError, "module '%s' has no attribute '%U'", PyModule_GetName(module), attr);
+  return NULL;
+}
+
+static PyMethodDef root_module_getattr = {"__getattr__", (PyCFunction)pycvRootModuleGetattr, METH_O, NULL};
+
+static void init_python_submodules(PyObject * root)
+{
+  PyObject * getattr_obj = PyCFunction_NewEx(&root_module_getattr, root, NULL);
+  PyDict_SetItemString(PyModule_GetDict(root), "__getattr__", getattr_obj);
+  Py_DECREF(getattr_obj);
+}
+#endif
+
 #include "pyopencv_generated_modules_content.h"
 
 static bool init_body(PyObject * m)
@@ -1739,6 +768,10 @@ static bool init_body(PyObject * m)
     init_submodule(m, MODULESTR NAMESTR, methods_##NAME, consts_##NAME)
     #include "pyopencv_generated_modules.h"
 #undef CVPY_MODULE
+    init_submodule(m, MODULESTR".utils", utils_methods, utils_consts);
+#if PY_VERSION_HEX >= 0x03070000
+    init_python_submodules(m);
+#endif
 
 #ifdef CVPY_DYNAMIC_INIT
 #define CVPY_TYPE(NAME, _1, _2, BASE, CONSTRUCTOR) CVPY_TYPE_INIT_DYNAMIC(NAME, return false, BASE, CONSTRUCTOR)
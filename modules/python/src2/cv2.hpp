@@ -0,0 +1,2468 @@
+#ifndef __CV2_HPP__
+#define __CV2_HPP__
+
+// Common part of cv2.cpp and the shards of the generated wrappers (see OPENCV_PYTHON_BINDINGS_SHARDS):
+// converters and helpers used by the generated code. The shared state is defined in cv2.cpp.
+
+//warning number '5033' not a valid compiler warning in vc12
+#if defined(_MSC_VER) && (_MSC_VER > 1800)
+// eliminating duplicated round() declaration
+#define HAVE_ROUND 1
+#pragma warning(push)
+#pragma warning(disable:5033)  // 'register' is no longer a supported storage class
+#endif
+
+// #define CVPY_DYNAMIC_INIT
+// #define Py_DEBUG
+
+#if defined(CVPY_DYNAMIC_INIT) && !defined(Py_DEBUG)
+#   define Py_LIMITED_API 0x03030000
+#endif
+
+#include <math.h>
+#include <stddef.h>  // offsetof
+#include <Python.h>
+
+#if PY_MAJOR_VERSION < 3
+#undef CVPY_DYNAMIC_INIT
+#endif
+
+#if defined(_MSC_VER) && (_MSC_VER > 1800)
+#pragma warning(pop)
+#endif
+
+#define MODULESTR "cv2"
+#define NPY_NO_DEPRECATED_API NPY_1_7_API_VERSION
+// numpy API table is shared by the translation units of the module, import_array() is called by cv2.cpp
+#define PY_ARRAY_UNIQUE_SYMBOL opencv_ARRAY_API
+#ifdef CVPY_SHARD
+#define NO_IMPORT_ARRAY
+#endif
+
+#include <numpy/ndarrayobject.h>
+
+#include "pyopencv_generated_include.h"
+#include "opencv2/core/types_c.h"
+#include "opencv2/opencv_modules.hpp"
+#include "pycompat.hpp"
+#include <initializer_list>
+#include <list>
+#include <map>
+
+#include <type_traits>  // std::enable_if
+
+template<typename T, class TEnable = void>  // TEnable is used for SFINAE checks
+struct PyOpenCV_Converter
+{
+    //static inline bool to(PyObject* obj, T& p, const char* name);
+    //static inline PyObject* from(const T& src);
+};
+
+template<typename T> static
+bool pyopencv_to(PyObject* obj, T& p, const char* name = "<unknown>") { return PyOpenCV_Converter<T>::to(obj, p, name); }
+
+template<typename T> static
+PyObject* pyopencv_from(const T& src) { return PyOpenCV_Converter<T>::from(src); }
+
+extern PyObject* opencv_error;
+
+// Set with the conversion errors which no other overload can fix (e.g. a read-only buffer passed as output array):
+// the overload dispatch reports them instead of trying the remaining variants
+extern thread_local bool g_finalArgError;
+
+static int failmsg(const char *fmt, ...)
+{
+    char str[1000];
+
+    va_list ap;
+    va_start(ap, fmt);
+    vsnprintf(str, sizeof(str), fmt, ap);
+    va_end(ap);
+
+    PyErr_SetString(PyExc_TypeError, str);
+    return 0;
+}
+
+struct ArgInfo
+{
+    const char * name;
+    bool outputarg;
+    // more fields may be added if necessary
+
+    ArgInfo(const char * name_, bool outputarg_)
+        : name(name_)
+        , outputarg(outputarg_) {}
+
+    // to match with older pyopencv_to function signature
+    operator const char *() const { return name; }
+};
+
+class PyAllowThreads
+{
+public:
+    PyAllowThreads() : _state(PyEval_SaveThread()) {}
+    ~PyAllowThreads()
+    {
+        PyEval_RestoreThread(_state);
+    }
+private:
+    PyThreadState* _state;
+};
+
+class PyEnsureGIL
+{
+public:
+    PyEnsureGIL() : _state(PyGILState_Ensure()) {}
+    ~PyEnsureGIL()
+    {
+        PyGILState_Release(_state);
+    }
+private:
+    PyGILState_STATE _state;
+};
+
+#define ERRWRAP2(expr) \
+try \
+{ \
+    PyAllowThreads allowThreads; \
+    expr; \
+} \
+catch (const cv::Exception &e) \
+{ \
+    PyObject_SetAttrString(opencv_error, "file", PyString_FromString(e.file.c_str())); \
+    PyObject_SetAttrString(opencv_error, "func", PyString_FromString(e.func.c_str())); \
+    PyObject_SetAttrString(opencv_error, "line", PyInt_FromLong(e.line)); \
+    PyObject_SetAttrString(opencv_error, "code", PyInt_FromLong(e.code)); \
+    PyObject_SetAttrString(opencv_error, "msg", PyString_FromString(e.msg.c_str())); \
+    PyObject_SetAttrString(opencv_error, "err", PyString_FromString(e.err.c_str())); \
+    PyErr_SetString(opencv_error, e.what()); \
+    return 0; \
+}
+
+using namespace cv;
+
+// Per-wrapper call statistics, enabled at runtime by cv2.utils.enableCallStats(True).
+// Generated wrappers define a cvpy_CallStats object each and measure the time spent in the argument
+// conversion, in the wrapped call (with GIL released) and in the conversion of results.
+// Counters are updated with GIL held. Build with -DCVPY_DISABLE_CALL_STATS to remove the instrumentation.
+struct cvpy_CallStats;
+extern cvpy_CallStats* g_callStatsList;
+extern bool g_callStatsEnabled;
+
+struct cvpy_CallStats
+{
+    const char* name;
+    cvpy_CallStats* next;
+    int64 calls, errors;
+    int64 convertTicks, callTicks, returnTicks;
+
+    cvpy_CallStats(const char* name_)
+        : name(name_), next(g_callStatsList), calls(0), errors(0), convertTicks(0), callTicks(0), returnTicks(0)
+    {
+        g_callStatsList = this;
+    }
+};
+
+// Python name of the function whose arguments are being converted (reported by cv2.utils.trackConversions()).
+// It is set while GIL is held: from the start of the wrapper until the wrapped call.
+extern const char* g_convertingFunction;
+
+class cvpy_CallTimer
+{
+public:
+    cvpy_CallTimer(cvpy_CallStats& stats_)
+        : stats(g_callStatsEnabled ? &stats_ : NULL), t_start(0), t_call(0), t_return(0),
+          prevFunction(g_convertingFunction), converting(true)
+    {
+        g_convertingFunction = stats_.name;
+        if (stats)
+            t_start = getTickCount();
+    }
+    void markCall()
+    {
+        endConversion();
+        if (stats)
+            t_call = getTickCount();
+    }
+    void markReturn() { if (stats) t_return = getTickCount(); }
+    ~cvpy_CallTimer()
+    {
+        endConversion();
+        if (!stats)
+            return;
+        int64 t_end = getTickCount();
+        if (!t_call)  // arguments are not accepted
+        {
+            stats->errors++;
+            stats->convertTicks += t_end - t_start;
+            return;
+        }
+        stats->calls++;
+        stats->convertTicks += t_call - t_start;
+        if (!t_return)  // exception
+        {
+            stats->errors++;
+            stats->callTicks += t_end - t_call;
+            return;
+        }
+        stats->callTicks += t_return - t_call;
+        stats->returnTicks += t_end - t_return;
+    }
+private:
+    void endConversion()
+    {
+        if (converting)
+            g_convertingFunction = prevFunction;
+        converting = false;
+    }
+
+    cvpy_CallStats* stats;
+    int64 t_start, t_call, t_return;
+    const char* prevFunction;
+    bool converting;
+};
+
+#ifndef CVPY_DISABLE_CALL_STATS
+#define CVPY_CALL_STATS_DEF(NAME, PYNAME) static cvpy_CallStats NAME(PYNAME);
+#define CVPY_CALL_STATS(NAME) cvpy_CallTimer pyopencv_call_timer(NAME)
+#define CVPY_CALL_STATS_MARK_CALL() pyopencv_call_timer.markCall()
+#define CVPY_CALL_STATS_MARK_RETURN() pyopencv_call_timer.markReturn()
+#else
+#define CVPY_CALL_STATS_DEF(NAME, PYNAME)
+#define CVPY_CALL_STATS(NAME)
+#define CVPY_CALL_STATS_MARK_CALL()
+#define CVPY_CALL_STATS_MARK_RETURN()
+#endif
+
+typedef std::vector<uchar> vector_uchar;
+typedef std::vector<char> vector_char;
+typedef std::vector<int> vector_int;
+typedef std::vector<float> vector_float;
+typedef std::vector<double> vector_double;
+typedef std::vector<size_t> vector_size_t;
+typedef std::vector<Point> vector_Point;
+typedef std::vector<Point2f> vector_Point2f;
+typedef std::vector<Point3f> vector_Point3f;
+typedef std::vector<Size> vector_Size;
+typedef std::vector<Vec2f> vector_Vec2f;
+typedef std::vector<Vec3f> vector_Vec3f;
+typedef std::vector<Vec4f> vector_Vec4f;
+typedef std::vector<Vec6f> vector_Vec6f;
+typedef std::vector<Vec4i> vector_Vec4i;
+typedef std::vector<Rect> vector_Rect;
+typedef std::vector<Rect2d> vector_Rect2d;
+typedef std::vector<RotatedRect> vector_RotatedRect;
+typedef std::vector<KeyPoint> vector_KeyPoint;
+typedef std::vector<Mat> vector_Mat;
+typedef std::vector<std::vector<Mat> > vector_vector_Mat;
+typedef std::vector<UMat> vector_UMat;
+typedef std::vector<DMatch> vector_DMatch;
+typedef std::vector<String> vector_String;
+typedef std::vector<Scalar> vector_Scalar;
+
+typedef std::vector<std::vector<char> > vector_vector_char;
+typedef std::vector<std::vector<Point> > vector_vector_Point;
+typedef std::vector<std::vector<Point2f> > vector_vector_Point2f;
+typedef std::vector<std::vector<Point3f> > vector_vector_Point3f;
+typedef std::vector<std::vector<DMatch> > vector_vector_DMatch;
+typedef std::vector<std::vector<KeyPoint> > vector_vector_KeyPoint;
+
+static PyObject* failmsgp(const char *fmt, ...)
+{
+  char str[1000];
+
+  va_list ap;
+  va_start(ap, fmt);
+  vsnprintf(str, sizeof(str), fmt, ap);
+  va_end(ap);
+
+  PyErr_SetString(PyExc_TypeError, str);
+  return 0;
+}
+
+// Returns the object passed as positional argument 'pos' or as keyword argument 'name' (borrowed reference),
+// NULL if it is not passed. Used to select the overloaded variant before the arguments are parsed.
+static PyObject* pyopencv_peek_arg(PyObject* args, PyObject* kw, Py_ssize_t pos, const char* name)
+{
+    if (args && pos < PyTuple_Size(args))
+        return PyTuple_GetItem(args, pos);
+    if (kw)
+        return PyDict_GetItemString(kw, name);
+    return NULL;
+}
+
+#ifdef CVPY_FASTCALL
+static PyObject* pyopencv_peek_arg(PyObject* const* args, Py_ssize_t nargs, PyObject* kwnames, Py_ssize_t pos, const char* name)
+{
+    if (pos < nargs)
+        return args[pos];
+    if (kwnames)
+    {
+        for (Py_ssize_t i = 0; i < PyTuple_GET_SIZE(kwnames); i++)
+        {
+            if (PyUnicode_CompareWithASCIIString(PyTuple_GET_ITEM(kwnames, i), name) == 0)
+                return args[nargs + i];
+        }
+    }
+    return NULL;
+}
+#define CVPY_PEEK_ARG(POS, NAME) pyopencv_peek_arg(args, nargs, kwnames, POS, NAME)
+#else
+#define CVPY_PEEK_ARG(POS, NAME) pyopencv_peek_arg(args, kw, POS, NAME)
+#endif
+
+static int pyopencv_depth_to_typenum(int depth)
+{
+    const int f = (int)(sizeof(size_t)/8);
+    return depth == CV_8U ? NPY_UBYTE : depth == CV_8S ? NPY_BYTE :
+           depth == CV_16U ? NPY_USHORT : depth == CV_16S ? NPY_SHORT :
+           depth == CV_32S ? NPY_INT : depth == CV_32F ? NPY_FLOAT :
+           depth == CV_64F ? NPY_DOUBLE : depth == CV_16F ? NPY_HALF : f*NPY_ULONGLONG + (f^1)*NPY_UINT;
+}
+
+// Optional pool of numpy buffers reused by NumpyAllocator, keyed by the buffer size.
+// A buffer is returned to the pool only when the array owning it is destroyed (the base capsule is released).
+// The least recently released buffers are freed when the pool exceeds the byte budget.
+// All methods are called with GIL held.
+class NumpyBufferPool
+{
+public:
+    NumpyBufferPool() : maxBytes(0), pooledBytes(0), hits(0), misses(0), evictions(0) {}
+
+    bool enabled() const { return maxBytes > 0; }
+
+    void* acquire(size_t size)
+    {
+        std::multimap<size_t, LRUList::iterator>::iterator it = bySize.find(size);
+        if (it == bySize.end())
+        {
+            misses++;
+            return fastMalloc(size);
+        }
+        hits++;
+        void* ptr = it->second->second;
+        lru.erase(it->second);
+        bySize.erase(it);
+        pooledBytes -= size;
+        return ptr;
+    }
+
+    void release(void* ptr, size_t size)
+    {
+        if (size > maxBytes)
+        {
+            fastFree(ptr);
+            if (enabled())
+                evictions++;
+            return;
+        }
+        lru.push_front(std::make_pair(size, ptr));
+        bySize.insert(std::make_pair(size, lru.begin()));
+        pooledBytes += size;
+        trim();
+    }
+
+    void setMaxBytes(size_t bytes)
+    {
+        maxBytes = bytes;
+        trim();
+        hits = misses = evictions = 0;
+    }
+
+    PyObject* stats() const
+    {
+        return Py_BuildValue("{s:n,s:n,s:n,s:n,s:n,s:n}",
+                             "max_bytes", (Py_ssize_t)maxBytes, "pooled_bytes", (Py_ssize_t)pooledBytes,
+                             "buffers", (Py_ssize_t)lru.size(), "hits", (Py_ssize_t)hits,
+                             "misses", (Py_ssize_t)misses, "evictions", (Py_ssize_t)evictions);
+    }
+
+private:
+    void trim()
+    {
+        while (pooledBytes > maxBytes)
+        {
+            std::pair<size_t, void*> entry = lru.back();
+            std::multimap<size_t, LRUList::iterator>::iterator it = bySize.find(entry.first);
+            while (it->second->second != entry.second)
+                ++it;
+            bySize.erase(it);
+            lru.pop_back();
+            pooledBytes -= entry.first;
+            fastFree(entry.second);
+            evictions++;
+        }
+    }
+
+    typedef std::list<std::pair<size_t, void*> > LRUList;  // most recently released buffers first
+    LRUList lru;
+    std::multimap<size_t, LRUList::iterator> bySize;
+    size_t maxBytes, pooledBytes;
+    size_t hits, misses, evictions;
+};
+
+NumpyBufferPool& getNumpyBufferPool();
+
+static void pyopencv_pooled_buffer_destructor(PyObject* capsule)
+{
+    void* ptr = PyCapsule_GetPointer(capsule, "cv2.NumpyBuffer");
+    size_t size = (size_t)PyCapsule_GetContext(capsule);
+    getNumpyBufferPool().release(ptr, size);
+}
+
+// Creates an array using a buffer from the pool
+static PyObject* pyopencv_new_pooled_array(int ndims, npy_intp* sizes, int typenum, size_t elemsize)
+{
+    size_t size = elemsize;
+    for (int i = 0; i < ndims; i++)
+        size *= (size_t)sizes[i];
+    if (size == 0)
+        return PyArray_SimpleNew(ndims, sizes, typenum);
+    NumpyBufferPool& pool = getNumpyBufferPool();
+    void* ptr = pool.acquire(size);
+    PyObject* base = PyCapsule_New(ptr, "cv2.NumpyBuffer", pyopencv_pooled_buffer_destructor);
+    if (!base)
+    {
+        pool.release(ptr, size);
+        return NULL;
+    }
+    PyCapsule_SetContext(base, (void*)size);
+    PyObject* o = PyArray_New(&PyArray_Type, ndims, sizes, typenum, NULL, ptr, 0, NPY_ARRAY_CARRAY, NULL);
+    if (!o)
+    {
+        Py_DECREF(base);
+        return NULL;
+    }
+    if (PyArray_SetBaseObject((PyArrayObject*)o, base) < 0)  // steals the reference to base
+    {
+        Py_DECREF(o);
+        return NULL;
+    }
+    return o;
+}
+
+class NumpyAllocator : public MatAllocator
+{
+public:
+    NumpyAllocator() { stdAllocator = Mat::getStdAllocator(); }
+    ~NumpyAllocator() {}
+
+    UMatData* allocate(PyObject* o, int dims, const int* sizes, int type, size_t* step) const
+    {
+        UMatData* u = new UMatData(this);
+        u->data = u->origdata = (uchar*)PyArray_DATA((PyArrayObject*) o);
+        npy_intp* _strides = PyArray_STRIDES((PyArrayObject*) o);
+        for( int i = 0; i < dims - 1; i++ )
+            step[i] = (size_t)_strides[i];
+        step[dims-1] = CV_ELEM_SIZE(type);
+        u->size = sizes[0]*step[0];
+        u->userdata = o;
+        return u;
+    }
+
+    UMatData* allocate(int dims0, const int* sizes, int type, void* data, size_t* step, AccessFlag flags, UMatUsageFlags usageFlags) const CV_OVERRIDE
+    {
+        if( data != 0 )
+        {
+            // issue #6969: CV_Error(Error::StsAssert, "The data should normally be NULL!");
+            // probably this is safe to do in such extreme case
+            return stdAllocator->allocate(dims0, sizes, type, data, step, flags, usageFlags);
+        }
+        PyEnsureGIL gil;
+
+        int cn = CV_MAT_CN(type);
+        int typenum = pyopencv_depth_to_typenum(CV_MAT_DEPTH(type));
+        int i, dims = dims0;
+        cv::AutoBuffer<npy_intp> _sizes(dims + 1);
+        for( i = 0; i < dims; i++ )
+            _sizes[i] = sizes[i];
+        if( cn > 1 )
+            _sizes[dims++] = cn;
+        PyObject* o = getNumpyBufferPool().enabled() ?
+            pyopencv_new_pooled_array(dims, _sizes.data(), typenum, CV_ELEM_SIZE1(type)) :
+            PyArray_SimpleNew(dims, _sizes.data(), typenum);
+        if(!o)
+            CV_Error_(Error::StsError, ("The numpy array of typenum=%d, ndims=%d can not be created", typenum, dims));
+        return allocate(o, dims0, sizes, type, step);
+    }
+
+    bool allocate(UMatData* u, AccessFlag accessFlags, UMatUsageFlags usageFlags) const CV_OVERRIDE
+    {
+        return stdAllocator->allocate(u, accessFlags, usageFlags);
+    }
+
+    void deallocate(UMatData* u) const CV_OVERRIDE
+    {
+        if(!u)
+            return;
+        PyEnsureGIL gil;
+        CV_Assert(u->urefcount >= 0);
+        CV_Assert(u->refcount >= 0);
+        if(u->refcount == 0)
+        {
+            PyObject* o = (PyObject*)u->userdata;
+            Py_XDECREF(o);
+            delete u;
+        }
+    }
+
+    const MatAllocator* stdAllocator;
+};
+
+extern NumpyAllocator g_numpyAllocator;
+
+
+enum { ARG_NONE = 0, ARG_MAT = 1, ARG_SCALAR = 2 };
+
+// Wraps an object with PEP 3118 buffer interface (bytes, bytearray, memoryview, mmap, array.array, ...)
+// into numpy array without copying the data. Shape, strides and element type are taken from the buffer,
+// the array references the buffer exporter. Returns NULL if the object doesn't provide a suitable buffer.
+static PyObject* pyopencv_buffer_to_ndarray(PyObject* o)
+{
+#ifndef Py_LIMITED_API
+    if (!PyObject_CheckBuffer(o))
+        return NULL;
+#endif
+    PyObject* view = PyMemoryView_FromObject(o);
+    if (!view)
+    {
+        PyErr_Clear();
+        return NULL;
+    }
+    PyObject* arr = PyArray_FromAny(view, NULL, 0, 0, 0, NULL);
+    Py_DECREF(view);
+    if (!arr)
+    {
+        PyErr_Clear();
+        return NULL;
+    }
+    if (!PyArray_Check(arr))
+    {
+        Py_DECREF(arr);
+        return NULL;
+    }
+    return arr;
+}
+
+// DLPack (https://github.com/dmlc/dlpack) tensors of CPU memory are exchanged without copying the data.
+// The structures below follow the ABI of dlpack.h (v0.x, used by "dltensor" capsules).
+struct pyopencv_DLDevice { int32_t device_type; int32_t device_id; };
+struct pyopencv_DLDataType { uint8_t code; uint8_t bits; uint16_t lanes; };
+struct pyopencv_DLTensor
+{
+    void* data;
+    pyopencv_DLDevice device;
+    int32_t ndim;
+    pyopencv_DLDataType dtype;
+    int64_t* shape;
+    int64_t* strides;  // in elements, NULL for compact row-major tensors
+    uint64_t byte_offset;
+};
+struct pyopencv_DLManagedTensor
+{
+    pyopencv_DLTensor dl_tensor;
+    void* manager_ctx;
+    void (*deleter)(pyopencv_DLManagedTensor* self);
+};
+enum { DLPACK_CPU = 1, DLPACK_INT = 0, DLPACK_UINT = 1, DLPACK_FLOAT = 2 };
+
+static void pyopencv_dlpack_owner_destructor(PyObject* capsule)
+{
+    pyopencv_DLManagedTensor* t = (pyopencv_DLManagedTensor*)PyCapsule_GetPointer(capsule, "cv2.DLManagedTensor");
+    if (t && t->deleter)
+        t->deleter(t);
+}
+
+// Wraps DLPack tensor (an object with __dlpack__() method or "dltensor" capsule) into numpy array without copying
+// the data. The array owns the tensor and calls its deleter when destroyed, so Mat created from the array
+// by NumpyAllocator keeps the tensor alive. Returns NULL without error set if the object is not a DLPack tensor.
+static PyObject* pyopencv_dlpack_to_ndarray(PyObject* o)
+{
+    PyObject* capsule = NULL;
+    if (PyCapsule_IsValid(o, "used_dltensor"))
+    {
+        PyErr_SetString(PyExc_BufferError, "DLPack capsule is already consumed");
+        return NULL;
+    }
+    if (PyCapsule_IsValid(o, "dltensor"))
+    {
+        capsule = o;
+        Py_INCREF(capsule);
+    }
+    else
+    {
+        if (!PyObject_HasAttrString(o, "__dlpack__"))
+            return NULL;
+        if (PyObject_HasAttrString(o, "__dlpack_device__"))
+        {
+            PyObject* device = PyObject_CallMethod(o, (char*)"__dlpack_device__", NULL);
+            if (!device)
+                return NULL;
+            int device_type = -1, device_id = 0;
+            bool ok = PyArg_ParseTuple(device, "ii", &device_type, &device_id) != 0;
+            Py_DECREF(device);
+            if (!ok)
+                return NULL;
+            if (device_type != DLPACK_CPU)
+            {
+                PyErr_Format(PyExc_BufferError, "DLPack tensor of device type %d is not supported, only CPU tensors (%d) can be used", device_type, (int)DLPACK_CPU);
+                return NULL;
+            }
+        }
+        capsule = PyObject_CallMethod(o, (char*)"__dlpack__", NULL);
+        if (!capsule)
+            return NULL;
+    }
+    pyopencv_DLManagedTensor* t = (pyopencv_DLManagedTensor*)PyCapsule_GetPointer(capsule, "dltensor");
+    if (!t)
+    {
+        Py_DECREF(capsule);
+        PyErr_SetString(PyExc_BufferError, "__dlpack__() must return 'dltensor' capsule");
+        return NULL;
+    }
+    PyCapsule_SetName(capsule, "used_dltensor");
+    Py_DECREF(capsule);
+    // from now on the tensor is owned by the new capsule
+    PyObject* owner = PyCapsule_New(t, "cv2.DLManagedTensor", pyopencv_dlpack_owner_destructor);
+    if (!owner)
+    {
+        if (t->deleter)
+            t->deleter(t);
+        return NULL;
+    }
+
+    const pyopencv_DLTensor& dl = t->dl_tensor;
+    const pyopencv_DLDataType& dt = dl.dtype;
+    int typenum = -1;
+    if (dt.lanes == 1)
+    {
+        if (dt.code == DLPACK_INT)
+            typenum = dt.bits == 8 ? NPY_INT8 : dt.bits == 16 ? NPY_INT16 : dt.bits == 32 ? NPY_INT32 : dt.bits == 64 ? NPY_INT64 : -1;
+        else if (dt.code == DLPACK_UINT)
+            typenum = dt.bits == 8 ? NPY_UINT8 : dt.bits == 16 ? NPY_UINT16 : dt.bits == 32 ? NPY_UINT32 : dt.bits == 64 ? NPY_UINT64 : -1;
+        else if (dt.code == DLPACK_FLOAT)
+            typenum = dt.bits == 16 ? NPY_FLOAT16 : dt.bits == 32 ? NPY_FLOAT32 : dt.bits == 64 ? NPY_FLOAT64 : -1;
+    }
+    if (dl.device.device_type != DLPACK_CPU || typenum < 0 || dl.ndim < 0 || dl.ndim > NPY_MAXDIMS)
+    {
+        PyErr_Format(PyExc_BufferError, "DLPack tensor (device type=%d, dtype code=%d bits=%d lanes=%d, ndim=%d) is not supported",
+                     (int)dl.device.device_type, (int)dt.code, (int)dt.bits, (int)dt.lanes, (int)dl.ndim);
+        Py_DECREF(owner);
+        return NULL;
+    }
+    npy_intp sizes[NPY_MAXDIMS], strides[NPY_MAXDIMS];
+    for (int i = 0; i < dl.ndim; i++)
+    {
+        sizes[i] = (npy_intp)dl.shape[i];
+        if (dl.strides)
+            strides[i] = (npy_intp)dl.strides[i] * (dt.bits / 8);
+    }
+    for (int i = dl.ndim - 1; i >= 0 && !dl.strides; i--)
+        strides[i] = i == dl.ndim - 1 ? dt.bits / 8 : strides[i + 1] * sizes[i + 1];
+    PyObject* arr = PyArray_New(&PyArray_Type, dl.ndim, sizes, typenum, strides,
+                                (char*)dl.data + dl.byte_offset, 0, NPY_ARRAY_WRITEABLE, NULL);
+    if (!arr)
+    {
+        Py_DECREF(owner);
+        return NULL;
+    }
+    PyArray_UpdateFlags((PyArrayObject*)arr, NPY_ARRAY_UPDATE_ALL);
+    if (PyArray_SetBaseObject((PyArrayObject*)arr, owner) < 0)  // steals the reference to owner
+    {
+        Py_DECREF(arr);
+        return NULL;
+    }
+    return arr;
+}
+
+static void pyopencv_dlpack_deleter(pyopencv_DLManagedTensor* t)
+{
+    PyEnsureGIL gil;
+    Py_XDECREF((PyObject*)t->manager_ctx);
+    delete[] t->dl_tensor.shape;
+    delete t;
+}
+
+static void pyopencv_dlpack_capsule_destructor(PyObject* capsule)
+{
+    // the tensor is released here only if no consumer has taken it (renamed the capsule to "used_dltensor")
+    if (!PyCapsule_IsValid(capsule, "dltensor"))
+        return;
+    pyopencv_DLManagedTensor* t = (pyopencv_DLManagedTensor*)PyCapsule_GetPointer(capsule, "dltensor");
+    if (t && t->deleter)
+        t->deleter(t);
+}
+
+// Exports numpy array as "dltensor" capsule. The tensor references the array
+static PyObject* pyopencv_ndarray_to_dlpack(PyArrayObject* arr)
+{
+    PyArray_Descr* descr = PyArray_DESCR(arr);
+    int code = descr->kind == 'i' ? DLPACK_INT : descr->kind == 'u' ? DLPACK_UINT : descr->kind == 'f' ? DLPACK_FLOAT : -1;
+    if (code < 0 || PyArray_ISBYTESWAPPED(arr))
+    {
+        PyErr_SetString(PyExc_BufferError, "DLPack export supports only integer and floating-point arrays in native byte order");
+        return NULL;
+    }
+    if (!PyArray_ISWRITEABLE(arr))
+    {
+        PyErr_SetString(PyExc_BufferError, "DLPack export of read-only arrays is not supported");
+        return NULL;
+    }
+    int ndim = PyArray_NDIM(arr);
+    npy_intp itemsize = PyArray_ITEMSIZE(arr);
+    const npy_intp* strides = PyArray_STRIDES(arr);
+    for (int i = 0; i < ndim; i++)
+    {
+        if (strides[i] % itemsize != 0)
+        {
+            PyErr_SetString(PyExc_BufferError, "DLPack export requires strides multiple of the element size");
+            return NULL;
+        }
+    }
+
+    pyopencv_DLManagedTensor* t = new pyopencv_DLManagedTensor();
+    t->dl_tensor.data = PyArray_DATA(arr);
+    t->dl_tensor.device.device_type = DLPACK_CPU;
+    t->dl_tensor.device.device_id = 0;
+    t->dl_tensor.ndim = ndim;
+    t->dl_tensor.dtype.code = (uint8_t)code;
+    t->dl_tensor.dtype.bits = (uint8_t)(itemsize * 8);
+    t->dl_tensor.dtype.lanes = 1;
+    t->dl_tensor.shape = new int64_t[2 * ndim + 1];
+    t->dl_tensor.strides = t->dl_tensor.shape + ndim;
+    for (int i = 0; i < ndim; i++)
+    {
+        t->dl_tensor.shape[i] = (int64_t)PyArray_DIM(arr, i);
+        t->dl_tensor.strides[i] = (int64_t)(strides[i] / itemsize);
+    }
+    t->dl_tensor.byte_offset = 0;
+    Py_INCREF(arr);
+    t->manager_ctx = arr;
+    t->deleter = pyopencv_dlpack_deleter;
+
+    PyObject* capsule = PyCapsule_New(t, "dltensor", pyopencv_dlpack_capsule_destructor);
+    if (!capsule)
+        pyopencv_dlpack_deleter(t);
+    return capsule;
+}
+
+// Functions which only move the elements (flip, transpose, copyTo, ...) take int64 arrays as CV_64F data
+// of the same element size instead of casting them to int32. The generated wrapper of such function creates
+// the scope and calls start() with its Mat and vector<Mat> arguments before they are converted: int64
+// (or uint64) arrays are taken as CV_64F if all 8-byte arrays of the call have the same type, and the CV_64F
+// results are returned with this type.
+struct pyopencv_OpaqueInt64Scope
+{
+    pyopencv_OpaqueInt64Scope();
+    ~pyopencv_OpaqueInt64Scope();
+    bool start(std::initializer_list<PyObject*> arrays, std::initializer_list<PyObject*> vectors);
+
+    int typenum;  // NPY_INT64 or NPY_UINT64 if the arrays of this type are taken as CV_64F, -1 otherwise
+    pyopencv_OpaqueInt64Scope* prev;
+};
+extern thread_local pyopencv_OpaqueInt64Scope* g_opaqueInt64Scope;
+
+// Returns NPY_INT64 or NPY_UINT64 for the 64-bit integer arrays, NPY_DOUBLE for the other arrays of 8-byte elements
+// (float64), -1 if the object is not an array of 8-byte elements
+static int pyopencv_8byte_typenum(PyObject* o)
+{
+    if (!PyArray_Check(o) || PyArray_ITEMSIZE((PyArrayObject*)o) != 8)
+        return -1;
+    if (!PyArray_ISINTEGER((PyArrayObject*)o))
+        return NPY_DOUBLE;
+    return PyArray_ISSIGNED((PyArrayObject*)o) ? NPY_INT64 : NPY_UINT64;
+}
+
+// Implicit copies of array arguments, recorded by cv2.utils.trackConversions()
+extern std::vector<PyObject*> g_conversionTrackers;  // record lists of the active contexts
+
+static void pyopencv_track_conversion(const ArgInfo& info, const char* reason, PyArrayObject* src, npy_intp bytes)
+{
+    int ndims = PyArray_NDIM(src);
+    PyObject* shape = PyTuple_New(ndims);
+    for (int i = 0; i < ndims; i++)
+        PyTuple_SetItem(shape, i, PyLong_FromSsize_t((Py_ssize_t)PyArray_DIM(src, i)));
+    PyObject* dtype = PyObject_Str((PyObject*)PyArray_DESCR(src));
+    PyObject* record = Py_BuildValue("{s:z,s:s,s:s,s:N,s:N,s:n}",
+        "function", g_convertingFunction, "argument", info.name, "reason", reason,
+        "dtype", dtype, "shape", shape, "bytes", (Py_ssize_t)bytes);
+    if (!record)
+    {
+        PyErr_Clear();
+        return;
+    }
+    for (size_t i = 0; i < g_conversionTrackers.size(); i++)
+        PyList_Append(g_conversionTrackers[i], record);
+    Py_DECREF(record);
+}
+
+// special case, when the converter needs full ArgInfo structure
+static bool pyopencv_to(PyObject* o, Mat& m, const ArgInfo info)
+{
+    bool allowND = true;
+    if(!o || o == Py_None)
+    {
+        if( !m.data )
+            m.allocator = &g_numpyAllocator;
+        return true;
+    }
+
+    if( PyInt_Check(o) )
+    {
+        double v[] = {static_cast<double>(PyInt_AsLong((PyObject*)o)), 0., 0., 0.};
+        m = Mat(4, 1, CV_64F, v).clone();
+        return true;
+    }
+    if( PyFloat_Check(o) )
+    {
+        double v[] = {PyFloat_AsDouble((PyObject*)o), 0., 0., 0.};
+        m = Mat(4, 1, CV_64F, v).clone();
+        return true;
+    }
+    if( PyTuple_Check(o) )
+    {
+        int i, sz = (int)PyTuple_Size((PyObject*)o);
+        m = Mat(sz, 1, CV_64F);
+        for( i = 0; i < sz; i++ )
+        {
+            PyObject* oi = PyTuple_GetItem(o, i);
+            if( PyInt_Check(oi) )
+                m.at<double>(i) = (double)PyInt_AsLong(oi);
+            else if( PyFloat_Check(oi) )
+                m.at<double>(i) = (double)PyFloat_AsDouble(oi);
+            else
+            {
+                failmsg("%s is not a numerical tuple", info.name);
+                m.release();
+                return false;
+            }
+        }
+        return true;
+    }
+
+    if( !PyArray_Check(o) )
+    {
+        PyObject* arr = pyopencv_buffer_to_ndarray(o);
+        if( !arr )
+            arr = pyopencv_dlpack_to_ndarray(o);
+        if( !arr )
+        {
+            if( !PyErr_Occurred() )
+                failmsg("%s is not a numpy array, neither a scalar", info.name);
+            return false;
+        }
+        if( info.outputarg && !PyArray_ISWRITEABLE((PyArrayObject*)arr) )
+        {
+            Py_DECREF(arr);
+            failmsg("Output array %s is read-only", info.name);
+            g_finalArgError = true;
+            return false;
+        }
+        // the Mat keeps a reference to the array, which pins the buffer of the original object
+        bool res = pyopencv_to(arr, m, info);
+        Py_DECREF(arr);
+        return res;
+    }
+
+    PyArrayObject* oarr = (PyArrayObject*) o;
+
+    bool needcopy = false, needcast = false;
+    int typenum = PyArray_TYPE(oarr), new_typenum = typenum;
+    int type = typenum == NPY_UBYTE ? CV_8U :
+               typenum == NPY_BYTE ? CV_8S :
+               typenum == NPY_USHORT ? CV_16U :
+               typenum == NPY_SHORT ? CV_16S :
+               typenum == NPY_INT ? CV_32S :
+               typenum == NPY_INT32 ? CV_32S :
+               typenum == NPY_HALF ? CV_16F :
+               typenum == NPY_FLOAT ? CV_32F :
+               typenum == NPY_DOUBLE ? CV_64F : -1;
+
+    if( type < 0 )
+    {
+        if( g_opaqueInt64Scope && g_opaqueInt64Scope->typenum >= 0 && pyopencv_8byte_typenum(o) == g_opaqueInt64Scope->typenum )
+        {
+            type = CV_64F;
+        }
+        else if( typenum == NPY_INT64 || typenum == NPY_UINT64 || typenum == NPY_LONG ||
+                 typenum == NPY_LONGLONG || typenum == NPY_ULONGLONG )
+        {
+            needcopy = needcast = true;
+            new_typenum = NPY_INT;
+            type = CV_32S;
+        }
+        else
+        {
+            failmsg("%s data type = %d is not supported", info.name, typenum);
+            return false;
+        }
+    }
+
+#ifndef CV_MAX_DIM
+    const int CV_MAX_DIM = 32;
+#endif
+
+    int ndims = PyArray_NDIM(oarr);
+    if(ndims >= CV_MAX_DIM)
+    {
+        failmsg("%s dimensionality (=%d) is too high", info.name, ndims);
+        return false;
+    }
+
+    int size[CV_MAX_DIM+1];
+    size_t step[CV_MAX_DIM+1];
+    size_t elemsize = CV_ELEM_SIZE1(type);
+    const npy_intp* _sizes = PyArray_DIMS(oarr);
+    const npy_intp* _strides = PyArray_STRIDES(oarr);
+    bool ismultichannel = ndims == 3 && _sizes[2] <= CV_CN_MAX;
+
+    for( int i = ndims-1; i >= 0 && !needcopy; i-- )
+    {
+        // these checks handle cases of
+        //  a) multi-dimensional (ndims > 2) arrays, as well as simpler 1- and 2-dimensional cases
+        //  b) transposed arrays, where _strides[] elements go in non-descending order
+        //  c) flipped arrays, where some of _strides[] elements are negative
+        // the _sizes[i] > 1 is needed to avoid spurious copies when NPY_RELAXED_STRIDES is set
+        if( (i == ndims-1 && _sizes[i] > 1 && (size_t)_strides[i] != elemsize) ||
+            (i < ndims-1 && _sizes[i] > 1 && _strides[i] < _strides[i+1]) )
+            needcopy = true;
+    }
+
+    if( ismultichannel && _strides[1] != (npy_intp)elemsize*_sizes[2] )
+        needcopy = true;
+
+    if (needcopy)
+    {
+        if (info.outputarg)
+        {
+            failmsg("Layout of the output array %s is incompatible with cv::Mat (step[ndims-1] != elemsize or step[1] != elemsize*nchannels)", info.name);
+            return false;
+        }
+
+        PyArrayObject* src = oarr;
+        if( needcast ) {
+            o = PyArray_Cast(oarr, new_typenum);
+            oarr = (PyArrayObject*) o;
+        }
+        else {
+            oarr = PyArray_GETCONTIGUOUS(oarr);
+            o = (PyObject*) oarr;
+        }
+        if( !g_conversionTrackers.empty() )
+            pyopencv_track_conversion(info, needcast ? "cast to int32" : "non-contiguous layout", src, PyArray_NBYTES(oarr));
+
+        _strides = PyArray_STRIDES(oarr);
+    }
+
+    // Normalize strides in case NPY_RELAXED_STRIDES is set
+    size_t default_step = elemsize;
+    for ( int i = ndims - 1; i >= 0; --i )
+    {
+        size[i] = (int)_sizes[i];
+        if ( size[i] > 1 )
+        {
+            step[i] = (size_t)_strides[i];
+            default_step = step[i] * size[i];
+        }
+        else
+        {
+            step[i] = default_step;
+            default_step *= size[i];
+        }
+    }
+
+    // handle degenerate case
+    if( ndims == 0) {
+        size[ndims] = 1;
+        step[ndims] = elemsize;
+        ndims++;
+    }
+
+    if( ismultichannel )
+    {
+        ndims--;
+        type |= CV_MAKETYPE(0, size[2]);
+    }
+
+    if( ndims > 2 && !allowND )
+    {
+        failmsg("%s has more than 2 dimensions", info.name);
+        return false;
+    }
+
+    m = Mat(ndims, size, type, PyArray_DATA(oarr), step);
+    m.u = g_numpyAllocator.allocate(o, ndims, size, type, step);
+    m.addref();
+
+    if( !needcopy )
+    {
+        Py_INCREF(o);
+    }
+    m.allocator = &g_numpyAllocator;
+
+    return true;
+}
+
+template<>
+bool pyopencv_to(PyObject* o, Mat& m, const char* name)
+{
+    return pyopencv_to(o, m, ArgInfo(name, 0));
+}
+
+template<typename _Tp, int m, int n>
+bool pyopencv_to(PyObject* o, Matx<_Tp, m, n>& mx, const ArgInfo info)
+{
+    Mat tmp;
+    if (!pyopencv_to(o, tmp, info)) {
+        return false;
+    }
+
+    tmp.copyTo(mx);
+    return true;
+}
+
+template<typename _Tp, int m, int n>
+bool pyopencv_to(PyObject* o, Matx<_Tp, m, n>& mx, const char* name)
+{
+    return pyopencv_to(o, mx, ArgInfo(name, 0));
+}
+
+// Mats allocated outside of NumpyAllocator (cached members, dnn blobs, etc) are copied into numpy arrays by default.
+// With enabled zero-copy export they are wrapped instead: the array refers to the Mat data
+// and keeps a Mat reference in the capsule base object.
+extern bool g_zeroCopyExport;
+
+static void pyopencv_Mat_capsule_destructor(PyObject* capsule)
+{
+    delete (Mat*)PyCapsule_GetPointer(capsule, "cv2.Mat");
+}
+
+static PyObject* pyopencv_wrap_Mat(const Mat& m, bool writeable)
+{
+    int depth = m.depth(), cn = m.channels();
+    int ndims = m.dims;
+    npy_intp sizes[CV_MAX_DIM+1], strides[CV_MAX_DIM+1];
+    for (int i = 0; i < ndims; i++)
+    {
+        sizes[i] = m.size[i];
+        strides[i] = (npy_intp)m.step[i];
+    }
+    if (cn > 1)
+    {
+        sizes[ndims] = cn;
+        strides[ndims] = (npy_intp)m.elemSize1();
+        ndims++;
+    }
+    PyObject* o = PyArray_New(&PyArray_Type, ndims, sizes, pyopencv_depth_to_typenum(depth), strides,
+                              m.data, 0, writeable ? NPY_ARRAY_WRITEABLE : 0, NULL);
+    if (!o)
+        return NULL;
+    Mat* ref = new Mat(m);
+    PyObject* base = PyCapsule_New(ref, "cv2.Mat", pyopencv_Mat_capsule_destructor);
+    if (!base)
+    {
+        delete ref;
+        Py_DECREF(o);
+        return NULL;
+    }
+    // the base is stolen even on failure, its destructor releases the Mat reference
+    if (PyArray_SetBaseObject((PyArrayObject*)o, base) < 0)
+    {
+        Py_DECREF(o);
+        return NULL;
+    }
+    return o;
+}
+
+static PyObject* pyopencv_from_Mat(const Mat& m, bool writeable)
+{
+    if( !m.data )
+        Py_RETURN_NONE;
+    Mat temp, *p = (Mat*)&m;
+    if(!p->u || p->allocator != &g_numpyAllocator)
+    {
+        // data without UMatData is not reference counted, so its lifetime is unknown
+        if (g_zeroCopyExport && p->u)
+            return pyopencv_wrap_Mat(m, writeable);
+        temp.allocator = &g_numpyAllocator;
+        ERRWRAP2(m.copyTo(temp));
+        p = &temp;
+    }
+    PyObject* o = (PyObject*)p->u->userdata;
+    Py_INCREF(o);
+    return o;
+}
+
+template<>
+PyObject* pyopencv_from(const Mat& m)
+{
+    PyObject* o = pyopencv_from_Mat(m, true);
+    if (o && g_opaqueInt64Scope && g_opaqueInt64Scope->typenum >= 0 && PyArray_Check(o) && PyArray_TYPE((PyArrayObject*)o) == NPY_DOUBLE)
+    {
+        // CV_64F result of int64 (uint64) input data
+        PyObject* view = PyArray_View((PyArrayObject*)o, PyArray_DescrFromType(g_opaqueInt64Scope->typenum), NULL);
+        Py_DECREF(o);
+        return view;
+    }
+    return o;
+}
+
+// Used by the generated getters of Mat properties. Zero-copy arrays of Mat members are read-only,
+// so modification of the returned array can't silently change the object state.
+static inline PyObject* pyopencv_from_property(const Mat& m)
+{
+    return pyopencv_from_Mat(m, false);
+}
+
+template<typename _Tp, int m, int n>
+PyObject* pyopencv_from(const Matx<_Tp, m, n>& matx)
+{
+    return pyopencv_from(Mat(matx));
+}
+
+template<typename T>
+struct PyOpenCV_Converter< cv::Ptr<T> >
+{
+    static PyObject* from(const cv::Ptr<T>& p)
+    {
+        if (!p)
+            Py_RETURN_NONE;
+        return pyopencv_from(*p);
+    }
+    static bool to(PyObject *o, Ptr<T>& p, const char *name)
+    {
+        if (!o || o == Py_None)
+            return true;
+        p = makePtr<T>();
+        return pyopencv_to(o, *p, name);
+    }
+};
+
+template<>
+bool pyopencv_to(PyObject* obj, void*& ptr, const char* name)
+{
+    CV_UNUSED(name);
+    if (!obj || obj == Py_None)
+        return true;
+
+    if (!PyLong_Check(obj))
+        return false;
+    ptr = PyLong_AsVoidPtr(obj);
+    return ptr != NULL && !PyErr_Occurred();
+}
+
+static PyObject* pyopencv_from(void*& ptr)
+{
+    return PyLong_FromVoidPtr(ptr);
+}
+
+struct SafeSeqItem
+{
+    PyObject * item;
+    SafeSeqItem(PyObject *obj, size_t idx) { item = PySequence_GetItem(obj, idx); }
+    ~SafeSeqItem() { Py_XDECREF(item); }
+};
+
+static bool pyopencv_to(PyObject *o, Scalar& s, const ArgInfo info)
+{
+    if(!o || o == Py_None)
+        return true;
+    if (PySequence_Check(o)) {
+        if (4 < PySequence_Size(o))
+        {
+            failmsg("Scalar value for argument '%s' is longer than 4", info.name);
+            return false;
+        }
+        for (Py_ssize_t i = 0; i < PySequence_Size(o); i++) {
+            SafeSeqItem item_wrap(o, i);
+            PyObject *item = item_wrap.item;
+            if (PyFloat_Check(item) || PyInt_Check(item)) {
+                s[(int)i] = PyFloat_AsDouble(item);
+            } else {
+                failmsg("Scalar value for argument '%s' is not numeric", info.name);
+                return false;
+            }
+        }
+    } else {
+        if (PyFloat_Check(o) || PyInt_Check(o)) {
+            s[0] = PyFloat_AsDouble(o);
+        } else {
+            failmsg("Scalar value for argument '%s' is not numeric", info.name);
+            return false;
+        }
+    }
+    return true;
+}
+
+template<>
+bool pyopencv_to(PyObject *o, Scalar& s, const char *name)
+{
+    return pyopencv_to(o, s, ArgInfo(name, 0));
+}
+
+template<>
+PyObject* pyopencv_from(const Scalar& src)
+{
+    return Py_BuildValue("(dddd)", src[0], src[1], src[2], src[3]);
+}
+
+template<>
+PyObject* pyopencv_from(const bool& value)
+{
+    return PyBool_FromLong(value);
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, bool& value, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    int _val = PyObject_IsTrue(obj);
+    if(_val < 0)
+        return false;
+    value = _val > 0;
+    return true;
+}
+
+template<>
+PyObject* pyopencv_from(const size_t& value)
+{
+    return PyLong_FromSize_t(value);
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, size_t& value, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    value = (int)PyLong_AsUnsignedLong(obj);
+    return value != (size_t)-1 || !PyErr_Occurred();
+}
+
+template<>
+PyObject* pyopencv_from(const int& value)
+{
+    return PyInt_FromLong(value);
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, int& value, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    if(PyInt_Check(obj))
+        value = (int)PyInt_AsLong(obj);
+    else if(PyLong_Check(obj))
+        value = (int)PyLong_AsLong(obj);
+    else
+        return false;
+    return value != -1 || !PyErr_Occurred();
+}
+
+// There is conflict between "size_t" and "unsigned int".
+// They are the same type on some 32-bit platforms.
+template<typename T>
+struct PyOpenCV_Converter
+    < T, typename std::enable_if< std::is_same<unsigned int, T>::value && !std::is_same<unsigned int, size_t>::value >::type >
+{
+    static inline PyObject* from(const unsigned int& value)
+    {
+        return PyLong_FromUnsignedLong(value);
+    }
+
+    static inline bool to(PyObject* obj, unsigned int& value, const char* name)
+    {
+        CV_UNUSED(name);
+        if(!obj || obj == Py_None)
+            return true;
+        if(PyInt_Check(obj))
+            value = (unsigned int)PyInt_AsLong(obj);
+        else if(PyLong_Check(obj))
+            value = (unsigned int)PyLong_AsLong(obj);
+        else
+            return false;
+        return value != (unsigned int)-1 || !PyErr_Occurred();
+    }
+};
+
+template<>
+PyObject* pyopencv_from(const uchar& value)
+{
+    return PyInt_FromLong(value);
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, uchar& value, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    int ivalue = (int)PyInt_AsLong(obj);
+    value = cv::saturate_cast<uchar>(ivalue);
+    return ivalue != -1 || !PyErr_Occurred();
+}
+
+template<>
+PyObject* pyopencv_from(const double& value)
+{
+    return PyFloat_FromDouble(value);
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, double& value, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    if(!!PyInt_CheckExact(obj))
+        value = (double)PyInt_AS_LONG(obj);
+    else
+        value = PyFloat_AsDouble(obj);
+    return !PyErr_Occurred();
+}
+
+template<>
+PyObject* pyopencv_from(const float& value)
+{
+    return PyFloat_FromDouble(value);
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, float& value, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    if(!!PyInt_CheckExact(obj))
+        value = (float)PyInt_AS_LONG(obj);
+    else
+        value = (float)PyFloat_AsDouble(obj);
+    return !PyErr_Occurred();
+}
+
+template<>
+PyObject* pyopencv_from(const int64& value)
+{
+    return PyLong_FromLongLong(value);
+}
+
+template<>
+PyObject* pyopencv_from(const String& value)
+{
+    return PyString_FromString(value.empty() ? "" : value.c_str());
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, String &value, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    std::string str;
+    if (getUnicodeString(obj, str))
+    {
+        value = str;
+        return true;
+    }
+    return false;
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, Size& sz, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    return PyArg_ParseTuple(obj, "ii", &sz.width, &sz.height) > 0;
+}
+
+template<>
+PyObject* pyopencv_from(const Size& sz)
+{
+    return Py_BuildValue("(ii)", sz.width, sz.height);
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, Size_<float>& sz, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    return PyArg_ParseTuple(obj, "ff", &sz.width, &sz.height) > 0;
+}
+
+template<>
+PyObject* pyopencv_from(const Size_<float>& sz)
+{
+    return Py_BuildValue("(ff)", sz.width, sz.height);
+}
+
+template<>
+PyObject* pyopencv_from(const Rect& r)
+{
+    return Py_BuildValue("(iiii)", r.x, r.y, r.width, r.height);
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, Rect2d& r, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    return PyArg_ParseTuple(obj, "dddd", &r.x, &r.y, &r.width, &r.height) > 0;
+}
+
+template<>
+PyObject* pyopencv_from(const Rect2d& r)
+{
+    return Py_BuildValue("(dddd)", r.x, r.y, r.width, r.height);
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, Range& r, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    while (PySequence_Check(obj))
+    {
+        if (2 != PySequence_Size(obj))
+        {
+            failmsg("Range value for argument '%s' is longer than 2", name);
+            return false;
+        }
+        {
+            SafeSeqItem item_wrap(obj, 0);
+            PyObject *item = item_wrap.item;
+            if (PyInt_Check(item)) {
+                r.start = (int)PyInt_AsLong(item);
+            } else {
+                failmsg("Range.start value for argument '%s' is not integer", name);
+                break;
+            }
+        }
+        {
+            SafeSeqItem item_wrap(obj, 1);
+            PyObject *item = item_wrap.item;
+            if (PyInt_Check(item)) {
+                r.end = (int)PyInt_AsLong(item);
+            } else {
+                failmsg("Range.end value for argument '%s' is not integer", name);
+                break;
+            }
+        }
+        return true;
+    }
+    if(PyObject_Size(obj) == 0)
+    {
+        r = Range::all();
+        return true;
+    }
+    return PyArg_ParseTuple(obj, "ii", &r.start, &r.end) > 0;
+}
+
+template<>
+PyObject* pyopencv_from(const Range& r)
+{
+    return Py_BuildValue("(ii)", r.start, r.end);
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, Point& p, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    if(PyComplex_Check(obj))
+    {
+        p.x = saturate_cast<int>(PyComplex_RealAsDouble(obj));
+        p.y = saturate_cast<int>(PyComplex_ImagAsDouble(obj));
+        return true;
+    }
+    return PyArg_ParseTuple(obj, "ii", &p.x, &p.y) > 0;
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, Point2f& p, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    if (PyComplex_Check(obj))
+    {
+        p.x = saturate_cast<float>(PyComplex_RealAsDouble(obj));
+        p.y = saturate_cast<float>(PyComplex_ImagAsDouble(obj));
+        return true;
+    }
+    return PyArg_ParseTuple(obj, "ff", &p.x, &p.y) > 0;
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, Point2d& p, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    if(PyComplex_Check(obj))
+    {
+        p.x = PyComplex_RealAsDouble(obj);
+        p.y = PyComplex_ImagAsDouble(obj);
+        return true;
+    }
+    return PyArg_ParseTuple(obj, "dd", &p.x, &p.y) > 0;
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, Point3f& p, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    return PyArg_ParseTuple(obj, "fff", &p.x, &p.y, &p.z) > 0;
+}
+
+template<>
+bool pyopencv_to(PyObject* obj, Point3d& p, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+    return PyArg_ParseTuple(obj, "ddd", &p.x, &p.y, &p.z) > 0;
+}
+
+template<>
+PyObject* pyopencv_from(const Point& p)
+{
+    return Py_BuildValue("(ii)", p.x, p.y);
+}
+
+template<>
+PyObject* pyopencv_from(const Point2f& p)
+{
+    return Py_BuildValue("(dd)", p.x, p.y);
+}
+
+template<>
+PyObject* pyopencv_from(const Point3f& p)
+{
+    return Py_BuildValue("(ddd)", p.x, p.y, p.z);
+}
+
+static bool pyopencv_to(PyObject* obj, Vec4d& v, ArgInfo info)
+{
+    CV_UNUSED(info);
+    if (!obj)
+        return true;
+    return PyArg_ParseTuple(obj, "dddd", &v[0], &v[1], &v[2], &v[3]) > 0;
+}
+template<>
+bool pyopencv_to(PyObject* obj, Vec4d& v, const char* name)
+{
+    return pyopencv_to(obj, v, ArgInfo(name, 0));
+}
+
+static bool pyopencv_to(PyObject* obj, Vec4f& v, ArgInfo info)
+{
+    CV_UNUSED(info);
+    if (!obj)
+        return true;
+    return PyArg_ParseTuple(obj, "ffff", &v[0], &v[1], &v[2], &v[3]) > 0;
+}
+template<>
+bool pyopencv_to(PyObject* obj, Vec4f& v, const char* name)
+{
+    return pyopencv_to(obj, v, ArgInfo(name, 0));
+}
+
+static bool pyopencv_to(PyObject* obj, Vec4i& v, ArgInfo info)
+{
+    CV_UNUSED(info);
+    if (!obj)
+        return true;
+    return PyArg_ParseTuple(obj, "iiii", &v[0], &v[1], &v[2], &v[3]) > 0;
+}
+template<>
+bool pyopencv_to(PyObject* obj, Vec4i& v, const char* name)
+{
+    return pyopencv_to(obj, v, ArgInfo(name, 0));
+}
+
+static bool pyopencv_to(PyObject* obj, Vec3d& v, ArgInfo info)
+{
+    CV_UNUSED(info);
+    if (!obj)
+        return true;
+    return PyArg_ParseTuple(obj, "ddd", &v[0], &v[1], &v[2]) > 0;
+}
+template<>
+bool pyopencv_to(PyObject* obj, Vec3d& v, const char* name)
+{
+    return pyopencv_to(obj, v, ArgInfo(name, 0));
+}
+
+static bool pyopencv_to(PyObject* obj, Vec3f& v, ArgInfo info)
+{
+    CV_UNUSED(info);
+    if (!obj)
+        return true;
+    return PyArg_ParseTuple(obj, "fff", &v[0], &v[1], &v[2]) > 0;
+}
+template<>
+bool pyopencv_to(PyObject* obj, Vec3f& v, const char* name)
+{
+    return pyopencv_to(obj, v, ArgInfo(name, 0));
+}
+
+static bool pyopencv_to(PyObject* obj, Vec3i& v, ArgInfo info)
+{
+    CV_UNUSED(info);
+    if (!obj)
+        return true;
+    return PyArg_ParseTuple(obj, "iii", &v[0], &v[1], &v[2]) > 0;
+}
+template<>
+bool pyopencv_to(PyObject* obj, Vec3i& v, const char* name)
+{
+    return pyopencv_to(obj, v, ArgInfo(name, 0));
+}
+
+static bool pyopencv_to(PyObject* obj, Vec2d& v, ArgInfo info)
+{
+    CV_UNUSED(info);
+    if (!obj)
+        return true;
+    return PyArg_ParseTuple(obj, "dd", &v[0], &v[1]) > 0;
+}
+template<>
+bool pyopencv_to(PyObject* obj, Vec2d& v, const char* name)
+{
+    return pyopencv_to(obj, v, ArgInfo(name, 0));
+}
+
+static bool pyopencv_to(PyObject* obj, Vec2f& v, ArgInfo info)
+{
+    CV_UNUSED(info);
+    if (!obj)
+        return true;
+    return PyArg_ParseTuple(obj, "ff", &v[0], &v[1]) > 0;
+}
+template<>
+bool pyopencv_to(PyObject* obj, Vec2f& v, const char* name)
+{
+    return pyopencv_to(obj, v, ArgInfo(name, 0));
+}
+
+static bool pyopencv_to(PyObject* obj, Vec2i& v, ArgInfo info)
+{
+    CV_UNUSED(info);
+    if (!obj)
+        return true;
+    return PyArg_ParseTuple(obj, "ii", &v[0], &v[1]) > 0;
+}
+template<>
+bool pyopencv_to(PyObject* obj, Vec2i& v, const char* name)
+{
+    return pyopencv_to(obj, v, ArgInfo(name, 0));
+}
+
+template<>
+PyObject* pyopencv_from(const Vec4d& v)
+{
+    return Py_BuildValue("(dddd)", v[0], v[1], v[2], v[3]);
+}
+
+template<>
+PyObject* pyopencv_from(const Vec4f& v)
+{
+    return Py_BuildValue("(ffff)", v[0], v[1], v[2], v[3]);
+}
+
+template<>
+PyObject* pyopencv_from(const Vec4i& v)
+{
+    return Py_BuildValue("(iiii)", v[0], v[1], v[2], v[3]);
+}
+
+template<>
+PyObject* pyopencv_from(const Vec3d& v)
+{
+    return Py_BuildValue("(ddd)", v[0], v[1], v[2]);
+}
+
+template<>
+PyObject* pyopencv_from(const Vec3f& v)
+{
+    return Py_BuildValue("(fff)", v[0], v[1], v[2]);
+}
+
+template<>
+PyObject* pyopencv_from(const Vec3i& v)
+{
+    return Py_BuildValue("(iii)", v[0], v[1], v[2]);
+}
+
+template<>
+PyObject* pyopencv_from(const Vec2d& v)
+{
+    return Py_BuildValue("(dd)", v[0], v[1]);
+}
+
+template<>
+PyObject* pyopencv_from(const Vec2f& v)
+{
+    return Py_BuildValue("(ff)", v[0], v[1]);
+}
+
+template<>
+PyObject* pyopencv_from(const Vec2i& v)
+{
+    return Py_BuildValue("(ii)", v[0], v[1]);
+}
+
+template<>
+PyObject* pyopencv_from(const Point2d& p)
+{
+    return Py_BuildValue("(dd)", p.x, p.y);
+}
+
+template<>
+PyObject* pyopencv_from(const Point3d& p)
+{
+    return Py_BuildValue("(ddd)", p.x, p.y, p.z);
+}
+
+template<typename _Tp> struct pyopencvVecConverter
+{
+    typedef typename DataType<_Tp>::channel_type _Cp;
+    static inline bool copyOneItem(PyObject *obj, size_t start, int channels, _Cp * data)
+    {
+        for(size_t j = 0; (int)j < channels; j++ )
+        {
+            SafeSeqItem sub_item_wrap(obj, start + j);
+            PyObject* item_ij = sub_item_wrap.item;
+            if( PyInt_Check(item_ij))
+            {
+                int v = (int)PyInt_AsLong(item_ij);
+                if( v == -1 && PyErr_Occurred() )
+                    return false;
+                data[j] = saturate_cast<_Cp>(v);
+            }
+            else if( PyLong_Check(item_ij))
+            {
+                int v = (int)PyLong_AsLong(item_ij);
+                if( v == -1 && PyErr_Occurred() )
+                    return false;
+                data[j] = saturate_cast<_Cp>(v);
+            }
+            else if( PyFloat_Check(item_ij))
+            {
+                double v = PyFloat_AsDouble(item_ij);
+                if( PyErr_Occurred() )
+                    return false;
+                data[j] = saturate_cast<_Cp>(v);
+            }
+            else
+                return false;
+        }
+        return true;
+    }
+#ifndef Py_LIMITED_API
+    static inline bool copyOneNumberFast(PyObject *obj, _Cp& data)
+    {
+        if (PyFloat_CheckExact(obj))
+        {
+            data = saturate_cast<_Cp>(PyFloat_AS_DOUBLE(obj));
+            return true;
+        }
+        if (PyLong_CheckExact(obj))
+        {
+            int v = (int)PyLong_AsLong(obj);
+            if( v == -1 && PyErr_Occurred() )
+            {
+                PyErr_Clear();
+                return false;
+            }
+            data = saturate_cast<_Cp>(v);
+            return true;
+        }
+        return false;
+    }
+    // Lists and tuples of plain numbers (or of tuples of numbers, for multi-channel types)
+    // are converted directly from the borrowed items array. Anything else is left for the generic path.
+    static bool toFast(PyObject* obj, std::vector<_Tp>& value)
+    {
+        const int channels = CV_MAT_CN(traits::Type<_Tp>::value);
+        Py_ssize_t i, n = PySequence_Fast_GET_SIZE(obj);
+        PyObject** items = PySequence_Fast_ITEMS(obj);
+        value.resize(n);
+        for (i = 0; i < n; i++)
+        {
+            _Cp* data = (_Cp*)&value[i];
+            PyObject* item = items[i];
+            if (channels == 1)
+            {
+                if (!copyOneNumberFast(item, data[0]))
+                    return false;
+                continue;
+            }
+            if ((!PyTuple_CheckExact(item) && !PyList_CheckExact(item)) || PySequence_Fast_GET_SIZE(item) != channels)
+                return false;
+            PyObject** sub_items = PySequence_Fast_ITEMS(item);
+            for (int j = 0; j < channels; j++)
+            {
+                if (!copyOneNumberFast(sub_items[j], data[j]))
+                    return false;
+            }
+        }
+        return true;
+    }
+#endif
+    static bool to(PyObject* obj, std::vector<_Tp>& value, const ArgInfo info)
+    {
+        if(!obj || obj == Py_None)
+            return true;
+        if (PyArray_Check(obj))
+        {
+            Mat m;
+            pyopencv_to(obj, m, info);
+            m.copyTo(value);
+            return true;
+        }
+#ifndef Py_LIMITED_API
+        if ((PyTuple_CheckExact(obj) || PyList_CheckExact(obj)) && toFast(obj, value))
+            return true;
+#endif
+        if (PySequence_Check(obj))
+        {
+            const int type = traits::Type<_Tp>::value;
+            const int depth = CV_MAT_DEPTH(type), channels = CV_MAT_CN(type);
+            size_t i, n = PySequence_Size(obj);
+            value.resize(n);
+            for (i = 0; i < n; i++ )
+            {
+                SafeSeqItem item_wrap(obj, i);
+                PyObject* item = item_wrap.item;
+                _Cp* data = (_Cp*)&value[i];
+
+                if( channels == 2 && PyComplex_Check(item) )
+                {
+                    data[0] = saturate_cast<_Cp>(PyComplex_RealAsDouble(item));
+                    data[1] = saturate_cast<_Cp>(PyComplex_ImagAsDouble(item));
+                }
+                else if( channels > 1 )
+                {
+                    if( PyArray_Check(item))
+                    {
+                        Mat src;
+                        pyopencv_to(item, src, info);
+                        if( src.dims != 2 || src.channels() != 1 ||
+                           ((src.cols != 1 || src.rows != channels) &&
+                            (src.cols != channels || src.rows != 1)))
+                            break;
+                        Mat dst(src.rows, src.cols, depth, data);
+                        src.convertTo(dst, type);
+                        if( dst.data != (uchar*)data )
+                            break;
+                    }
+                    else if (PySequence_Check(item))
+                    {
+                        if (!copyOneItem(item, 0, channels, data))
+                            break;
+                    }
+                    else
+                    {
+                        break;
+                    }
+                }
+                else if (channels == 1)
+                {
+                    if (!copyOneItem(obj, i, channels, data))
+                        break;
+                }
+                else
+                {
+                    break;
+                }
+            }
+            return i == n;
+        }
+        return false;
+    }
+
+    static PyObject* from(const std::vector<_Tp>& value)
+    {
+        if(value.empty())
+            return PyTuple_New(0);
+        int type = traits::Type<_Tp>::value;
+        int depth = CV_MAT_DEPTH(type), channels = CV_MAT_CN(type);
+        Mat src((int)value.size(), channels, depth, (uchar*)&value[0]);
+        return pyopencv_from(src);
+    }
+};
+
+template<typename _Tp>
+bool pyopencv_to(PyObject* obj, std::vector<_Tp>& value, const ArgInfo info)
+{
+    return pyopencvVecConverter<_Tp>::to(obj, value, info);
+}
+
+template<typename _Tp>
+PyObject* pyopencv_from(const std::vector<_Tp>& value)
+{
+    return pyopencvVecConverter<_Tp>::from(value);
+}
+
+template<typename _Tp> static inline bool pyopencv_to_generic_vec(PyObject* obj, std::vector<_Tp>& value, const ArgInfo info)
+{
+    if(!obj || obj == Py_None)
+       return true;
+    if (!PySequence_Check(obj))
+        return false;
+    size_t n = PySequence_Size(obj);
+    value.resize(n);
+#ifndef Py_LIMITED_API
+    if (PyTuple_CheckExact(obj) || PyList_CheckExact(obj))
+    {
+        for(size_t i = 0; i < n; i++ )
+        {
+            // conversion may call back into Python code modifying the list, so items are not cached
+            if ((Py_ssize_t)i >= PySequence_Fast_GET_SIZE(obj))
+                return false;
+            PyObject* item = PySequence_Fast_GET_ITEM(obj, i);
+            Py_INCREF(item);
+            bool ok = pyopencv_to(item, value[i], info);
+            Py_DECREF(item);
+            if(!ok)
+                return false;
+        }
+        return true;
+    }
+#endif
+    for(size_t i = 0; i < n; i++ )
+    {
+        SafeSeqItem item_wrap(obj, i);
+        if(!pyopencv_to(item_wrap.item, value[i], info))
+            return false;
+    }
+    return true;
+}
+
+template<typename _Tp> static inline PyObject* pyopencv_from_generic_vec(const std::vector<_Tp>& value)
+{
+    int i, n = (int)value.size();
+    PyObject* seq = PyList_New(n);
+    for( i = 0; i < n; i++ )
+    {
+        PyObject* item = pyopencv_from(value[i]);
+        if(!item)
+            break;
+        PyList_SetItem(seq, i, item);
+    }
+    if( i < n )
+    {
+        Py_DECREF(seq);
+        return 0;
+    }
+    return seq;
+}
+
+template<>
+PyObject* pyopencv_from(const std::pair<int, double>& src)
+{
+    return Py_BuildValue("(id)", src.first, src.second);
+}
+
+template<typename _Tp, typename _Tr> struct pyopencvVecConverter<std::pair<_Tp, _Tr> >
+{
+    static bool to(PyObject* obj, std::vector<std::pair<_Tp, _Tr> >& value, const ArgInfo info)
+    {
+        return pyopencv_to_generic_vec(obj, value, info);
+    }
+
+    static PyObject* from(const std::vector<std::pair<_Tp, _Tr> >& value)
+    {
+        return pyopencv_from_generic_vec(value);
+    }
+};
+
+template<typename _Tp> struct pyopencvVecConverter<std::vector<_Tp> >
+{
+    static bool to(PyObject* obj, std::vector<std::vector<_Tp> >& value, const ArgInfo info)
+    {
+        return pyopencv_to_generic_vec(obj, value, info);
+    }
+
+    static PyObject* from(const std::vector<std::vector<_Tp> >& value)
+    {
+        return pyopencv_from_generic_vec(value);
+    }
+};
+
+template<> struct pyopencvVecConverter<Mat>
+{
+    static bool to(PyObject* obj, std::vector<Mat>& value, const ArgInfo info)
+    {
+        return pyopencv_to_generic_vec(obj, value, info);
+    }
+
+    static PyObject* from(const std::vector<Mat>& value)
+    {
+        return pyopencv_from_generic_vec(value);
+    }
+};
+
+template<> struct pyopencvVecConverter<UMat>
+{
+    static bool to(PyObject* obj, std::vector<UMat>& value, const ArgInfo info)
+    {
+        return pyopencv_to_generic_vec(obj, value, info);
+    }
+
+    static PyObject* from(const std::vector<UMat>& value)
+    {
+        return pyopencv_from_generic_vec(value);
+    }
+};
+
+// Vectors of KeyPoint and DMatch can be exchanged as numpy structured arrays instead of lists of objects.
+// Layout of the dtypes matches the C++ structures, so conversion is a plain memory copy.
+extern bool g_structuredArrays;
+
+// Creates the dtype from the list of (name, format[, shape]) tuples, the reference to the list is stolen
+static PyArray_Descr* pyopencv_struct_dtype(PyObject* fields)
+{
+    PyArray_Descr* descr = NULL;
+    if (fields && !PyArray_DescrConverter(fields, &descr))
+        descr = NULL;
+    Py_XDECREF(fields);
+    return descr;
+}
+
+static PyArray_Descr* pyopencv_KeyPoint_dtype()
+{
+    CV_StaticAssert(sizeof(KeyPoint) == 7 * sizeof(float), "Unexpected KeyPoint layout");
+    static PyArray_Descr* descr = NULL;
+    if (!descr)
+        descr = pyopencv_struct_dtype(Py_BuildValue("[(ss(i))(ss)(ss)(ss)(ss)(ss)]",
+                                                    "pt", "f4", 2, "size", "f4", "angle", "f4", "response", "f4",
+                                                    "octave", "i4", "class_id", "i4"));
+    return descr;
+}
+
+static PyArray_Descr* pyopencv_DMatch_dtype()
+{
+    CV_StaticAssert(sizeof(DMatch) == 4 * sizeof(float), "Unexpected DMatch layout");
+    static PyArray_Descr* descr = NULL;
+    if (!descr)
+        descr = pyopencv_struct_dtype(Py_BuildValue("[(ss)(ss)(ss)(ss)]",
+                                                    "queryIdx", "i4", "trainIdx", "i4", "imgIdx", "i4", "distance", "f4"));
+    return descr;
+}
+
+static inline bool pyopencv_is_struct_array(PyObject* obj)
+{
+    return PyArray_Check(obj) && PyDataType_HASFIELDS(PyArray_DESCR((PyArrayObject*)obj));
+}
+
+template<typename _Tp>
+static bool pyopencv_to_struct_vec(PyObject* obj, std::vector<_Tp>& value, PyArray_Descr* descr, const char* tname, const ArgInfo info)
+{
+    if (!descr)
+        return false;
+    PyArrayObject* arr = (PyArrayObject*)obj;
+    if (PyArray_NDIM(arr) != 1 || !PyArray_EquivTypes(PyArray_DESCR(arr), descr))
+    {
+        failmsg("%s must be 1-dimensional structured array with %s fields", info.name, tname);
+        return false;
+    }
+    PyArrayObject* contiguous = PyArray_GETCONTIGUOUS(arr);
+    if (!contiguous)
+        return false;
+    value.resize((size_t)PyArray_DIM(contiguous, 0));
+    if (!value.empty())
+        memcpy(&value[0], PyArray_DATA(contiguous), value.size() * sizeof(_Tp));
+    Py_DECREF(contiguous);
+    return true;
+}
+
+template<typename _Tp>
+static PyObject* pyopencv_from_struct_vec(const std::vector<_Tp>& value, PyArray_Descr* descr)
+{
+    if (!descr)
+        return NULL;
+    npy_intp n = (npy_intp)value.size();
+    Py_INCREF(descr);  // reference is stolen
+    PyObject* arr = PyArray_NewFromDescr(&PyArray_Type, descr, 1, &n, NULL, NULL, 0, NULL);
+    if (arr && n > 0)
+        memcpy(PyArray_DATA((PyArrayObject*)arr), &value[0], value.size() * sizeof(_Tp));
+    return arr;
+}
+
+template<> struct pyopencvVecConverter<KeyPoint>
+{
+    static bool to(PyObject* obj, std::vector<KeyPoint>& value, const ArgInfo info)
+    {
+        if (obj && pyopencv_is_struct_array(obj))
+            return pyopencv_to_struct_vec(obj, value, pyopencv_KeyPoint_dtype(), "KeyPoint", info);
+        return pyopencv_to_generic_vec(obj, value, info);
+    }
+
+    static PyObject* from(const std::vector<KeyPoint>& value)
+    {
+        if (g_structuredArrays)
+            return pyopencv_from_struct_vec(value, pyopencv_KeyPoint_dtype());
+        return pyopencv_from_generic_vec(value);
+    }
+};
+
+template<> struct pyopencvVecConverter<DMatch>
+{
+    static bool to(PyObject* obj, std::vector<DMatch>& value, const ArgInfo info)
+    {
+        if (obj && pyopencv_is_struct_array(obj))
+            return pyopencv_to_struct_vec(obj, value, pyopencv_DMatch_dtype(), "DMatch", info);
+        return pyopencv_to_generic_vec(obj, value, info);
+    }
+
+    static PyObject* from(const std::vector<DMatch>& value)
+    {
+        if (g_structuredArrays)
+            return pyopencv_from_struct_vec(value, pyopencv_DMatch_dtype());
+        return pyopencv_from_generic_vec(value);
+    }
+};
+
+template<> struct pyopencvVecConverter<String>
+{
+    static bool to(PyObject* obj, std::vector<String>& value, const ArgInfo info)
+    {
+        return pyopencv_to_generic_vec(obj, value, info);
+    }
+
+    static PyObject* from(const std::vector<String>& value)
+    {
+        return pyopencv_from_generic_vec(value);
+    }
+};
+
+template<> struct pyopencvVecConverter<RotatedRect>
+{
+    static bool to(PyObject* obj, std::vector<RotatedRect>& value, const ArgInfo info)
+    {
+        return pyopencv_to_generic_vec(obj, value, info);
+    }
+    static PyObject* from(const std::vector<RotatedRect>& value)
+    {
+        return pyopencv_from_generic_vec(value);
+    }
+};
+
+template<>
+bool pyopencv_to(PyObject* obj, Rect& r, const char* name)
+{
+    CV_UNUSED(name);
+    if(!obj || obj == Py_None)
+        return true;
+
+    if (PyTuple_Check(obj))
+        return PyArg_ParseTuple(obj, "iiii", &r.x, &r.y, &r.width, &r.height) > 0;
+    else
+    {
+        std::vector<int> value(4);
+        pyopencvVecConverter<int>::to(obj, value, ArgInfo(name, 0));
+        r = Rect(value[0], value[1], value[2], value[3]);
+        return true;
+    }
+
+}
+
+template<>
+bool pyopencv_to(PyObject *obj, TermCriteria& dst, const char *name)
+{
+    CV_UNUSED(name);
+    if(!obj)
+        return true;
+    return PyArg_ParseTuple(obj, "iid", &dst.type, &dst.maxCount, &dst.epsilon) > 0;
+}
+
+template<>
+PyObject* pyopencv_from(const TermCriteria& src)
+{
+    return Py_BuildValue("(iid)", src.type, src.maxCount, src.epsilon);
+}
+
+template<>
+bool pyopencv_to(PyObject *obj, RotatedRect& dst, const char *name)
+{
+    CV_UNUSED(name);
+    if(!obj)
+        return true;
+    return PyArg_ParseTuple(obj, "(ff)(ff)f", &dst.center.x, &dst.center.y, &dst.size.width, &dst.size.height, &dst.angle) > 0;
+}
+
+template<>
+PyObject* pyopencv_from(const RotatedRect& src)
+{
+    return Py_BuildValue("((ff)(ff)f)", src.center.x, src.center.y, src.size.width, src.size.height, src.angle);
+}
+
+template<>
+PyObject* pyopencv_from(const Moments& m)
+{
+    return Py_BuildValue("{s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d,s:d}",
+                         "m00", m.m00, "m10", m.m10, "m01", m.m01,
+                         "m20", m.m20, "m11", m.m11, "m02", m.m02,
+                         "m30", m.m30, "m21", m.m21, "m12", m.m12, "m03", m.m03,
+                         "mu20", m.mu20, "mu11", m.mu11, "mu02", m.mu02,
+                         "mu30", m.mu30, "mu21", m.mu21, "mu12", m.mu12, "mu03", m.mu03,
+                         "nu20", m.nu20, "nu11", m.nu11, "nu02", m.nu02,
+                         "nu30", m.nu30, "nu21", m.nu21, "nu12", m.nu12, "nu03", m.nu03);
+}
+
+///////////////////////////////////////////////////////////////////////////////////////
+
+static int convert_to_char(PyObject *o, char *dst, const char *name = "no_name")
+{
+    std::string str;
+    if (getUnicodeString(o, str))
+    {
+        *dst = str[0];
+        return 1;
+    }
+    (*dst) = 0;
+    return failmsg("Expected single character string for argument '%s'", name);
+}
+
+#ifdef __GNUC__
+#  pragma GCC diagnostic ignored "-Wunused-parameter"
+#  pragma GCC diagnostic ignored "-Wmissing-field-initializers"
+#endif
+
+
+#include "pyopencv_generated_enums.h"
+#include "pyopencv_custom_headers.h"
+
+#ifdef CVPY_DYNAMIC_INIT
+#define CVPY_TYPE(NAME, STORAGE, SNAME, _1, _2) CVPY_TYPE_DECLARE_DYNAMIC(NAME, STORAGE, SNAME)
+#else
+#define CVPY_TYPE(NAME, STORAGE, SNAME, _1, _2) CVPY_TYPE_DECLARE(NAME, STORAGE, SNAME)
+#endif
+#include "pyopencv_generated_types.h"
+#undef CVPY_TYPE
+
+// Batch calls of f(src, ...) -> dst functions, see cv2.utils.batch().
+// Generated pyopencv_*_batch functions parse the arguments once, with the first item of the batch as 'src',
+// and run the calls over all the items with parallel_for_() and GIL released.
+typedef PyObject* (*pyopencv_BatchFn)(PyObject* items, PyObject* args, PyObject* kw);
+
+struct pyopencv_BatchFunc
+{
+    PyCFunction wrapper;
+    pyopencv_BatchFn batch;
+};
+
+// Outputs are allocated by worker threads without GIL, so they are exported without copying
+static PyObject* pyopencv_from_batch(const Mat& m)
+{
+    if (m.u && m.data && m.allocator != &g_numpyAllocator)
+        return pyopencv_wrap_Mat(m, true);
+    return pyopencv_from(m);
+}
+
+template<typename T>
+static PyObject* pyopencv_from_batch(const T& value)
+{
+    return pyopencv_from(value);
+}
+
+// Tuple of the outputs of one call, the conversion stops at the first failed item
+template<typename F>
+static PyObject* pyopencv_batch_tuple(size_t n, F item)
+{
+    PyObject* result = PyTuple_New((Py_ssize_t)n);
+    for (size_t k = 0; result && k < n; k++)
+    {
+        PyObject* obj = item(k);
+        if (!obj)
+            Py_CLEAR(result);  // releases the already converted items
+        else
+            PyTuple_SetItem(result, (Py_ssize_t)k, obj);
+    }
+    return result;
+}
+
+template<typename F>
+static PyObject* pyopencv_batch_results(size_t n, F item)
+{
+    PyObject* result = PyList_New((Py_ssize_t)n);
+    for (size_t i = 0; result && i < n; i++)
+    {
+        PyObject* obj = item(i);
+        if (!obj)
+        {
+            Py_CLEAR(result);
+            break;
+        }
+        PyList_SetItem(result, (Py_ssize_t)i, obj);
+    }
+    return result;
+}
+
+// Pickle support of the wrapped classes, __reduce_ex__/__setstate__ are generated by gen2.py.
+// Classes with a default constructor and writable properties are restored from the dict of the properties,
+// Algorithms are restored from the state saved by write() (in-memory FileStorage) into the object made by
+// the factory (static create() or the default constructor). The state is pickled as the bytes of the YAML text,
+// FileStorage has no binary format (and it ignores WRITE_BASE64) in this version.
+// With protocol 5 the serialized state is passed as pickle.PickleBuffer, so it can be sent out-of-band.
+static PyObject* pyopencv_pickle_buffer(PyObject* data, int protocol)
+{
+    if (!data || protocol < 5)
+        return data;
+    PyObject* pickle = PyImport_ImportModule("pickle");
+    PyObject* cls = pickle ? PyObject_GetAttrString(pickle, "PickleBuffer") : NULL;
+    Py_XDECREF(pickle);
+    if (!cls)
+    {
+        PyErr_Clear();  // Python < 3.8
+        return data;
+    }
+    PyObject* buffer = PyObject_CallFunctionObjArgs(cls, data, NULL);
+    Py_DECREF(cls);
+    Py_DECREF(data);
+    return buffer;
+}
+
+static bool pyopencv_pickle_data(PyObject* obj, std::string& data)
+{
+#ifndef Py_LIMITED_API
+    Py_buffer view;
+    if (PyObject_GetBuffer(obj, &view, PyBUF_SIMPLE) != 0)
+        return false;
+    data.assign((const char*)view.buf, (size_t)view.len);
+    PyBuffer_Release(&view);
+#else
+    PyObject* bytes = PyObject_Bytes(obj);
+    if (!bytes)
+        return false;
+    data.assign(PyBytes_AsString(bytes), (size_t)PyBytes_Size(bytes));
+    Py_DECREF(bytes);
+#endif
+    return true;
+}
+
+static PyObject* pyopencv_reduce_props(PyObject* self, const PyGetSetDef* getseters)
+{
+    PyObject* state = PyDict_New();
+    for (const PyGetSetDef* p = getseters; state && p->name; p++)
+    {
+        if (!p->set)
+            continue;  // read-only
+        PyObject* value = PyObject_GetAttrString(self, p->name);
+        if (!value || PyDict_SetItemString(state, p->name, value) != 0)
+            Py_CLEAR(state);
+        Py_XDECREF(value);
+    }
+    if (!state)
+        return NULL;
+    return Py_BuildValue("(O()N)", (PyObject*)Py_TYPE(self), state);
+}
+
+static PyObject* pyopencv_setstate_props(PyObject* self, PyObject* state)
+{
+    if (!PyDict_Check(state))
+        return failmsgp("__setstate__ expects dict");
+    PyObject* key = NULL;
+    PyObject* value = NULL;
+    Py_ssize_t pos = 0;
+    while (PyDict_Next(state, &pos, &key, &value))
+    {
+        if (PyObject_SetAttr(self, key, value) != 0)
+            return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject* pyopencv_reduce_algorithm(PyObject* self, PyObject* protocol_obj, PyObject* cls, const char* factory_name,
+                                           const Ptr<Algorithm>& algo)
+{
+    // the factory makes an object of the class, which defines __reduce_ex__
+    if ((PyObject*)Py_TYPE(self) != cls)
+        return failmsgp("cannot pickle '%s' object", Py_TYPE(self)->tp_name);
+    int protocol = (int)PyLong_AsLong(protocol_obj);
+    if (protocol == -1 && PyErr_Occurred())
+        return NULL;
+
+    std::string data;
+    bool empty = true;
+    ERRWRAP2(
+        FileStorage fs(".yml", FileStorage::WRITE | FileStorage::MEMORY | FileStorage::FORMAT_YAML);
+        fs << "state" << "{";
+        algo->write(fs);
+        fs << "}";
+        data = fs.releaseAndGetString();
+        FileStorage check(data, FileStorage::READ | FileStorage::MEMORY);
+        empty = check["state"].empty() || check["state"].size() == 0;
+    );
+    if (empty)
+        return failmsgp("cannot pickle '%s' object: write() doesn't save the state", Py_TYPE(self)->tp_name);
+
+    PyObject* arrays = Py_None;
+    Py_INCREF(arrays);
+#ifdef HAVE_OPENCV_FEATURES2D
+    // the train set of the matchers is not saved by write()
+    Ptr<DescriptorMatcher> matcher = algo.dynamicCast<DescriptorMatcher>();
+    if (matcher && !matcher->empty())
+    {
+        Py_DECREF(arrays);
+        arrays = pyopencv_from(matcher->getTrainDescriptors());
+        if (!arrays)
+            return NULL;
+    }
+#endif
+
+    PyObject* payload = pyopencv_pickle_buffer(PyBytes_FromStringAndSize(data.c_str(), (Py_ssize_t)data.size()), protocol);
+    PyObject* factory = cls;
+    if (factory_name)
+        factory = PyObject_GetAttrString(cls, factory_name);
+    else
+        Py_INCREF(factory);
+    if (!payload || !factory)
+    {
+        Py_XDECREF(payload);
+        Py_XDECREF(factory);
+        Py_DECREF(arrays);
+        return NULL;
+    }
+    return Py_BuildValue("(N()(NN))", factory, payload, arrays);
+}
+
+static PyObject* pyopencv_setstate_algorithm(const Ptr<Algorithm>& algo, PyObject* state)
+{
+    PyObject* payload = NULL;
+    PyObject* arrays = NULL;
+    if (!PyArg_ParseTuple(state, "OO:__setstate__", &payload, &arrays))
+        return NULL;
+    std::string data;
+    if (!pyopencv_pickle_data(payload, data))
+        return NULL;
+    ERRWRAP2(
+        FileStorage fs(data, FileStorage::READ | FileStorage::MEMORY);
+        algo->read(fs["state"]);
+    );
+#ifdef HAVE_OPENCV_FEATURES2D
+    if (arrays != Py_None)
+    {
+        Ptr<DescriptorMatcher> matcher = algo.dynamicCast<DescriptorMatcher>();
+        std::vector<Mat> descriptors;
+        if (!matcher || !pyopencv_to(arrays, descriptors, ArgInfo("descriptors", false)))
+            return failmsgp("__setstate__: incorrect state");
+        ERRWRAP2(matcher->add(descriptors));
+    }
+#endif
+    Py_RETURN_NONE;
+}
+
+#endif // __CV2_HPP__
@@ -16,6 +16,12 @@ ignored_arg_types = ["RNG*"]
 
 pass_by_val_types = ["Point*", "Point2f*", "Rect*", "String*", "double*", "float*", "int*"]
 
+# argument types which select the overloaded variant by the Python type of the passed object
+dispatch_arg_types = {"UMat": "UMat", "cuda::GpuMat": "cuda_GpuMat"}
+
+# functions which only move the array elements: int64 arrays are passed to them as CV_64F data without casting
+opaque_int64_funcs = {"cv.copyTo", "cv.flip", "cv.hconcat", "cv.repeat", "cv.rotate", "cv.transpose", "cv.vconcat"}
+
 gen_template_check_self = Template("""
     ${cname} * self1 = 0;
     if (!pyopencv_${name}_getp(self, self1))
@@ -34,14 +40,88 @@ gen_template_simple_call_constructor = Template("""new (&(self->v)) ${cname}${ar
 gen_template_parse_args = Template("""const char* keywords[] = { $kw_list, NULL };
     if( PyArg_ParseTupleAndKeywords(args, kw, "$fmtspec", (char**)keywords, $parse_arglist)$code_cvt )""")
 
+gen_template_parse_args_fastcall = Template("""static const char* const keywords[] = { $kw_list, NULL };
+    CVPY_ARG_PARSER(pyopencv_parser, "$fmtspec", keywords);
+    if( CVPY_PARSE_ARGS(pyopencv_parser, $parse_arglist)$code_cvt )""")
+
 gen_template_func_body = Template("""$code_decl
     $code_parse
     {
+        CVPY_CALL_STATS_MARK_CALL();
         ${code_prelude}ERRWRAP2($code_fcall);
+        CVPY_CALL_STATS_MARK_RETURN();
         $code_ret;
     }
 """)
 
+gen_template_batch_proto = Template("""${linkage}PyObject* ${wrap_funcname}_batch(PyObject* pyopencv_batch_items, PyObject* args, PyObject* kw)""")
+
+gen_template_batch_func = Template("""
+${proto}
+{
+    using namespace ${namespace};
+
+$code_decl
+    $code_parse
+    {
+        if ($code_outcheck)
+            return failmsgp("Output arrays can't be passed to ${name} called in batch");
+        const size_t pyopencv_batch_size = (size_t)PySequence_Size(pyopencv_batch_items);
+        if (pyopencv_batch_size == 0)  // the other arguments are checked with None as ${src}
+            return PyList_New(0);
+        std::vector<Mat> pyopencv_batch_${src}(pyopencv_batch_size);
+        pyopencv_batch_${src}[0] = ${src};
+        for (size_t i = 1; i < pyopencv_batch_size; i++)
+        {
+            SafeSeqItem item_wrap(pyopencv_batch_items, i);
+            if (!pyopencv_to(item_wrap.item, pyopencv_batch_${src}[i], ${src_info}))
+                return NULL;
+        }
+$code_batch_decl        ERRWRAP2(parallel_for_(Range(0, (int)pyopencv_batch_size), [&](const Range& pyopencv_range)
+        {
+            for (int i = pyopencv_range.start; i < pyopencv_range.end; i++)
+                ${code_fcall};
+        }));
+        return pyopencv_batch_results(pyopencv_batch_size, [&](size_t i) { return $code_ret; });
+    }
+
+    return NULL;
+}
+
+""")
+
+gen_template_overload_dispatch = Template("""\
+    int pyopencv_first_variant = 0;
+    {
+        PyObject* pyobj_dispatch = $code_peek;
+        if (pyobj_dispatch)
+        {
+$code_checks        }
+    }
+
+    g_finalArgError = false;
+    for (int pyopencv_attempt = 0; pyopencv_attempt < $nvariants; pyopencv_attempt++)
+    {
+        // the variant selected by the argument type goes first, the rest keep the declaration order
+        int pyopencv_variant = pyopencv_attempt == 0 ? pyopencv_first_variant :
+                               pyopencv_attempt <= pyopencv_first_variant ? pyopencv_attempt - 1 : pyopencv_attempt;
+        if (pyopencv_attempt > 0)
+        {
+            if (g_finalArgError)
+                break;
+            PyErr_Clear();
+        }
+        switch (pyopencv_variant)
+        {
+$code_cases        }
+    }
+""")
+
+gen_template_overload_dispatch_check = Template("""\
+            ${cond}if (PyObject_TypeCheck(pyobj_dispatch, (PyTypeObject*)pyopencv_${typename}_TypePtr))
+                pyopencv_first_variant = $variant;
+""")
+
 gen_template_mappable = Template("""
     {
         ${mappable} _src;
@@ -105,12 +185,12 @@ ${methods_code}
 
 // Tables (${name})
 
-static PyGetSetDef pyopencv_${name}_getseters[] =
+${linkage}PyGetSetDef pyopencv_${name}_getseters[] =
 {${getset_inits}
     {NULL}  /* Sentinel */
 };
 
-static PyMethodDef pyopencv_${name}_methods[] =
+${linkage}PyMethodDef pyopencv_${name}_methods[] =
 {
 ${methods_inits}
     {NULL,          NULL}
@@ -118,10 +198,22 @@ ${methods_inits}
 """)
 
 
+gen_template_type_tables_decl = Template("""
+extern PyGetSetDef pyopencv_${name}_getseters[];
+extern PyMethodDef pyopencv_${name}_methods[];
+""")
+
+gen_template_shard = Template("""// Part ${idx} of ${count} of the generated wrappers, see OPENCV_PYTHON_BINDINGS_SHARDS
+#define CVPY_SHARD
+#include "cv2.hpp"
+#include "pyopencv_generated_types_content.h"
+#include "pyopencv_generated_funcs.h"
+${code}""")
+
 gen_template_get_prop = Template("""
 static PyObject* pyopencv_${name}_get_${member}(pyopencv_${name}_t* p, void *closure)
 {
-    return pyopencv_from(p->v${access}${member});
+    return ${cvt_from}(p->v${access}${member});
 }
 """)
 
@@ -131,7 +223,7 @@ static PyObject* pyopencv_${name}_get_${member}(pyopencv_${name}_t* p, void *clo
     $cname* _self_ = dynamic_cast<$cname*>(p->v.get());
     if (!_self_)
         return failmsgp("Incorrect type of object (must be '${name}' or its derivative)");
-    return pyopencv_from(_self_${access}${member});
+    return ${cvt_from}(_self_${access}${member});
 }
 """)
 
@@ -172,6 +264,53 @@ gen_template_prop_init = Template("""
 gen_template_rw_prop_init = Template("""
     {(char*)"${member}", (getter)pyopencv_${name}_get_${member}, (setter)pyopencv_${name}_set_${member}, (char*)"${member}", NULL},""")
 
+gen_template_reduce_props = Template("""
+static PyObject* pyopencv_${name}___reduce_ex__(PyObject* self, PyObject* protocol)
+{
+    return pyopencv_reduce_props(self, pyopencv_${name}_getseters);
+}
+
+static PyObject* pyopencv_${name}___setstate__(PyObject* self, PyObject* state)
+{
+    return pyopencv_setstate_props(self, state);
+}
+""")
+
+gen_template_reduce_algo = Template("""
+static PyObject* pyopencv_${name}___reduce_ex__(PyObject* self, PyObject* protocol)
+{
+    Ptr<${cname}>* self1 = 0;
+    if (!pyopencv_${name}_getp(self, self1))
+        return failmsgp("Incorrect type of self (must be '${name}' or its derivative)");
+    return pyopencv_reduce_algorithm(self, protocol, (PyObject*)pyopencv_${name}_TypePtr, ${factory}, *self1);
+}
+
+static PyObject* pyopencv_${name}___setstate__(PyObject* self, PyObject* state)
+{
+    Ptr<${cname}>* self1 = 0;
+    if (!pyopencv_${name}_getp(self, self1))
+        return failmsgp("Incorrect type of self (must be '${name}' or its derivative)");
+    return pyopencv_setstate_algorithm(*self1, state);
+}
+""")
+
+gen_template_reduce_umat = Template("""
+static PyObject* pyopencv_${name}___reduce_ex__(PyObject* self, PyObject* protocol)
+{
+    // the content is downloaded into ndarray, numpy pickles it (out-of-band with protocol 5)
+    PyObject* data = PyObject_CallMethod(self, (char*)"get", NULL);
+    if (!data)
+        return NULL;
+    return Py_BuildValue("(O(N))", (PyObject*)Py_TYPE(self), data);
+}
+""")
+
+gen_template_pickle_proto = Template("""
+static PyObject* pyopencv_${name}_${method}(PyObject* self, PyObject* arg);""")
+
+gen_template_pickle_init = Template("""
+    {"${method}", (PyCFunction)pyopencv_${name}_${method}, METH_O, "Helper for pickle."},""")
+
 simple_argtype_mapping = {
     "bool": ("bool", "b", "0"),
     "size_t": ("size_t", "I", "0"),
@@ -200,6 +339,7 @@ class ClassInfo(object):
         self.ismap = False
         self.issimple = False
         self.isalgorithm = False
+        self.derives_algorithm = False
         self.methods = {}
         self.props = []
         self.mappables = []
@@ -214,6 +354,8 @@ class ClassInfo(object):
                 print("Note: Class %s has more than 1 base class (not supported by Python C extensions)" % (self.name,))
                 print("      Bases: ", " ".join(bases))
                 print("      Only the first base class will be used")
+                # the base class is not used in Python, but C++ code can still call the Algorithm methods
+                self.derives_algorithm = any(b.strip(",") in ("Algorithm", "cv::Algorithm") for b in bases)
                 #return sys.exit(-1)
             elif len(bases) == 1:
                 self.base = bases[0].strip(",")
@@ -262,10 +404,12 @@ class ClassInfo(object):
             access_op = "."
 
         for pname, p in sorted_props:
+            # Mat members are exported as read-only arrays, if they are not copied
+            cvt_from = "pyopencv_from_property" if p.tp == "Mat" else "pyopencv_from"
             if self.isalgorithm:
-                getset_code.write(gen_template_get_prop_algo.substitute(name=self.name, cname=self.cname, member=pname, membertype=p.tp, access=access_op))
+                getset_code.write(gen_template_get_prop_algo.substitute(name=self.name, cname=self.cname, member=pname, membertype=p.tp, access=access_op, cvt_from=cvt_from))
             else:
-                getset_code.write(gen_template_get_prop.substitute(name=self.name, member=pname, membertype=p.tp, access=access_op))
+                getset_code.write(gen_template_get_prop.substitute(name=self.name, member=pname, membertype=p.tp, access=access_op, cvt_from=cvt_from))
             if p.readonly:
                 getset_inits.write(gen_template_prop_init.substitute(name=self.name, member=pname))
             else:
@@ -288,12 +432,50 @@ class ClassInfo(object):
             methods_code.write(m.gen_code(codegen))
             methods_inits.write(m.get_tab_entry())
 
+        # pickle methods are defined after the tables, they refer to the properties
+        pickle_code, pickle_methods = self.gen_pickle_code(codegen)
+        for method in pickle_methods:
+            methods_code.write(gen_template_pickle_proto.substitute(name=self.name, method=method))
+            methods_inits.write(gen_template_pickle_init.substitute(name=self.name, method=method))
+
         code = gen_template_type_impl.substitute(name=self.name, wname=self.wname, cname=self.cname,
+            linkage="static " if codegen.shards == 1 else "",  # the tables are referenced by cv2.cpp
             getset_code=getset_code.getvalue(), getset_inits=getset_inits.getvalue(),
             methods_code=methods_code.getvalue(), methods_inits=methods_inits.getvalue())
+        code += pickle_code
 
         return code
 
+    def gen_pickle_code(self, codegen):
+        """
+        __reduce_ex__/__setstate__ methods, returns (code, names of the methods).
+        Algorithms need a factory (static create() or the constructor) callable without arguments,
+        other classes need the default constructor and writable properties only.
+        """
+        def optional_args(func):
+            return func is not None and any(all(v.args[argno].defval for _, argno in v.py_arglist)
+                                            for v in func.variants)
+
+        if self.name == "UMat":
+            return gen_template_reduce_umat.substitute(name=self.name), ["__reduce_ex__"]
+        cls = self
+        while cls is not None and not (cls.isalgorithm or cls.derives_algorithm):
+            cls = codegen.classes.get(cls.base)
+        if cls is not None:
+            create = self.methods.get("create")
+            if create is not None and create.is_static and optional_args(create):
+                factory = '"create"'
+            elif optional_args(self.constructor):
+                factory = "NULL"
+            else:
+                return "", []
+            code = gen_template_reduce_algo.substitute(name=self.name, cname=self.cname, factory=factory)
+        elif self.props and all(not p.readonly for p in self.props) and optional_args(self.constructor):
+            code = gen_template_reduce_props.substitute(name=self.name)
+        else:
+            return "", []
+        return code, ["__reduce_ex__", "__setstate__"]
+
     def gen_def(self, codegen):
         all_classes = codegen.classes
         baseptr = "NoBase"
@@ -467,6 +649,34 @@ class FuncVariant(object):
                 self.args[argno].py_outputarg = True
         self.py_outlist = outlist
 
+    def is_batchable(self):
+        # f(src, ...) -> dst, ... functions, which can be applied to a list of arrays in parallel:
+        # the first argument is an input Mat, outputs are Mats and optionally a numerical retval
+        if self.isconstructor or self.classname or not self.py_arglist or self.array_counters:
+            return False
+        src = self.args[self.py_arglist[0][1]]
+        if src.tp != "Mat" or src.outputarg:
+            return False
+        if self.rettype not in ["", "double", "int", "float"]:
+            return False
+        if not [argno for aname, argno in self.py_outlist if argno >= 0]:
+            return False
+        for a in self.args:
+            if a.tp in ignored_arg_types or a.tp in pass_by_val_types or a.tp.endswith("*"):
+                return False
+            if a.outputarg and (a.inputarg or a.tp != "Mat"):
+                return False
+        return True
+
+    def get_dispatch_arg(self):
+        # the first Python input argument which is passed as UMat or GpuMat instead of Mat.
+        # Its type is enough to tell the generated Mat/UMat/GpuMat variants apart without parsing.
+        for pos, (aname, argno) in enumerate(self.py_arglist):
+            tp = self.args[argno].tp
+            if tp in dispatch_arg_types:
+                return pos, aname, dispatch_arg_types[tp]
+        return None
+
 
 class FuncInfo(object):
     def __init__(self, classname, name, cname, isconstructor, namespace, is_static):
@@ -495,17 +705,37 @@ class FuncInfo(object):
 
         return "pyopencv_" + self.namespace.replace('.','_') + '_' + classname + name
 
+    def get_linkage(self, codegen):
+        # the wrappers referenced by cv2.cpp (module tables, type initialization) are exported by the shards
+        if codegen.shards > 1 and (self.isconstructor or not self.classname):
+            return ""
+        return "static "
+
     def get_wrapper_prototype(self, codegen):
         full_fname = self.get_wrapper_name()
         if self.isconstructor:
-            return "static int {fn_name}(pyopencv_{type_name}_t* self, PyObject* args, PyObject* kw)".format(
-                    fn_name=full_fname, type_name=codegen.classes[self.classname].name)
+            return "{linkage}int {fn_name}(pyopencv_{type_name}_t* self, PyObject* args, PyObject* kw)".format(
+                    linkage=self.get_linkage(codegen), fn_name=full_fname, type_name=codegen.classes[self.classname].name)
 
         if self.classname:
             self_arg = "self"
         else:
             self_arg = ""
-        return "static PyObject* %s(PyObject* %s, PyObject* args, PyObject* kw)" % (full_fname, self_arg)
+        return "%sPyObject* %s(PyObject* %s, CVPY_FN_ARGS)" % (self.get_linkage(codegen), full_fname, self_arg)
+
+    def get_batch_prototype(self, codegen):
+        return gen_template_batch_proto.substitute(linkage=self.get_linkage(codegen), wrap_funcname=self.get_wrapper_name())
+
+    def get_py_name(self, codegen):
+        if self.classname:
+            classinfo = codegen.classes[self.classname]
+            if self.isconstructor:
+                return 'cv.' + classinfo.wname
+            elif self.is_static:
+                return '.'.join([self.namespace, classinfo.sname + '_' + self.variants[0].wname])
+            else:
+                return 'cv.' + classinfo.wname + '.' + self.variants[0].wname
+        return '.'.join([self.namespace, self.variants[0].wname])
 
     def get_tab_entry(self):
         prototype_list = []
@@ -548,15 +778,74 @@ class FuncInfo(object):
         # Convert unicode chars to xml representation, but keep as string instead of bytes
         full_docstring = full_docstring.encode('ascii', errors='xmlcharrefreplace').decode()
 
-        return Template('    {"$py_funcname", CV_PY_FN_WITH_KW_($wrap_funcname, $flags), "$py_docstring"},\n'
+        return Template('    {"$py_funcname", CV_PY_FN_FASTCALL_($wrap_funcname, $flags), "$py_docstring"},\n'
                         ).substitute(py_funcname = self.variants[0].wname, wrap_funcname=self.get_wrapper_name(),
                                      flags = 'METH_STATIC' if self.is_static else '0', py_docstring = full_docstring)
 
+    def gen_dispatch_checks(self, codegen):
+        dispatch_pos = None
+        checks = []
+        for i, v in enumerate(self.variants):
+            arg = v.get_dispatch_arg()
+            if arg is None:
+                continue
+            argpos, argname, typename = arg
+            if dispatch_pos is None:
+                dispatch_pos = (argpos, argname)
+            if (argpos, argname) != dispatch_pos or typename not in codegen.classes:
+                continue
+            if typename in [t for t, _ in checks]:
+                continue
+            checks.append((typename, i))
+        if not checks:
+            return None
+        code_checks = "".join([gen_template_overload_dispatch_check.substitute(
+                                  cond="else " if idx > 0 else "", typename=typename, variant=i)
+                              for idx, (typename, i) in enumerate(checks)])
+        return dispatch_pos[0], dispatch_pos[1], code_checks
+
+    def gen_batch_code(self, codegen, v, code_decl, code_parse, fullname):
+        src = v.args[v.py_arglist[0][1]]
+        outputs = [(aname, argno) for aname, argno in v.py_outlist if argno >= 0]
+        code_batch_decl = "".join(["        std::vector<Mat> pyopencv_batch_%s(pyopencv_batch_size);\n" % aname
+                                   for aname, argno in outputs])
+        code_fcall = ""
+        if v.rettype:
+            code_batch_decl += "        std::vector<%s> pyopencv_batch_retval(pyopencv_batch_size);\n" % v.rettype
+            code_fcall = "pyopencv_batch_retval[i] = "
+        call_args = []
+        for a in v.args:
+            if a is src or a.outputarg:
+                call_args.append("pyopencv_batch_%s[i]" % a.name)
+            else:
+                call_args.append(a.name)
+        code_fcall += "%s(%s)" % (self.cname, ", ".join(call_args))
+        code_ret_list = ["pyopencv_from_batch(pyopencv_batch_%s[i])" % aname for aname, argno in v.py_outlist]
+        if len(code_ret_list) == 1:
+            code_ret = code_ret_list[0]
+        else:
+            # the items converted before a failed one are released with the tuple
+            code_ret = "pyopencv_batch_tuple(%d, [&](size_t k) -> PyObject* {\n%s\n            return NULL; })" % (
+                len(code_ret_list), "\n".join(["            if (k == %d) return %s;" % (k, ret)
+                                                 for k, ret in enumerate(code_ret_list)]))
+        return gen_template_batch_func.substitute(proto=self.get_batch_prototype(codegen),
+            namespace=self.namespace.replace('.', '::'), name=fullname, code_decl=code_decl, code_parse=code_parse,
+            code_outcheck=" || ".join(["pyobj_" + aname for aname, argno in outputs]),
+            src=src.name, src_info=src.crepr(), code_batch_decl=code_batch_decl, code_fcall=code_fcall,
+            code_ret=code_ret)
+
     def gen_code(self, codegen):
         all_classes = codegen.classes
         proto = self.get_wrapper_prototype(codegen)
-        code = "%s\n{\n" % (proto,)
-        code += "    using namespace %s;\n\n" % self.namespace.replace('.', '::')
+        py_name = self.get_py_name(codegen)
+        stats_name = self.get_wrapper_name() + "_stats"
+        code = 'CVPY_CALL_STATS_DEF(%s, "%s")\n\n' % (stats_name, py_name)
+        code += "%s\n{\n" % (proto,)
+        code += "    using namespace %s;\n" % self.namespace.replace('.', '::')
+        code += "    CVPY_CALL_STATS(%s);\n" % stats_name
+        if py_name in opaque_int64_funcs:
+            code += "    pyopencv_OpaqueInt64Scope opaque_int64_scope;\n"
+        code += "\n"
 
         selfinfo = None
         ismethod = self.classname != "" and not self.isconstructor
@@ -577,6 +866,10 @@ class FuncInfo(object):
 
         all_code_variants = []
         declno = -1
+        batch_code = ""
+        batch_variant = None
+        if not self.classname:
+            batch_variant = next((v for v in self.variants if v.is_batchable()), None)
         for v in self.variants:
             code_decl = ""
             code_ret = ""
@@ -671,6 +964,7 @@ class FuncInfo(object):
             else:
                 code_prelude = ""
                 code_fcall = ""
+                code_decl_args = code_decl
                 if v.rettype:
                     code_decl += "    " + v.rettype + " retval;\n"
                     code_fcall += "retval = "
@@ -680,8 +974,15 @@ class FuncInfo(object):
                     code_fcall += self.cname
                 code_fcall += code_args
 
+            code_cvt_list_batch = code_cvt_list
+            if py_name in opaque_int64_funcs:
+                # the opaque int64 path is chosen by all array arguments, before they are converted
+                code_cvt_list = ["opaque_int64_scope.start({%s}, {%s})" % tuple(", ".join(
+                    "pyobj_" + a.name for a in v.args if a.py_inputarg and a.tp == tp) for tp in ("Mat", "vector_Mat"))] + code_cvt_list
             if code_cvt_list:
                 code_cvt_list = [""] + code_cvt_list
+            if code_cvt_list_batch:
+                code_cvt_list_batch = [""] + code_cvt_list_batch
 
             # add info about return value, if any, to all_cargs. if there non-void return value,
             # it is encoded in v.py_outlist as ("retval", -1) pair.
@@ -704,13 +1005,25 @@ class FuncInfo(object):
                 #   - declares the list of keyword parameters
                 #   - calls PyArg_ParseTupleAndKeywords
                 #   - converts complex arguments from PyObject's to native OpenCV types
-                code_parse = gen_template_parse_args.substitute(
+                # constructors are called through tp_init, so they always get the arguments as tuple and dict
+                templ_parse = gen_template_parse_args if self.isconstructor else gen_template_parse_args_fastcall
+                code_parse = templ_parse.substitute(
                     kw_list = ", ".join(['"' + aname + '"' for aname, argno in v.py_arglist]),
                     fmtspec = fmtspec,
                     parse_arglist = ", ".join(["&" + all_cargs[argno][1] for aname, argno in v.py_arglist]),
                     code_cvt = " &&\n        ".join(code_cvt_list))
-            else:
+                if v is batch_variant:
+                    # batch calls are dispatched by cv2.utils.batch() with the arguments as tuple and dict
+                    code_parse_batch = gen_template_parse_args.substitute(
+                        kw_list = ", ".join(['"' + aname + '"' for aname, argno in v.py_arglist]),
+                        fmtspec = fmtspec,
+                        parse_arglist = ", ".join(["&" + all_cargs[argno][1] for aname, argno in v.py_arglist]),
+                        code_cvt = " &&\n        ".join(code_cvt_list_batch))
+                    batch_code = self.gen_batch_code(codegen, v, code_decl_args, code_parse_batch, fullname)
+            elif self.isconstructor:
                 code_parse = "if(PyObject_Size(args) == 0 && (!kw || PyObject_Size(kw) == 0))"
+            else:
+                code_parse = "if(CVPY_NO_ARGS())"
 
             if len(v.py_outlist) == 0:
                 code_ret = "Py_RETURN_NONE"
@@ -733,17 +1046,35 @@ class FuncInfo(object):
             all_code_variants.append(gen_template_func_body.substitute(code_decl=code_decl,
                 code_parse=code_parse, code_prelude=code_prelude, code_fcall=code_fcall, code_ret=code_ret))
 
+        def_ret = "NULL"
+        if self.isconstructor:
+            def_ret = "-1"
+
+        code_checks = self.gen_dispatch_checks(codegen)
         if len(all_code_variants)==1:
             # if the function/method has only 1 signature, then just put it
             code += all_code_variants[0]
+        elif code_checks:
+            # select the first signature to try by the type of the array argument,
+            # so UMat/GpuMat calls don't pay for the failed parsing of the Mat variant
+            argpos, argname, code_checks = code_checks
+            if self.isconstructor:
+                code_peek = 'pyopencv_peek_arg(args, kw, %d, "%s")' % (argpos, argname)
+            else:
+                code_peek = 'CVPY_PEEK_ARG(%d, "%s")' % (argpos, argname)
+            code += gen_template_overload_dispatch.substitute(code_peek=code_peek,
+                nvariants=len(all_code_variants), code_checks=code_checks,
+                code_cases="".join(["        case %d:\n        {\n%s        }\n        break;\n" % (i, v)
+                                    for i, v in enumerate(all_code_variants)]))
         else:
             # try to execute each signature
-            code += "    PyErr_Clear();\n\n".join(["    {\n" + v + "    }\n" for v in all_code_variants])
+            code += "    g_finalArgError = false;\n"
+            code += ("    if (g_finalArgError)\n        return %s;\n    PyErr_Clear();\n\n" % def_ret).join(
+                ["    {\n" + v + "    }\n" for v in all_code_variants])
 
-        def_ret = "NULL"
-        if self.isconstructor:
-            def_ret = "-1"
         code += "\n    return %s;\n}\n\n" % def_ret
+        code += batch_code
+        self.has_batch = bool(batch_code)
 
         cname = self.cname
         classinfo = None
@@ -753,15 +1084,8 @@ class FuncInfo(object):
         if self.classname:
             classinfo = all_classes[self.classname]
             #if dump: pprint(vars(classinfo))
-            if self.isconstructor:
-                py_name = 'cv.' + classinfo.wname
-            elif self.is_static:
-                py_name = '.'.join([self.namespace, classinfo.sname + '_' + self.variants[0].wname])
-            else:
+            if not self.isconstructor and not self.is_static:
                 cname = classinfo.cname + '::' + cname
-                py_name = 'cv.' + classinfo.wname + '.' + self.variants[0].wname
-        else:
-            py_name = '.'.join([self.namespace, self.variants[0].wname])
         #if dump: print(cname + " => " + py_name)
         py_signatures = codegen.py_signatures.setdefault(cname, [])
         for v in self.variants:
@@ -782,7 +1106,10 @@ class Namespace(object):
 
 
 class PythonWrapperGenerator(object):
-    def __init__(self):
+    def __init__(self, shards=1):
+        # the wrappers of classes and functions are split into this number of translation units
+        # (pyopencv_generated_shard_*.cpp), with 1 they are included into cv2.cpp
+        self.shards = shards
         self.clear()
 
     def clear(self):
@@ -953,21 +1280,42 @@ class PythonWrapperGenerator(object):
         self.code_enums.write(code)
 
     def save(self, path, name, buf):
-        with open(path + "/" + name, "wt") as f:
-            f.write(buf.getvalue())
+        self.save_text(path, name, buf.getvalue())
+
+    def save_shards(self, path, units):
+        # the units are kept in order: a new class or function changes the boundaries of the shards slightly,
+        # so most of them are not rebuilt
+        shards = [StringIO() for _ in range(self.shards)]
+        total = max(1, sum(len(code) for code in units))
+        offset = 0
+        for code in units:
+            shards[offset * self.shards // total].write(code)
+            offset += len(code)
+        for idx, buf in enumerate(shards):
+            self.save_text(path, "pyopencv_generated_shard_%d.cpp" % idx,
+                           gen_template_shard.substitute(idx=idx, count=self.shards, code=buf.getvalue()))
 
     def save_json(self, path, name, value):
         import json
-        with open(path + "/" + name, "wt") as f:
-            json.dump(value, f)
-
-    def gen(self, srcfiles, output_path):
+        self.save_text(path, name, json.dumps(value))
+
+    def save_text(self, path, name, text):
+        # unchanged files are not rewritten to keep their timestamps (and avoid rebuilds of cv2.cpp)
+        fname = path + "/" + name
+        if os.path.exists(fname):
+            with open(fname, "rt") as f:
+                if f.read() == text:
+                    return
+        with open(fname, "wt") as f:
+            f.write(text)
+
+    def gen(self, srcfiles, output_path, jobs=1):
         self.clear()
         self.parser = hdr_parser.CppHeaderParser(generate_umat_decls=True, generate_gpumat_decls=True)
+        parsed = self.parser.parse_headers(srcfiles, jobs=jobs, cache_dir=os.path.join(output_path, "hdr_parser_cache"))
 
         # step 1: scan the headers and build more descriptive maps of classes, consts, functions
-        for hdr in srcfiles:
-            decls = self.parser.parse(hdr)
+        for hdr, decls in zip(srcfiles, parsed):
             if len(decls) == 0:
                 continue
             if hdr.find('opencv2/') >= 0: #Avoid including the shadow files
@@ -1027,12 +1375,13 @@ class PythonWrapperGenerator(object):
         # step 2: generate code for the classes and their methods
         classlist = list(self.classes.items())
         classlist.sort()
+        shard_units = []  # code of the classes and functions, in the order of the shards
         for name, classinfo in classlist:
             self.code_types.write("//{}\n".format(80*"="))
             self.code_types.write("// {} ({})\n".format(name, 'Map' if classinfo.ismap else 'Generic'))
             self.code_types.write("//{}\n".format(80*"="))
-            self.code_types.write(classinfo.gen_code(self))
             if classinfo.ismap:
+                self.code_types.write(classinfo.gen_code(self))
                 self.code_types.write(gen_template_map_type_cvt.substitute(name=classinfo.name, cname=classinfo.cname))
             else:
                 mappable_code = "\n".join([
@@ -1043,6 +1392,14 @@ class PythonWrapperGenerator(object):
                     cname=classinfo.cname if classinfo.issimple else "Ptr<{}>".format(classinfo.cname),
                     mappable_code=mappable_code
                 )
+                if self.shards > 1:
+                    # converters and the tables are declared for cv2.cpp and all the shards
+                    code += gen_template_type_tables_decl.substitute(name=classinfo.name)
+                    if classinfo.constructor is not None:
+                        code += classinfo.constructor.get_wrapper_prototype(self) + ";\n"
+                    shard_units.append(classinfo.gen_code(self))
+                else:
+                    self.code_types.write(classinfo.gen_code(self))
                 self.code_types.write(code)
 
         # register classes in the same order as they have been declared.
@@ -1057,6 +1414,7 @@ class PythonWrapperGenerator(object):
 
 
         # step 3: generate the code for all the global functions
+        batch_funcs = []
         for ns_name, ns in sorted(self.namespaces.items()):
             if ns_name.split('.')[0] != 'cv':
                 continue
@@ -1064,9 +1422,22 @@ class PythonWrapperGenerator(object):
                 if func.isconstructor:
                     continue
                 code = func.gen_code(self)
-                self.code_funcs.write(code)
+                if self.shards > 1:
+                    shard_units.append(code)
+                    self.code_funcs.write(func.get_wrapper_prototype(self) + ";\n")
+                    if func.has_batch:
+                        self.code_funcs.write(func.get_batch_prototype(self) + ";\n")
+                else:
+                    self.code_funcs.write(code)
+                if func.has_batch:
+                    batch_funcs.append(func.get_wrapper_name())
             self.gen_namespace(ns_name)
             self.code_ns_init.write('CVPY_MODULE("{}", {});\n'.format(ns_name[2:], normalize_class_name(ns_name)))
+        # functions which can be called by cv2.utils.batch()
+        self.code_funcs.write("static const pyopencv_BatchFunc pyopencv_batch_funcs[] = {\n")
+        for wrapper_name in batch_funcs:
+            self.code_funcs.write("    {CV_PY_FN_PTR(%s), %s_batch},\n" % (wrapper_name, wrapper_name))
+        self.code_funcs.write("    {NULL, NULL}\n};\n")
 
         # step 4: generate the code for enum types
         enumlist = list(self.enums.values())
@@ -1088,6 +1459,8 @@ class PythonWrapperGenerator(object):
         self.save(output_path, "pyopencv_generated_types_content.h", self.code_types)
         self.save(output_path, "pyopencv_generated_modules.h", self.code_ns_init)
         self.save(output_path, "pyopencv_generated_modules_content.h", self.code_ns_reg)
+        if self.shards > 1:
+            self.save_shards(output_path, shard_units)
         self.save_json(output_path, "pyopencv_signatures.json", self.py_signatures)
 
 if __name__ == "__main__":
@@ -1098,5 +1471,11 @@ if __name__ == "__main__":
     if len(sys.argv) > 2:
         with open(sys.argv[2], 'r') as f:
             srcfiles = [l.strip() for l in f.readlines()]
-    generator = PythonWrapperGenerator()
-    generator.gen(srcfiles, dstdir)
+    shards = 1
+    if len(sys.argv) > 3:
+        shards = int(sys.argv[3])
+    jobs = 1
+    if len(sys.argv) > 4:
+        jobs = int(sys.argv[4])
+    generator = PythonWrapperGenerator(shards)
+    generator.gen(srcfiles, dstdir, jobs)
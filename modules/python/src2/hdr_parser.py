@@ -2,6 +2,7 @@
 
 from __future__ import print_function
 import os, sys, re, string, io
+import hashlib, multiprocessing, pickle
 
 # the list only for debugging. The real list, used in the real OpenCV build, is specified in CMakeLists.txt
 opencv_hdr_list = [
@@ -957,6 +958,52 @@ class CppHeaderParser(object):
 
         return decls
 
+    def parse_headers(self, hnames, wmode=True, jobs=None, cache_dir=None):
+        """
+        Parses the list of headers, like parse() called for each of them.
+        With 'jobs' > 1 the headers are parsed by a pool of that many processes (one process by default).
+        Declarations of each header are stored in 'cache_dir', keyed by the header content
+        and the parser options, so unchanged headers are not parsed again. The entry of a header
+        replaces its entries made for the previous content or options.
+        OPENCV_HDR_PARSER_JOBS and OPENCV_HDR_PARSER_CACHE_DIR environment variables override
+        the arguments (an empty cache directory disables the cache).
+        Returns the list of declaration lists, in the order of 'hnames'.
+        """
+        jobs = int(os.environ.get("OPENCV_HDR_PARSER_JOBS", jobs or 1))
+        cache_dir = os.environ.get("OPENCV_HDR_PARSER_CACHE_DIR", cache_dir)
+        options = (self._generate_umat_decls, self._generate_gpumat_decls, wmode)
+
+        results = [None] * len(hnames)
+        entries = [None] * len(hnames)
+        todo = []
+        for i, hname in enumerate(hnames):
+            if cache_dir:
+                entries[i] = _decls_cache_entry(cache_dir, hname, options)
+                results[i] = _decls_cache_load(entries[i])
+            if results[i] is None:
+                todo.append(i)
+
+        tasks = [(hnames[i],) + options for i in todo]
+        if jobs > 1 and len(tasks) > 1:
+            pool = multiprocessing.Pool(min(jobs, len(tasks)))
+            try:
+                parsed = pool.map(_parse_header, tasks, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            parsed = [_parse_header(t) for t in tasks]
+        for i, res in zip(todo, parsed):
+            results[i] = res
+            if cache_dir:
+                _decls_cache_store(entries[i], res)
+
+        all_decls = []
+        for decls, namespaces in results:
+            self.namespaces.update(namespaces)
+            all_decls.append(decls)
+        return all_decls
+
     def print_decls(self, decls):
         """
         Prints the list of declarations, retrieived by the parse() method
@@ -972,6 +1019,73 @@ class CppHeaderParser(object):
                 else:
                     print()
 
+def _parse_header(task):
+    """
+    Parses one header by a new parser (a task of CppHeaderParser.parse_headers()).
+    Returns (declarations, namespaces).
+    """
+    hname, generate_umat_decls, generate_gpumat_decls, wmode = task
+    parser = CppHeaderParser(generate_umat_decls=generate_umat_decls, generate_gpumat_decls=generate_gpumat_decls)
+    try:
+        decls = parser.parse(hname, wmode)
+    except SystemExit:
+        # the parser has printed the error, sys.exit() would hang the process pool
+        raise Exception("Failed to parse %s" % hname)
+    return decls, sorted(parser.namespaces)
+
+# Cache of the parsed headers: one pickle file per header and parser options.
+# The file name is "<hash of the header path>-<hash of the content, parser code and options>.pickle",
+# so the entries of a header made for its previous content are found and removed on store.
+
+_parser_hash = None
+
+def _decls_cache_entry(cache_dir, hname, options):
+    """
+    Returns the path of the cache entry of the header parsed with 'options'.
+    """
+    global _parser_hash
+    if _parser_hash is None:
+        # the parsed data depends on the parser code too
+        with open(os.path.splitext(os.path.abspath(__file__))[0] + ".py", "rb") as f:
+            _parser_hash = hashlib.sha1(f.read()).hexdigest()
+    path = os.path.abspath(hname)
+    h = hashlib.sha1()
+    h.update(("|".join(str(p) for p in (_parser_hash, sys.version_info[0]) + tuple(options)) + "|").encode("utf-8"))
+    with open(hname, "rb") as f:
+        h.update(f.read())
+    prefix = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, "%s-%s.pickle" % (prefix, h.hexdigest()))
+
+def _decls_cache_load(entry):
+    try:
+        with open(entry, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+def _decls_cache_store(entry, value):
+    cache_dir, name = os.path.split(entry)
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        tmp_entry = "%s.%d.tmp" % (entry, os.getpid())
+        with open(tmp_entry, "wb") as f:
+            pickle.dump(value, f, 2)
+        try:
+            os.rename(tmp_entry, entry)
+        except OSError:
+            os.remove(tmp_entry)  # Windows: already stored by a concurrent process
+        # evict the stale entries of the header
+        prefix = name.split("-", 1)[0] + "-"
+        for other in os.listdir(cache_dir):
+            if other.startswith(prefix) and other.endswith(".pickle") and other != name:
+                try:
+                    os.remove(os.path.join(cache_dir, other))
+                except OSError:
+                    pass  # removed by a concurrent process
+    except (IOError, OSError) as e:
+        sys.stderr.write("Warning: can't store the cache entry in %s: %s\n" % (cache_dir, e))
+
 if __name__ == '__main__':
     parser = CppHeaderParser(generate_umat_decls=True, generate_gpumat_decls=True)
     decls = []
@@ -99,6 +99,98 @@ static inline bool getUnicodeString(PyObject * obj, std::string &str)
 #define CV_PY_FN_WITH_KW(fn) CV_PY_FN_WITH_KW_(fn, 0)
 #define CV_PY_FN_NOARGS(fn) CV_PY_FN_NOARGS_(fn, 0)
 
+// Generated wrappers use vectorcall (METH_FASTCALL) calling convention where it is available:
+// arguments are passed as C array and parsed with precomputed keywords tables (_PyArg_Parser).
+// Older Python versions and limited API builds use the METH_VARARGS | METH_KEYWORDS wrappers.
+//
+// _PyArg_Parser and _PyArg_ParseStackAndKeywords() are private CPython API. They are used here because
+// the public API has no parser of the vectorcall arguments with cached keyword tables: this is what
+// the Argument Clinic code of the CPython modules uses, so the API is kept within a minor version.
+// The extension is built for one minor version (the limited API builds don't use it), and the struct
+// layout of each supported version (3.7 - 3.12) is checked below. Newer versions are enabled only after
+// the check of their layout (3.13 doesn't export _PyArg_ParseStackAndKeywords()).
+#if !defined(CVPY_DISABLE_FASTCALL) && !defined(Py_LIMITED_API) && \
+    PY_VERSION_HEX >= 0x03070000 && PY_VERSION_HEX < 0x030D0000
+#define CVPY_FASTCALL 1
+#endif
+
+#ifdef CVPY_FASTCALL
+
+#define CV_PY_FN_FASTCALL_(fn, flags) (PyCFunction)(void*)(_PyCFunctionFastWithKeywords)(fn), (flags) | METH_FASTCALL | METH_KEYWORDS
+
+#define CVPY_FN_ARGS PyObject* const* args, Py_ssize_t nargs, PyObject* kwnames
+
+// _PyArg_Parser as declared by Python 3.7 - 3.12: the fields not set by cvpy_makeArgParser() are
+// initialized by Python on the first call, zero 'kwtuple' ('initialized' since 3.12) marks a new parser
+struct cvpy_PyArgParserLayout
+{
+#if PY_VERSION_HEX >= 0x030C0000
+    int initialized;
+#endif
+    const char* format;
+    const char* const* keywords;
+    const char* fname;
+    const char* custom_msg;
+    int pos;
+    int min;
+    int max;
+    PyObject* kwtuple;
+    struct _PyArg_Parser* next;
+};
+#define CVPY_CHECK_ARG_PARSER_FIELD(field) \
+    static_assert(offsetof(_PyArg_Parser, field) == offsetof(cvpy_PyArgParserLayout, field), \
+                  "Unsupported layout of _PyArg_Parser: define CVPY_DISABLE_FASTCALL")
+#if PY_VERSION_HEX >= 0x030C0000
+CVPY_CHECK_ARG_PARSER_FIELD(initialized);
+#endif
+CVPY_CHECK_ARG_PARSER_FIELD(format);
+CVPY_CHECK_ARG_PARSER_FIELD(keywords);
+CVPY_CHECK_ARG_PARSER_FIELD(fname);
+CVPY_CHECK_ARG_PARSER_FIELD(custom_msg);
+CVPY_CHECK_ARG_PARSER_FIELD(pos);
+CVPY_CHECK_ARG_PARSER_FIELD(min);
+CVPY_CHECK_ARG_PARSER_FIELD(max);
+CVPY_CHECK_ARG_PARSER_FIELD(kwtuple);
+CVPY_CHECK_ARG_PARSER_FIELD(next);
+static_assert(sizeof(_PyArg_Parser) == sizeof(cvpy_PyArgParserLayout), "Unsupported layout of _PyArg_Parser: define CVPY_DISABLE_FASTCALL");
+#undef CVPY_CHECK_ARG_PARSER_FIELD
+
+static inline _PyArg_Parser cvpy_makeArgParser(const char* fmtspec, const char* const* keywords)
+{
+    // the fields preceding 'format' differ between Python versions, so only the named fields are set
+    _PyArg_Parser parser;
+    memset(&parser, 0, sizeof(parser));
+    parser.format = fmtspec;
+    parser.keywords = keywords;
+    return parser;
+}
+
+#define CVPY_ARG_PARSER(NAME, FMTSPEC, KEYWORDS) static _PyArg_Parser NAME = cvpy_makeArgParser(FMTSPEC, KEYWORDS)
+#define CVPY_PARSE_ARGS(NAME, ...) _PyArg_ParseStackAndKeywords(args, nargs, kwnames, &NAME, __VA_ARGS__)
+#define CVPY_NO_ARGS() (nargs == 0 && (!kwnames || PyTuple_GET_SIZE(kwnames) == 0))
+
+#else
+
+#define CV_PY_FN_FASTCALL_(fn, flags) CV_PY_FN_WITH_KW_(fn, flags)
+
+#define CVPY_FN_ARGS PyObject* args, PyObject* kw
+
+struct cvpy_ArgParser
+{
+    const char* fmtspec;
+    const char* const* keywords;
+};
+
+#define CVPY_ARG_PARSER(NAME, FMTSPEC, KEYWORDS) static const cvpy_ArgParser NAME = { FMTSPEC, KEYWORDS }
+#define CVPY_PARSE_ARGS(NAME, ...) PyArg_ParseTupleAndKeywords(args, kw, NAME.fmtspec, (char**)NAME.keywords, __VA_ARGS__)
+#define CVPY_NO_ARGS() (PyObject_Size(args) == 0 && (!kw || PyObject_Size(kw) == 0))
+
+#endif
+
+#define CV_PY_FN_FASTCALL(fn) CV_PY_FN_FASTCALL_(fn, 0)
+// wrapper function as stored in PyMethodDef, to look up the function object passed from Python
+#define CV_PY_FN_PTR(fn) (PyCFunction)(void*)(fn)
+
 #define CV_PY_TO_CLASS(TYPE)                                                                          \
 template<>                                                                                            \
 bool pyopencv_to(PyObject* dst, TYPE& src, const char* name)                                          \
@@ -172,18 +264,27 @@ PyObject* pyopencv_from(const TYPE& src)
 #endif
 
 
+// The type objects are defined in cv2.cpp, the shards of the generated code (CVPY_SHARD) refer to them
+#ifdef CVPY_SHARD
+#define CVPY_TYPE_OBJECT(NAME) \
+    extern PyTypeObject pyopencv_##NAME##_TypeXXX;
+#else
+#define CVPY_TYPE_OBJECT(NAME) \
+    PyTypeObject pyopencv_##NAME##_TypeXXX = \
+    { \
+        CVPY_TYPE_HEAD \
+        MODULESTR"."#NAME, \
+        sizeof(pyopencv_##NAME##_t), \
+    };
+#endif
+
 #define CVPY_TYPE_DECLARE(NAME, STORAGE, SNAME) \
     struct pyopencv_##NAME##_t \
     { \
         PyObject_HEAD \
         STORAGE v; \
     }; \
-    static PyTypeObject pyopencv_##NAME##_TypeXXX = \
-    { \
-        CVPY_TYPE_HEAD \
-        MODULESTR"."#NAME, \
-        sizeof(pyopencv_##NAME##_t), \
-    }; \
+    CVPY_TYPE_OBJECT(NAME) \
     static PyTypeObject * pyopencv_##NAME##_TypePtr = &pyopencv_##NAME##_TypeXXX; \
     static bool pyopencv_##NAME##_getp(PyObject * self, STORAGE * & dst) \
     { \
@@ -234,13 +335,40 @@ PyObject* pyopencv_from(const TYPE& src)
 
 //==================================================================================================
 
+#ifdef CVPY_SHARD
+#define CVPY_TYPE_OBJECT_DYNAMIC(NAME) \
+    extern PyObject * pyopencv_##NAME##_TypePtr;
+#else
+#define CVPY_TYPE_OBJECT_DYNAMIC(NAME) \
+    PyObject * pyopencv_##NAME##_TypePtr = 0; \
+    static PyType_Slot pyopencv_##NAME##_Slots[] =  \
+    { \
+        {Py_tp_dealloc, 0}, \
+        {Py_tp_repr, 0}, \
+        {Py_tp_getset, 0}, \
+        {Py_tp_init, 0}, \
+        {Py_tp_methods, 0}, \
+        {Py_tp_alloc, 0}, \
+        {Py_tp_new, 0}, \
+        {0, 0} \
+    }; \
+    static PyType_Spec pyopencv_##NAME##_Spec = \
+    { \
+        MODULESTR"."#NAME, \
+        sizeof(pyopencv_##NAME##_t), \
+        0, \
+        Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, \
+        pyopencv_##NAME##_Slots  \
+    };
+#endif
+
 #define CVPY_TYPE_DECLARE_DYNAMIC(NAME, STORAGE, SNAME) \
     struct pyopencv_##NAME##_t \
     { \
         PyObject_HEAD \
         STORAGE v; \
     }; \
-    static PyObject * pyopencv_##NAME##_TypePtr = 0; \
+    CVPY_TYPE_OBJECT_DYNAMIC(NAME) \
     static bool pyopencv_##NAME##_getp(PyObject * self, STORAGE * & dst) \
     { \
         if (PyObject_TypeCheck(self, (PyTypeObject*)pyopencv_##NAME##_TypePtr)) \
@@ -266,26 +394,7 @@ PyObject* pyopencv_from(const TYPE& src)
         char str[1000]; \
         sprintf(str, "<"#NAME" %p>", self); \
         return PyString_FromString(str); \
-    } \
-    static PyType_Slot pyopencv_##NAME##_Slots[] =  \
-    { \
-        {Py_tp_dealloc, 0}, \
-        {Py_tp_repr, 0}, \
-        {Py_tp_getset, 0}, \
-        {Py_tp_init, 0}, \
-        {Py_tp_methods, 0}, \
-        {Py_tp_alloc, 0}, \
-        {Py_tp_new, 0}, \
-        {0, 0} \
-    }; \
-    static PyType_Spec pyopencv_##NAME##_Spec = \
-    { \
-        MODULESTR"."#NAME, \
-        sizeof(pyopencv_##NAME##_t), \
-        0, \
-        Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, \
-        pyopencv_##NAME##_Slots  \
-    };
+    }
 
 #define CVPY_TYPE_INIT_DYNAMIC(NAME, ERROR_HANDLER, BASE, CONSTRUCTOR) \
     { \
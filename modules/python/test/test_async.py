@@ -1,6 +1,11 @@
 #!/usr/bin/env python
 from __future__ import print_function
 
+import sys
+import threading
+import time
+import unittest
+
 import numpy as np
 import cv2 as cv
 
@@ -28,6 +33,90 @@ class AsyncTest(NewOpenCVTests):
             self.assertEqual(cv.Error.StsOk, e.code)
 
 
+@unittest.skipIf(sys.version_info < (3, 7), "cv.aio requires Python 3.7+")
+class AioTest(NewOpenCVTests):
+
+    def setUp(self):
+        super(AioTest, self).setUp()
+        import asyncio
+        self.asyncio = asyncio
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.asyncio.set_event_loop(None)
+        self.loop.close()
+        cv.aio.setExecutor(None)
+        cv.aio.setMaxPending(0)
+        super(AioTest, self).tearDown()
+
+    def run_loop(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_aio_call(self):
+        img = np.random.randint(0, 256, (64, 48, 3), np.uint8)
+        res = self.run_loop(cv.aio.resize(img, (24, 32), interpolation=cv.INTER_AREA))
+        self.assertEqual(cv.norm(res, cv.resize(img, (24, 32), interpolation=cv.INTER_AREA), cv.NORM_INF), 0)
+        self.assertEqual(self.run_loop(cv.aio.utils.dumpInputArray(img)), cv.utils.dumpInputArray(img))
+
+    def test_aio_async_array(self):
+        m = np.array([[1,2],[3,4],[5,6]])
+        result = self.run_loop(cv.aio.utils.testAsyncArray(m))
+        self.assertEqual(cv.norm(m, result, cv.NORM_INF), 0)
+        result = self.run_loop(cv.aio.wait(cv.utils.testAsyncArray(m)))
+        self.assertEqual(cv.norm(m, result, cv.NORM_INF), 0)
+        with self.assertRaises(cv.error):
+            self.run_loop(cv.aio.utils.testAsyncException())
+
+    def test_aio_backpressure(self):
+        from concurrent.futures import ThreadPoolExecutor
+        lock = threading.Lock()
+        state = {'running': 0, 'max': 0}
+
+        def work():
+            with lock:
+                state['running'] += 1
+                state['max'] = max(state['max'], state['running'])
+            time.sleep(0.01)
+            with lock:
+                state['running'] -= 1
+
+        with ThreadPoolExecutor(4) as executor:
+            cv.aio.setExecutor(executor)
+            cv.aio.setMaxPending(2)
+            self.assertEqual(cv.aio.getMaxPending(), 2)
+            self.run_loop(self.asyncio.gather(*[cv.aio.call(work) for _ in range(10)]))
+        self.assertEqual(state['max'], 2)
+
+    def test_aio_cancel(self):
+        from concurrent.futures import ThreadPoolExecutor
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def block():
+            started.set()
+            release.wait(10)
+            calls.append('block')
+
+        def work():
+            calls.append('work')
+
+        with ThreadPoolExecutor(1) as executor:
+            cv.aio.setExecutor(executor)
+            first = self.loop.create_task(cv.aio.call(block))
+            second = self.loop.create_task(cv.aio.call(work))
+            self.run_loop(self.asyncio.sleep(0))
+            self.assertTrue(started.wait(10))
+            second.cancel()
+            self.run_loop(self.asyncio.sleep(0))  # the cancellation reaches the executor queue
+            release.set()
+            self.run_loop(first)
+            with self.assertRaises(self.asyncio.CancelledError):
+                self.run_loop(second)
+        self.assertEqual(calls, ['block'])
+
+
 
 if __name__ == '__main__':
     NewOpenCVTests.bootstrap()
@@ -13,6 +13,57 @@ class Features2D_Tests(NewOpenCVTests):
         self.assertEqual(True, hasattr(cv, 'DrawMatchesFlags_NOT_DRAW_SINGLE_POINTS'))
         self.assertEqual(True, hasattr(cv, 'DRAW_MATCHES_FLAGS_NOT_DRAW_SINGLE_POINTS'))
 
+    def test_structured_arrays(self):
+        img = np.zeros((128, 128), np.uint8)
+        for i in range(8):
+            cv.circle(img, (16 * i + 8, 16 * (i % 4) + 32), 5, 255, -1)
+        img2 = np.roll(img, 4, axis=1)
+        orb = cv.ORB_create(edgeThreshold=8, patchSize=8)
+        bf = cv.BFMatcher(cv.NORM_HAMMING)
+
+        kps, descs = orb.detectAndCompute(img, None)
+        kps2, descs2 = orb.detectAndCompute(img2, None)
+        matches = bf.match(descs, descs2)
+        self.assertGreater(len(kps), 0)
+        self.assertGreater(len(matches), 0)
+
+        cv.utils.setStructuredArrays(True)
+        try:
+            self.assertTrue(cv.utils.getStructuredArrays())
+            kps_arr, descs_arr = orb.detectAndCompute(img, None)
+            kps2_arr = orb.detect(img2, None)
+            matches_arr = bf.match(descs, descs2)
+            knn_arr = bf.knnMatch(descs, descs2, k=2)
+        finally:
+            cv.utils.setStructuredArrays(False)
+
+        self.assertIsInstance(kps_arr, np.ndarray)
+        self.assertEqual(kps_arr.dtype.names, ('pt', 'size', 'angle', 'response', 'octave', 'class_id'))
+        self.assertEqual(len(kps_arr), len(kps))
+        self.assertTrue(np.array_equal(kps_arr['pt'], np.float32([kp.pt for kp in kps])))
+        self.assertTrue(np.array_equal(kps_arr['response'], np.float32([kp.response for kp in kps])))
+        self.assertTrue(np.array_equal(descs_arr, descs))
+
+        self.assertEqual(matches_arr.dtype.names, ('queryIdx', 'trainIdx', 'imgIdx', 'distance'))
+        self.assertEqual(list(matches_arr['trainIdx']), [m.trainIdx for m in matches])
+        self.assertEqual(list(matches_arr['distance']), [m.distance for m in matches])
+        self.assertEqual(len(knn_arr), len(descs))
+        self.assertEqual(knn_arr[0].dtype, matches_arr.dtype)
+
+        # structured arrays are accepted as inputs, also when the mode is disabled
+        _kps, descs_arr = orb.compute(img, kps_arr)
+        self.assertTrue(np.array_equal(descs_arr, descs))
+        good = matches_arr['distance'] < 64
+        out = cv.drawMatches(img, kps_arr, img2, kps2_arr, matches_arr[good], None, matchColor=(0, 255, 0), singlePointColor=(255, 0, 0))
+        ref = cv.drawMatches(img, kps, img2, kps2, [m for m, g in zip(matches, good) if g], None, matchColor=(0, 255, 0), singlePointColor=(255, 0, 0))
+        self.assertTrue(np.array_equal(out, ref))
+        out = cv.drawKeypoints(img, kps_arr[::2], None, color=(0, 255, 0))
+        ref = cv.drawKeypoints(img, kps[::2], None, color=(0, 255, 0))
+        self.assertTrue(np.array_equal(out, ref))
+
+        with self.assertRaises(TypeError):
+            cv.drawKeypoints(img, matches_arr, None)
+
 
 if __name__ == '__main__':
     NewOpenCVTests.bootstrap()
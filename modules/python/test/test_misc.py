@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 from __future__ import print_function
 
+import sys
 import numpy as np
 import cv2 as cv
 
@@ -46,6 +47,46 @@ class Bindings(NewOpenCVTests):
             pass
 
 
+    def test_submodules(self):
+        self.assertIn('haveOpenCL', dir(cv.ocl))
+        self.assertIsInstance(cv.ocl.haveOpenCL(), bool)
+        self.assertTrue(callable(cv.samples.findFile))
+        from cv2 import utils
+        self.assertTrue(callable(utils.dumpInputArray))
+        self.assertFalse(hasattr(cv.ocl, 'non_existed_function'))
+        with self.assertRaises(AttributeError):
+            cv.flann.non_existed_function()
+
+
+    def test_batch(self):
+        images = [np.random.randint(0, 256, (32 + i, 48, 3), np.uint8) for i in range(5)]
+        res = cv.utils.batch(cv.resize, images, (16, 8), interpolation=cv.INTER_AREA)
+        self.assertEqual(len(res), len(images))
+        for dst, src in zip(res, images):
+            self.assertTrue(np.array_equal(dst, cv.resize(src, (16, 8), interpolation=cv.INTER_AREA)))
+
+        stacked = cv.utils.batch(cv.cvtColor, images[:1] * 3, cv.COLOR_BGR2GRAY, stack=True)
+        self.assertEqual(stacked.shape, (3, 32, 48))
+        retvals, dsts = cv.utils.batch(cv.threshold, [img[:32, :, 0] for img in images], 0, 255,
+                                       cv.THRESH_BINARY | cv.THRESH_OTSU, stack=True)
+        self.assertEqual(retvals.shape, (5,))
+        self.assertEqual(dsts.shape, (5, 32, 48))
+        self.assertEqual(cv.utils.batch(cv.resize, [], (16, 8)), [])
+
+        with self.assertRaises(TypeError):
+            cv.utils.batch(len, images)  # not a cv2 function
+        with self.assertRaises(TypeError):
+            cv.utils.batch(cv.resize, images, (16, 8), dst=images[0])
+        with self.assertRaises(cv.error):
+            cv.utils.batch(cv.resize, images + [np.zeros((0, 0), np.uint8)], (16, 8))
+        with self.assertRaises(TypeError):
+            cv.utils.batch(cv.resize, [], (16, 8), interpolation='bad')  # arguments are checked for the empty batch too
+        refcounts = [sys.getrefcount(img) for img in images]
+        with self.assertRaises(TypeError):
+            cv.utils.batch(cv.resize, images + ['not an array'], (16, 8))
+        self.assertEqual([sys.getrefcount(img) for img in images], refcounts)
+
+
 class Arguments(NewOpenCVTests):
 
     def test_InputArray(self):
@@ -83,6 +124,229 @@ class Arguments(NewOpenCVTests):
         res4 = cv.utils.dumpInputArrayOfArrays([c, a, b])
         self.assertEqual(res4, "InputArrayOfArrays: empty()=false kind=0x00050000 flags=0x01050000 total(-1)=3 dims(-1)=1 size(-1)=3x1 type(0)=CV_32FC2 dims(0)=2 size(0)=3x1 type(0)=CV_32FC2")
 
+    def test_InputArray_buffer(self):
+        data = bytearray(range(6))
+        res1 = cv.utils.dumpInputArray(data)
+        self.assertEqual(res1, "InputArray: empty()=false kind=0x00010000 flags=0x01010000 total(-1)=6 dims(-1)=2 size(-1)=1x6 type(-1)=CV_8UC1")
+        res2 = cv.utils.dumpInputArray(memoryview(data).cast('B', (2, 3)))
+        self.assertEqual(res2, "InputArray: empty()=false kind=0x00010000 flags=0x01010000 total(-1)=6 dims(-1)=2 size(-1)=3x2 type(-1)=CV_8UC1")
+        res3 = cv.utils.dumpInputArray(bytes(data))
+        self.assertEqual(res3, res1)
+        import array
+        res4 = cv.utils.dumpInputArray(array.array('f', [1, 2, 3]))
+        self.assertEqual(res4, "InputArray: empty()=false kind=0x00010000 flags=0x01010000 total(-1)=3 dims(-1)=2 size(-1)=1x3 type(-1)=CV_32FC1")
+        res5 = cv.utils.dumpInputArray(array.array('q', [1, 2, 3]))
+        self.assertEqual(res5, "InputArray: empty()=false kind=0x00010000 flags=0x01010000 total(-1)=3 dims(-1)=2 size(-1)=1x3 type(-1)=CV_32SC1")
+
+    def test_OutputArray_buffer(self):
+        # output is written into the memory of the passed buffer, without copies
+        buf = bytearray(6)
+        res = cv.add(np.ones(6, np.uint8), 2, dst=memoryview(buf))
+        self.assertEqual(bytes(buf), b'\x03' * 6)
+        self.assertTrue(np.array_equal(res, np.full(6, 3, np.uint8)))
+        # immutable buffers are rejected, the call is not redirected to the UMat overload
+        ro = bytes(6)
+        with self.assertRaises(TypeError):
+            cv.add(np.ones(6, np.uint8), 2, dst=ro)
+        with self.assertRaises(TypeError):
+            cv.flip(np.zeros((2, 3), np.uint8), 0, dst=ro)
+        self.assertEqual(ro, bytes(6))
+
+    def test_vector_of_points(self):
+        class PointTuple(tuple):
+            pass
+        pts = [(1, 2), (3.5, 4), [5, 6.25]]
+        expected = [(1.0, 2.0), (3.5, 4.0), (5.0, 6.25)]
+        # plain lists/tuples use the bulk conversion, other sequences the generic one
+        for seq in [pts, tuple(pts), pts + [(7, 8, 9)], [PointTuple(p) for p in pts]]:
+            kps = cv.KeyPoint_convert(seq)
+            self.assertEqual([kp.pt for kp in kps][:3], expected)
+        self.assertEqual(cv.utils.testVectorOfPoint2f(pts), 3)
+        self.assertEqual(cv.utils.testVectorOfPoint2f(np.float32(expected).reshape(-1, 1, 2)), 3)
+        self.assertEqual(cv.utils.testVectorOfVectorOfPoint([pts, (), [(0, 0)]]), 4)
+
+    def test_zero_copy_export(self):
+        # getGaussianKernel() returns Mat, which is not allocated by numpy
+        expected = cv.getGaussianKernel(5, 1.0)
+        self.assertFalse(cv.utils.getZeroCopyExport())
+        cv.utils.setZeroCopyExport(True)
+        try:
+            self.assertTrue(cv.utils.getZeroCopyExport())
+            shared = cv.getGaussianKernel(5, 1.0)
+        finally:
+            cv.utils.setZeroCopyExport(False)
+        self.assertFalse(cv.utils.getZeroCopyExport())
+        self.assertEqual(shared.shape, expected.shape)
+        self.assertEqual(shared.dtype, expected.dtype)
+        self.assertTrue(shared.flags.writeable)
+        self.assertIsNotNone(shared.base)  # owns the Mat buffer
+        self.assertTrue(np.array_equal(shared, expected))
+
+    def test_dlpack(self):
+        class Tensor(object):
+            def __init__(self, arr, device=1):
+                self.arr = arr
+                self.device = device
+
+            def __dlpack__(self, stream=None):
+                return cv.utils.toDLPack(self.arr)
+
+            def __dlpack_device__(self):
+                return (self.device, 0)
+
+        a = np.arange(24, dtype=np.float32).reshape(2, 3, 4)[:, ::2]
+        capsule = cv.utils.toDLPack(a)
+        b = cv.utils.fromDLPack(capsule)
+        self.assertTrue(np.shares_memory(a, b))
+        self.assertEqual(b.strides, a.strides)
+        self.assertTrue(np.array_equal(a, b))
+        with self.assertRaises(BufferError):
+            cv.utils.fromDLPack(capsule)  # already consumed
+        with self.assertRaises(BufferError):
+            cv.utils.fromDLPack(Tensor(a, device=2))
+        with self.assertRaises(BufferError):
+            cv.utils.toDLPack(np.ones(3, np.complex64))
+
+        src = np.random.randint(0, 255, (32, 32, 3), np.uint8)
+        self.assertEqual(cv.norm(cv.GaussianBlur(Tensor(src), (5, 5), 0), cv.GaussianBlur(src, (5, 5), 0), cv.NORM_INF), 0)
+        dst = np.zeros((4, 4), np.float32)
+        cv.add(np.ones((4, 4), np.float32), np.ones((4, 4), np.float32), dst=Tensor(dst))
+        self.assertTrue(np.all(dst == 2))
+
+    def test_track_conversions(self):
+        src = np.random.randint(0, 255, (64, 64, 3), np.uint8)
+        with cv.utils.trackConversions() as records:
+            cv.GaussianBlur(src, (3, 3), 0)
+            cv.GaussianBlur(src[:, ::2], (3, 3), 0)
+            cv.bitwise_not(np.zeros((10, 20), np.int64))
+        cv.GaussianBlur(src[:, ::2], (3, 3), 0)  # not recorded
+        self.assertEqual(records, [
+            {'function': 'cv.GaussianBlur', 'argument': 'src', 'reason': 'non-contiguous layout',
+             'dtype': 'uint8', 'shape': (64, 32, 3), 'bytes': 64 * 32 * 3},
+            {'function': 'cv.bitwise_not', 'argument': 'src', 'reason': 'cast to int32',
+             'dtype': 'int64', 'shape': (10, 20), 'bytes': 10 * 20 * 4},
+        ])
+
+    def test_int64_element_moving(self):
+        a = np.arange(12, dtype=np.int64).reshape(3, 4) + (1 << 40)  # not representable as int32
+        self.assertTrue(np.array_equal(cv.flip(a, 0), np.flip(a, 0)))
+        self.assertTrue(np.array_equal(cv.transpose(a), a.T))
+        self.assertTrue(np.array_equal(cv.hconcat([a, a]), np.hstack([a, a])))
+        self.assertEqual(cv.rotate(a, cv.ROTATE_90_CLOCKWISE).dtype, np.int64)
+        dst = np.zeros_like(a)
+        cv.flip(a, 1, dst=dst)
+        self.assertTrue(np.array_equal(dst, np.flip(a, 1)))
+        with cv.utils.trackConversions() as records:
+            cv.flip(a, 0)
+        self.assertEqual(records, [])
+
+        u = np.arange(12, dtype=np.uint64).reshape(3, 4) + np.uint64(1 << 63)  # not representable as int64
+        res = cv.flip(u, 0)
+        self.assertEqual(res.dtype, np.uint64)
+        self.assertTrue(np.array_equal(res, np.flip(u, 0)))
+        res = cv.vconcat([u, u])
+        self.assertEqual(res.dtype, np.uint64)
+        self.assertTrue(np.array_equal(res, np.vstack([u, u])))
+
+        # the int64 arrays are cast to int32 as in the other functions, if the 8-byte arrays have different types
+        b = np.arange(12, dtype=np.int64).reshape(3, 4)
+        with self.assertRaises(cv.error):
+            cv.hconcat([b, np.float64(b)])  # int32 and float64 data, not the int64 data taken as float64
+        res = cv.hconcat([b, np.uint64(b)])
+        self.assertEqual(res.dtype, np.int32)
+        self.assertTrue(np.array_equal(res, np.hstack([b, b])))
+        res = cv.flip(b, 0, dst=np.zeros((3, 4)))
+        self.assertTrue(np.array_equal(res, np.flip(b, 0)))
+
+    def test_int64_element_moving_buffer(self):
+        # buffers are classified by their format, they are not iterated as vectors of arrays
+        class NoIterBuffer(bytearray):
+            def __iter__(self):
+                raise AssertionError("buffer is iterated")
+
+        data = NoIterBuffer(range(256))
+        res = cv.flip(data, 0)
+        self.assertTrue(np.array_equal(res, np.arange(255, -1, -1, dtype=np.uint8)[:, np.newaxis]))
+        if sys.version_info[0] >= 3:
+            a = np.arange(12, dtype=np.int64) + (1 << 40)
+            res = cv.flip(memoryview(a), 0)
+            self.assertEqual(res.dtype, np.int64)
+            self.assertTrue(np.array_equal(res, a[::-1, np.newaxis]))
+
+    def test_float16(self):
+        h = np.random.rand(4, 6, 3).astype(np.float16)
+        res = cv.flip(h, 0)
+        self.assertEqual(res.dtype, np.float16)
+        self.assertTrue(np.array_equal(res, np.flip(h, 0)))
+        self.assertEqual(cv.utils.dumpInputArray(h), "InputArray: empty()=false kind=0x00010000 flags=0x01010000 total(-1)=24 dims(-1)=2 size(-1)=6x4 type(-1)=CV_16FC3")
+
+    def test_numpy_buffer_pool(self):
+        src = np.random.randint(0, 255, (64, 64, 3), np.uint8)
+        expected = cv.GaussianBlur(src, (3, 3), 0)
+        cv.setNumpyBufferPool(src.nbytes * 2)
+        try:
+            first = cv.GaussianBlur(src, (3, 3), 0)
+            ptr = first.ctypes.data
+            del first  # buffer returns to the pool
+            second = cv.GaussianBlur(src, (3, 3), 0)
+            self.assertEqual(second.ctypes.data, ptr)
+            self.assertTrue(np.array_equal(second, expected))
+            third = cv.GaussianBlur(src, (3, 3), 0)  # 'second' is alive, so its buffer is not reused
+            self.assertNotEqual(third.ctypes.data, second.ctypes.data)
+            self.assertTrue(np.array_equal(third, expected))
+            stats = cv.getNumpyBufferPoolStats()
+            self.assertEqual(stats['hits'], 1)
+            self.assertEqual(stats['misses'], 2)
+            self.assertEqual(stats['buffers'], 0)
+            del second, third
+            stats = cv.getNumpyBufferPoolStats()
+            self.assertEqual(stats['buffers'], 2)
+            self.assertEqual(stats['pooled_bytes'], src.nbytes * 2)
+            cv.setNumpyBufferPool(src.nbytes)  # least recently released buffer is evicted
+            self.assertEqual(cv.getNumpyBufferPoolStats()['buffers'], 1)
+        finally:
+            cv.setNumpyBufferPool(0)
+        stats = cv.getNumpyBufferPoolStats()
+        self.assertEqual(stats['buffers'], 0)
+        self.assertEqual(stats['pooled_bytes'], 0)
+        with self.assertRaises(ValueError):
+            cv.setNumpyBufferPool(-1)
+
+    def test_call_stats(self):
+        a = np.zeros((16, 16), np.uint8)
+        cv.utils.resetCallStats()
+        cv.utils.enableCallStats(True)
+        try:
+            for _ in range(3):
+                cv.resize(a, (8, 8))
+            with self.assertRaises(TypeError):
+                cv.resize(a, (8, 8), interpolation='wrong')
+            cv.UMat(a).get()
+        finally:
+            cv.utils.enableCallStats(False)
+        cv.resize(a, (8, 8))  # not counted
+        stats = cv.utils.getCallStats()
+        self.assertEqual(stats['cv.resize']['calls'], 3)
+        self.assertEqual(stats['cv.resize']['errors'], 1)
+        self.assertEqual(stats['cv.UMat.get']['calls'], 1)
+        for name in ['convert_time', 'call_time', 'return_time']:
+            self.assertGreaterEqual(stats['cv.resize'][name], 0)
+        self.assertNotIn('cv.utils.getCallStats', stats)
+        cv.utils.resetCallStats()
+        self.assertEqual(cv.utils.getCallStats(), {})
+
+    def test_keyword_arguments(self):
+        a = np.float32([[3, 4]])
+        self.assertEqual(cv.norm(a), 5.0)
+        self.assertEqual(cv.norm(a, cv.NORM_L1), 7.0)
+        self.assertEqual(cv.norm(a, normType=cv.NORM_L1), 7.0)
+        self.assertEqual(cv.norm(src1=a, normType=cv.NORM_L1), 7.0)
+        self.assertEqual(cv.norm(a, np.zeros_like(a), cv.NORM_INF), 4.0)
+        with self.assertRaises(TypeError):
+            cv.norm(a, normType=cv.NORM_L1, unknown=1)
+        with self.assertRaises(TypeError):
+            cv.norm()
+
 
 class SamplesFindFile(NewOpenCVTests):
 
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Pickle support of the wrapped classes."""
+import pickle
+import sys
+import numpy as np
+import cv2 as cv
+from tests_common import NewOpenCVTests
+
+
+class pickle_test(NewOpenCVTests):
+    def test_pickle_simple_types(self):
+        kp = pickle.loads(pickle.dumps(cv.KeyPoint(1, 2, 3, 4, 5, 6, 7)))
+        self.assertEqual((kp.pt, kp.size, kp.angle, kp.response, kp.octave, kp.class_id),
+                         ((1, 2), 3, 4, 5, 6, 7))
+        m = pickle.loads(pickle.dumps(cv.DMatch(1, 2, 3, 0.5)))
+        self.assertEqual((m.queryIdx, m.trainIdx, m.imgIdx, m.distance), (1, 2, 3, 0.5))
+
+    def test_pickle_umat(self):
+        a = np.arange(24, dtype=np.uint8).reshape(4, 6)
+        u = pickle.loads(pickle.dumps(cv.UMat(a)))
+        self.assertIsInstance(u, cv.UMat)
+        self.assertTrue(np.array_equal(u.get(), a))
+
+    def test_pickle_algorithm(self):
+        gold = cv.AKAZE_create(descriptor_size=1, descriptor_channels=2, nOctaves=3, threshold=4.0)
+        algorithm = pickle.loads(pickle.dumps(gold))
+        self.assertIsInstance(algorithm, cv.AKAZE)
+        self.assertEqual(algorithm.getDescriptorSize(), 1)
+        self.assertEqual(algorithm.getDescriptorChannels(), 2)
+        self.assertEqual(algorithm.getNOctaves(), 3)
+        self.assertEqual(algorithm.getThreshold(), 4.0)
+
+        # write() of ORB doesn't save the parameters
+        with self.assertRaises(TypeError):
+            pickle.dumps(cv.ORB_create())
+
+    def test_pickle_matcher(self):
+        descriptors = np.random.rand(20, 32).astype(np.float32)
+        matcher = cv.FlannBasedMatcher()
+        matcher.add([descriptors])
+        restored = pickle.loads(pickle.dumps(matcher))
+        self.assertEqual(len(restored.getTrainDescriptors()), 1)
+        self.assertTrue(np.array_equal(restored.getTrainDescriptors()[0], descriptors))
+        self.assertEqual(len(restored.match(descriptors[:5])), 5)
+
+    def test_pickle_ml(self):
+        if not hasattr(cv, 'ml'):
+            raise self.skipTest('ml module is not built')
+        rng = np.random.RandomState(0)
+        samples = rng.rand(100, 2).astype(np.float32)
+        responses = (samples[:, 0] > samples[:, 1]).astype(np.int32)
+        test_samples = rng.rand(20, 2).astype(np.float32)
+        svm = cv.ml.SVM_create()
+        svm.setKernel(cv.ml.SVM_LINEAR)
+        knn = cv.ml.KNearest_create()
+        knn.setDefaultK(3)
+        for model in (svm, knn, cv.ml.RTrees_create()):
+            model.train(samples, cv.ml.ROW_SAMPLE, responses)
+            restored = pickle.loads(pickle.dumps(model))
+            self.assertIs(type(restored), type(model))
+            self.assertTrue(restored.isTrained())
+            self.assertTrue(np.array_equal(restored.predict(test_samples)[1], model.predict(test_samples)[1]))
+        self.assertEqual(pickle.loads(pickle.dumps(knn)).getDefaultK(), 3)
+
+    def test_pickle_out_of_band(self):
+        if sys.version_info < (3, 8):
+            raise self.skipTest('Pickle protocol 5 requires Python 3.8+')
+        buffers = []
+        data = pickle.dumps(cv.AKAZE_create(threshold=4.0), protocol=5, buffer_callback=buffers.append)
+        self.assertEqual(len(buffers), 1)
+        self.assertEqual(pickle.loads(data, buffers=buffers).getThreshold(), 4.0)
+
+
+if __name__ == '__main__':
+    NewOpenCVTests.bootstrap()
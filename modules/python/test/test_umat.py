@@ -85,5 +85,21 @@ class UMat(NewOpenCVTests):
             for data_umat0, data_umat in zip(_p1_mask_err_umat0[:2], _p1_mask_err_umat[:2]):
                 self.assertTrue(np.allclose(data_umat0, data_umat))
 
+    def test_umat_overload_dispatch(self):
+        img = np.arange(64, dtype=np.uint8).reshape(8, 8)
+        expected = cv.resize(img, (4, 4), interpolation=cv.INTER_NEAREST)
+
+        # variant is selected by the type of the positional or keyword array argument
+        for res in [cv.resize(cv.UMat(img), (4, 4), interpolation=cv.INTER_NEAREST),
+                    cv.resize(src=cv.UMat(img), dsize=(4, 4), interpolation=cv.INTER_NEAREST)]:
+            self.assertIsInstance(res, cv.UMat)
+            self.assertTrue(np.array_equal(res.get(), expected))
+
+        # ndarray input with UMat output falls back to the UMat variant
+        dst = cv.UMat(4, 4, cv.CV_8UC1)
+        res = cv.resize(img, (4, 4), dst=dst, interpolation=cv.INTER_NEAREST)
+        self.assertIsInstance(res, cv.UMat)
+        self.assertTrue(np.array_equal(res.get(), expected))
+
 if __name__ == '__main__':
     NewOpenCVTests.bootstrap()
@@ -113,6 +113,7 @@ if __name__ == "__main__":
     parser.add_option("-x", "", dest="x", help="argument number for rows", metavar="ROW", default=1)
     parser.add_option("-y", "", dest="y", help="argument number for columns", metavar="COL", default=0)
     parser.add_option("-f", "--filter", dest="filter", help="regex to filter tests", metavar="REGEX", default=None)
+    parser.add_option("", "--no-cache", action="store_false", dest="cache", default=True, help="do not use the cache of parsed logs")
     (options, args) = parser.parse_args()
 
     if len(args) != 1:
@@ -126,12 +127,11 @@ if __name__ == "__main__":
         options.metric = options.metric[:-1]
     getter = metrix_table[options.metric][1]
 
-    tests = testlog_parser.parseLogFile(args[0])
+    test_filter = None
     if options.filter:
         expr = re.compile(options.filter)
-        tests = [(t,getValueParams(t)) for t in tests if expr.search(str(t))]
-    else:
-        tests = [(t,getValueParams(t)) for t in tests]
+        test_filter = lambda t: expr.search(str(t))
+    tests = [(t,getValueParams(t)) for t in testlog_parser.parseLogFile(args[0], test_filter, options.cache)]
 
     args[0] = os.path.basename(args[0])
 
@@ -0,0 +1,337 @@
+#!/usr/bin/env python
+"""
+Database of the performance test results for tracking them across many runs.
+
+    perf_db.py ingest <db> <log_name>.xml [...]   - store the results of the logs (already stored logs are skipped)
+    perf_db.py runs <db>                          - list the stored runs
+    perf_db.py query <db> [options]               - compare the latest run with the previous runs
+
+The database is SQLite file. A run is identified by the module name and the configuration,
+which is made of the cv_* build properties of the log except the versions (see --config-keys).
+
+Regressions are detected with Welch's t-test on Ln(time) of the samples, as the perf framework
+assumes log-normal distribution of the times: the log records the number of samples, the geometric
+mean and the standard deviation of Ln(time) (gmean and gstddev). A test is reported as changed when
+the difference is statistically significant (p-value < --alpha) and larger than --min-change.
+The test needs at least 2 samples on both sides and a non-zero deviation, otherwise no verdict is given.
+With --history N the baseline is the union of the samples of the N previous runs.
+"""
+
+from __future__ import print_function
+import glob
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import sys
+import time
+from optparse import OptionParser
+
+import testlog_parser
+from table_formatter import *
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    sha1 TEXT UNIQUE NOT NULL,
+    file TEXT,
+    module TEXT NOT NULL,
+    configuration TEXT NOT NULL,
+    vcs_version TEXT,
+    file_time REAL,
+    ingested REAL
+);
+CREATE TABLE IF NOT EXISTS run_properties (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (run_id, name)
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test TEXT NOT NULL,
+    status TEXT,
+    samples INTEGER,
+    outliers INTEGER,
+    min REAL,
+    median REAL,
+    gmean REAL,
+    gstddev REAL,
+    mean REAL,
+    stddev REAL,
+    PRIMARY KEY (run_id, test)
+);
+CREATE INDEX IF NOT EXISTS runs_module_configuration ON runs (module, configuration);
+CREATE INDEX IF NOT EXISTS runs_configuration ON runs (configuration);
+CREATE INDEX IF NOT EXISTS results_test ON results (test);
+"""
+
+# Properties which identify the configuration of a run, the other properties (versions) change from build to build
+CONFIG_KEYS = ["build_type", "compiler", "parallel_framework", "cpu_features",
+               "implementation", "num_threads", "cuda_gpu"]
+
+TIME_METRICS = ["min", "median", "gmean", "mean", "stddev"]
+
+def openDatabase(filename):
+    db = sqlite3.connect(filename)
+    db.executescript(SCHEMA)
+    return db
+
+def getModuleName(run, filename):
+    if run.properties.get("module_name"):
+        return run.properties["module_name"]
+    # <module>_<suffix>.xml, as written by run.py
+    return re.match(r"([^_.]*)", os.path.basename(filename)).group(1)
+
+def getConfiguration(properties, config_keys):
+    return ";".join("%s=%s" % (key, properties[key]) for key in config_keys if properties.get(key))
+
+def fileHash(filename):
+    h = hashlib.sha1()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def ingest(db, filename, config_keys, module=None, cache=False):
+    """
+    Stores the log into the database, returns the id of the run (None if the log is stored already).
+    """
+    sha1 = fileHash(filename)
+    if db.execute("SELECT id FROM runs WHERE sha1 = ?", (sha1,)).fetchone():
+        return None
+    run = testlog_parser.parseLogFile(filename, cache=cache)
+    cursor = db.execute("INSERT INTO runs (sha1, file, module, configuration, vcs_version, file_time, ingested) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (sha1, os.path.abspath(filename), module or getModuleName(run, filename),
+                         getConfiguration(run.properties, config_keys), run.properties.get("vcs_version"),
+                         os.path.getmtime(filename), time.time()))
+    run_id = cursor.lastrowid
+    db.executemany("INSERT INTO run_properties (run_id, name, value) VALUES (?, ?, ?)",
+                   [(run_id, name, value) for name, value in run.properties.items()])
+    rows = []
+    for t in run.tests:
+        times = [t.get(m, "s") if t.status == "run" else None for m in TIME_METRICS]
+        rows.append([run_id, str(t), t.status, t.get("samples"), t.get("outliers")] + times[:3] +
+                    [t.get("gstddev")] + times[3:])
+    db.executemany("INSERT OR REPLACE INTO results (run_id, test, status, samples, outliers, min, median, gmean, "
+                   "gstddev, mean, stddev) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    db.commit()
+    return run_id
+
+# Statistics
+
+def betacf(a, b, x):
+    # continued fraction of the incomplete beta function (modified Lentz's method)
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c, d = 1.0, 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        for aa in (m * (b - m) * x / ((qam + m2) * (a + m2)), -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))):
+            d = 1.0 + aa * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + aa / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-12:
+            break
+    return h
+
+def betai(a, b, x):
+    """
+    Regularized incomplete beta function I_x(a, b).
+    """
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    bt = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1.0 - x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return bt * betacf(a, b, x) / a
+    return 1.0 - bt * betacf(b, a, 1.0 - x) / b
+
+def welchTest(n1, mean1, sd1, n2, mean2, sd2):
+    """
+    Returns two-sided p-value of Welch's t-test for two samples given by their sizes, means and standard deviations.
+    Returns None if the test can't be done: a sample has less than 2 values or both deviations are 0.
+    """
+    if n1 < 2 or n2 < 2:
+        return None
+    v1 = sd1 * sd1 / n1
+    v2 = sd2 * sd2 / n2
+    if v1 + v2 == 0:
+        return None
+    t = (mean1 - mean2) / math.sqrt(v1 + v2)
+    df = (v1 + v2) ** 2 / (v1 * v1 / (n1 - 1) + v2 * v2 / (n2 - 1))
+    return betai(0.5 * df, 0.5, df / (df + t * t))
+
+def poolSamples(stats):
+    """
+    Combines the (samples, mean, sd) statistics of several runs into the statistics of the union of their samples.
+    """
+    n = sum(s[0] for s in stats)
+    mean = sum(s[0] * s[1] for s in stats) / n
+    ss = sum((s[0] - 1) * s[2] * s[2] + s[0] * (s[1] - mean) ** 2 for s in stats)
+    return n, mean, math.sqrt(ss / (n - 1)) if n > 1 else 0.0
+
+def logStats(row):
+    samples, gmean, gstddev = row
+    if not samples or not gmean or gmean <= 0:
+        return None
+    return samples, math.log(gmean), gstddev or 0.0
+
+# Commands
+
+def selectRuns(db, options):
+    """
+    Returns (current run, list of the baseline runs) as (id, module, configuration, vcs_version) tuples.
+    """
+    query = "SELECT id, module, configuration, vcs_version FROM runs"
+    conditions, params = [], []
+    if options.run:
+        conditions.append("id = ?")
+        params.append(options.run)
+    if options.module:
+        conditions.append("module = ?")
+        params.append(options.module)
+    for cfg in options.config:
+        conditions.append("configuration LIKE ?")
+        params.append("%" + cfg + "%")
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    current = db.execute(query + " ORDER BY id DESC LIMIT 1", params).fetchone()
+    if current is None:
+        return None, []
+    baseline = db.execute("SELECT id, module, configuration, vcs_version FROM runs "
+                          "WHERE module = ? AND configuration = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                          (current[1], current[2], current[0], options.history)).fetchall()
+    return current, baseline
+
+def queryRegressions(db, options):
+    current, baseline = selectRuns(db, options)
+    if current is None:
+        sys.stderr.write("Error: no matching runs" + os.linesep)
+        return 1
+    if not baseline:
+        sys.stderr.write("Error: no previous runs of %s [%s]%s" % (current[1], current[2], os.linesep))
+        return 1
+
+    expr = re.compile(options.filter) if options.filter else None
+    history = {}
+    for run_id, _, _, _ in baseline:
+        for test, samples, gmean, gstddev in db.execute(
+                "SELECT test, samples, gmean, gstddev FROM results WHERE run_id = ? AND status = 'run'", (run_id,)):
+            stats = logStats((samples, gmean, gstddev))
+            if stats:
+                history.setdefault(test, []).append(stats)
+
+    scale = {"s": 1.0, "ms": 1e3, "us": 1e6, "ns": 1e9}[options.units]
+    tbl = table("%s [%s], run %d vs %s" % (current[1], current[2] or "-", current[0],
+                                           ", ".join(str(r[0]) for r in baseline)), options.format)
+    tbl.newColumn("name", "Name of Test", align="left")
+    tbl.newColumn("baseline", "Baseline\n(gmean, %s)" % options.units, align="center")
+    tbl.newColumn("current", "Current\n(gmean, %s)" % options.units, align="center")
+    tbl.newColumn("ratio", "Baseline\nvs\nCurrent\n(x-factor)", align="center")
+    tbl.newColumn("p", "p-value", align="center")
+    tbl.newColumn("verdict", "Verdict", align="center")
+
+    regressions = 0
+    rows = db.execute("SELECT test, samples, gmean, gstddev FROM results WHERE run_id = ? AND status = 'run'",
+                      (current[0],)).fetchall()
+    for test, samples, gmean, gstddev in sorted(rows):
+        if expr and not expr.search(test):
+            continue
+        stats = logStats((samples, gmean, gstddev))
+        if not stats or test not in history:
+            continue
+        n0, mean0, sd0 = poolSamples(history[test])
+        p = welchTest(n0, mean0, sd0, stats[0], stats[1], stats[2])
+        ratio = math.exp(mean0 - stats[1])  # > 1: faster
+        verdict = None
+        if p is not None and p < options.alpha and abs(ratio - 1.0) > options.min_change:
+            verdict = "SLOWER" if ratio < 1.0 else "FASTER"
+        if verdict == "SLOWER":
+            regressions += 1
+        elif options.regressions_only or (not verdict and not options.show_all):
+            continue
+        color = {"SLOWER": "red", "FASTER": "green"}.get(verdict)
+        tbl.newRow()
+        tbl.newCell("name", str(test))
+        tbl.newCell("baseline", "%.3f" % (math.exp(mean0) * scale), math.exp(mean0) * scale)
+        tbl.newCell("current", "%.3f" % (gmean * scale), gmean * scale, color=color)
+        tbl.newCell("ratio", formatValue(ratio, "%"), ratio, color=color, bold=color)
+        tbl.newCell("p", "%.2g" % p if p is not None else "-", p)
+        tbl.newCell("verdict", verdict or " ", color=color, bold=color)
+
+    printTable(tbl, options, "Regressions of %s" % current[1])
+    return regressions
+
+def listRuns(db, options):
+    tbl = table("Runs", options.format)
+    for name, caption in [("id", "Run"), ("module", "Module"), ("configuration", "Configuration"),
+                          ("vcs_version", "VCS version"), ("tests", "Tests"), ("file", "Log file")]:
+        tbl.newColumn(name, caption, align="left")
+    query = ("SELECT id, module, configuration, vcs_version, "
+             "(SELECT COUNT(*) FROM results WHERE run_id = runs.id), file FROM runs")
+    params = []
+    if options.module:
+        query += " WHERE module = ?"
+        params.append(options.module)
+    for row in db.execute(query + " ORDER BY id", params):
+        tbl.newRow()
+        for name, value in zip(["id", "module", "configuration", "vcs_version", "tests", "file"], row):
+            tbl.newCell(name, str(value) if value not in (None, "") else "-", value)
+    printTable(tbl, options, "Runs")
+    return 0
+
+def printTable(tbl, options, title):
+    if options.generateHtml:
+        htmlPrintHeader(sys.stdout, title)
+        tbl.htmlPrintTable(sys.stdout)
+        htmlPrintFooter(sys.stdout)
+    else:
+        tbl.consolePrintTable(sys.stdout)
+
+if __name__ == "__main__":
+    parser = OptionParser(usage="%prog ingest|runs|query <db> [<log_name>.xml ...] [options]")
+    parser.add_option("-o", "--output", dest="format", help="output results in text format (can be 'txt', 'html', 'markdown' or 'auto' - default)", metavar="FMT", default="auto")
+    parser.add_option("-u", "--units", dest="units", help="units for output values (s, ms (default), us or ns)", metavar="UNITS", default="ms")
+    parser.add_option("-f", "--filter", dest="filter", help="regex to filter tests", metavar="REGEX", default=None)
+    parser.add_option("", "--module", dest="module", default=None, metavar="NAME", help="module name (ingest: instead of the one from the log)")
+    parser.add_option("", "--config", dest="config", action="append", default=[], metavar="KEY=VALUE", help="query: select the configuration containing KEY=VALUE (can be repeated)")
+    parser.add_option("", "--config-keys", dest="config_keys", default=",".join(CONFIG_KEYS), metavar="KEYS", help="ingest: comma-separated properties which make the configuration (default: %default)")
+    parser.add_option("", "--run", dest="run", type="int", default=None, metavar="ID", help="query: run to check (default: the latest one)")
+    parser.add_option("", "--history", dest="history", type="int", default=5, metavar="N", help="query: number of previous runs of the same module and configuration in the baseline (default: %default)")
+    parser.add_option("", "--alpha", dest="alpha", type="float", default=0.001, metavar="P", help="query: significance level (default: %default)")
+    parser.add_option("", "--min-change", dest="min_change", type="float", default=0.05, metavar="X", help="query: minimal relative change to report (default: %default)")
+    parser.add_option("", "--regressions-only", action="store_true", dest="regressions_only", default=False, help="query: show the regressions only")
+    parser.add_option("", "--show-all", action="store_true", dest="show_all", default=False, help="query: also show the unchanged tests")
+    parser.add_option("", "--no-cache", action="store_false", dest="cache", default=True, help="do not use the cache of parsed logs")
+    (options, args) = parser.parse_args()
+
+    if len(args) < 2 or args[0] not in ("ingest", "runs", "query") or options.units not in ("s", "ms", "us", "ns"):
+        parser.print_help()
+        sys.exit(1)
+    options.generateHtml = detectHtmlOutputType(options.format)
+    command, db = args[0], openDatabase(args[1])
+
+    if command == "ingest":
+        config_keys = [k.strip() for k in options.config_keys.split(",") if k.strip()]
+        files = []
+        for arg in args[2:]:
+            files.extend(sorted(glob.glob(arg)) if ("*" in arg or "?" in arg) else [arg])
+        for fname in files:
+            try:
+                run_id = ingest(db, fname, config_keys, options.module, options.cache)
+                print("%s: %s" % (fname, "run %d" % run_id if run_id is not None else "already stored"))
+            except (IOError, testlog_parser.ParseError) as err:
+                sys.stderr.write("Error reading \"%s\" - %s%s" % (fname, err, os.linesep))
+        sys.exit(0)
+    if command == "runs":
+        sys.exit(listRuns(db, options))
+    # the exit code is the number of regressions, like summary.py --regressions-only
+    sys.exit(queryRegressions(db, options))
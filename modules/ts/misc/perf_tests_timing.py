@@ -19,6 +19,9 @@ if __name__ == "__main__":
     parser.add_option("--failed-only", action = "store_true", dest = "failedOnly",
         help = "print only failed tests", default = False)
 
+    parser.add_option("--no-cache", action = "store_false", dest = "cache",
+        help = "do not use the cache of parsed logs", default = True)
+
     (options, args) = parser.parse_args()
 
     options.generateHtml = detectHtmlOutputType(options.format)
@@ -50,13 +53,13 @@ if __name__ == "__main__":
 
             test_sets = []
             try:
-                tests = testlog_parser.parseLogFile(file)
+                tests = testlog_parser.parseLogFile(file, cache=options.cache)
                 if tests:
                     test_sets.append((os.path.basename(file), tests))
             except IOError as err:
                 sys.stderr.write("IOError reading \"" + file + "\" - " + str(err) + os.linesep)
-            except xml.parsers.expat.ExpatError as err:
-                sys.stderr.write("ExpatError reading \"" + file + "\" - " + str(err) + os.linesep)
+            except testlog_parser.ParseError as err:
+                sys.stderr.write("ParseError reading \"" + file + "\" - " + str(err) + os.linesep)
 
             if not test_sets:
                 continue
@@ -11,6 +11,7 @@ if __name__ == "__main__":
     parser.add_option("-c", "--columns", dest="columns", help="comma-separated list of columns to show", metavar="COLS", default="")
     parser.add_option("-f", "--filter", dest="filter", help="regex to filter tests", metavar="REGEX", default=None)
     parser.add_option("", "--show-all", action="store_true", dest="showall", default=False, help="also include empty and \"notrun\" lines")
+    parser.add_option("", "--no-cache", action="store_false", dest="cache", default=True, help="do not use the cache of parsed logs")
     (options, args) = parser.parse_args()
 
     if len(args) < 1:
@@ -33,21 +34,22 @@ if __name__ == "__main__":
     args = files
 
     # load test data
+    test_filter = None
+    if options.filter:
+        expr = re.compile(options.filter)
+        test_filter = lambda t: expr.search(str(t))
+
     tests = []
     files = []
     for arg in set(args):
         try:
-            cases = testlog_parser.parseLogFile(arg)
+            cases = testlog_parser.parseLogFile(arg, test_filter, options.cache)
             if cases:
                 files.append(os.path.basename(arg))
                 tests.extend(cases)
         except:
             pass
 
-    if options.filter:
-        expr = re.compile(options.filter)
-        tests = [t for t in tests if expr.search(str(t))]
-
     tbl = table(", ".join(files))
     if options.columns:
         metrics = [s.strip() for s in options.columns.split(",")]
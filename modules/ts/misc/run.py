@@ -33,6 +33,8 @@ if __name__ == "__main__":
     parser.add_argument("--list_short_main", action="store_true", default=False, help="List available tests (main repository, aliases)")
     parser.add_argument("--configuration", metavar="CFG", default=None, help="Force Debug or Release configuration (for Visual Studio and Java tests build)")
     parser.add_argument("-n", "--dry_run", action="store_true", help="Do not run the tests")
+    parser.add_argument("-j", "--jobs", metavar="N", type=int, default=1, help="Run each accuracy test in N concurrent gtest shards (performance tests are always run serially)")
+    parser.add_argument("--timings", metavar="FILE", default=None, help="Store durations of the tests in JSON file, '--jobs' uses them to split the tests into shards with close total time")
     parser.add_argument("-v", "--verbose", action="store_true", default=False, help="Print more debug information")
 
     # Valgrind
@@ -67,6 +69,10 @@ if __name__ == "__main__":
 
     args.mode = "test" if args.accuracy else "perf"
 
+    if args.jobs > 1 and args.mode == "perf":
+        log.warning("Performance tests are run serially, '--jobs' is ignored")
+        args.jobs = 1
+
     android_env = []
     if args.android_env:
         android_env.extend([entry.split("=", 1) for entry in args.android_env])
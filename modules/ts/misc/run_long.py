@@ -1,5 +1,9 @@
 #!/usr/bin/env python
 from __future__ import print_function
+import heapq
+import json
+import os
+import re
 import xml.etree.ElementTree as ET
 from glob import glob
 from pprint import PrettyPrinter as PP
@@ -75,11 +79,23 @@ def longTestFilter(data, module=None):
     return '--gtest_filter={}'.format(':'.join(res))
 
 
+# Parse test durations from xml file
+# Returns tuple: ( <root element>, [ (<test_name>, <test_time>), ... ] )
+def parseTimes(filename):
+    root = ET.parse(filename).getroot()
+    res = []
+    for elem in root.findall('.//testcase'):
+        if elem.get('status', 'run') != 'run' or elem.get('time') is None:
+            continue
+        key = '{}.{}'.format(elem.get('classname'), elem.get('name'))
+        res.append((key, float(elem.get('time'))))
+    return root, res
+
+
 # Parse one xml file, filter out tests which took less than 'timeLimit' seconds
 # Returns tuple: ( <module_name>, [ (<module_name>, <test_name>, <test_time>), ... ] )
 def parseOneFile(filename, timeLimit):
-    tree = ET.parse(filename)
-    root = tree.getroot()
+    root, times = parseTimes(filename)
 
     def guess(s, delims):
         for delim in delims:
@@ -90,15 +106,89 @@ def parseOneFile(filename, timeLimit):
     module = guess(filename, ['_posix_', '_nt_', '__']) or root.get('cv_module_name')
     if not module:
         return (None, None)
-    res = []
-    for elem in root.findall('.//testcase'):
-        key = '{}.{}'.format(elem.get('classname'), elem.get('name'))
-        val = elem.get('time')
-        if float(val) >= timeLimit:
-            res.append((module, key, float(val)))
+    res = [(module, key, val) for key, val in times if val >= timeLimit]
     return (module, res)
 
 
+# Durations of the tests from the previous runs, stored in JSON file:
+# { <configuration>: { <module_name>: { <test_name>: <test_time>, ... } } }
+# Configurations (Release, Debug, Debug-valgrind, ...) are stored separately, the durations differ a lot
+class TestTimings(object):
+    def __init__(self, filename):
+        self.filename = filename
+        self.data = {}
+        if os.path.isfile(filename):
+            with open(filename) as f:
+                self.data = json.load(f)
+
+    def get(self, config, module):
+        return self.data.get(config, {}).get(module, {})
+
+    def update(self, config, module, logfile):
+        _, times = parseTimes(logfile)
+        self.data.setdefault(config, {}).setdefault(module, {}).update(times)
+
+    def save(self):
+        tmpname = self.filename + '.tmp'
+        with open(tmpname, 'w') as f:
+            json.dump(self.data, f, indent=1, sort_keys=True)
+        if os.path.exists(self.filename):
+            os.remove(self.filename)  # rename doesn't replace files on Windows
+        os.rename(tmpname, self.filename)
+
+
+# Parse output of '--gtest_list_tests'
+# Returns list of test names: [ 'TestCase.test', ... ]
+def parseTestList(output):
+    res = []
+    testcase = None
+    for line in output.splitlines():
+        match = re.match(r'^(\S+\.)(\s+#.*)?$', line)
+        if match:
+            testcase = match.group(1)
+            continue
+        match = re.match(r'^  (\S+)(\s+#.*)?$', line)
+        if match and testcase:
+            res.append(testcase + match.group(1))
+        else:
+            testcase = None
+    return res
+
+
+# Split tests into 'count' shards with close total durations (longest processing time first)
+# Tests without known duration are assumed to take the median time of the known ones
+# Returns list of tuples: [ (<total_time>, [<test_name>, ...]), ... ]
+def scheduleTests(tests, times, count):
+    known = sorted(times[t] for t in tests if t in times)
+    default = known[len(known) // 2] if known else 1.0
+    shards = [(0.0, i, []) for i in range(min(count, len(tests)))]
+    for test in sorted(tests, key=lambda t: (-times.get(t, default), t)):
+        total, i, shard = heapq.heappop(shards)
+        shard.append(test)
+        heapq.heappush(shards, (total + times.get(test, default), i, shard))
+    return [(total, shard) for total, _, shard in sorted(shards, key=lambda s: s[1])]
+
+
+# Make '--gtest_filter' value for the shard, test cases which are completely in the shard are replaced by 'TestCase.*'
+def shardFilter(shard, allTests):
+    testcases = {}
+    for t in allTests:
+        testcases.setdefault(t.rpartition('.')[0], []).append(t)
+    selected = set(shard)
+    res = []
+    done = set()
+    for t in shard:
+        testcase = t.rpartition('.')[0]
+        if testcase in done:
+            continue
+        if all(x in selected for x in testcases.get(testcase, [])):
+            res.append(testcase + '.*')
+            done.add(testcase)
+        else:
+            res.append(t)
+    return ':'.join(res)
+
+
 # Parse all xml files in current folder and combine results into one list
 # Print result to the stdout
 if __name__ == '__main__':
@@ -2,8 +2,10 @@
 import os
 import re
 import sys
-from run_utils import Err, log, execute, getPlatformVersion, isColorEnabled, TempEnvDir
-from run_long import LONG_TESTS_DEBUG_VALGRIND, longTestFilter
+import threading
+from multiprocessing.pool import ThreadPool
+from run_utils import Err, log, execute, getPlatformVersion, isColorEnabled, TempEnvDir, mergeTestLogs
+from run_long import LONG_TESTS_DEBUG_VALGRIND, longTestFilter, TestTimings, parseTestList, scheduleTests, shardFilter
 
 
 class TestSuite(object):
@@ -13,6 +15,7 @@ class TestSuite(object):
         self.nameprefix = "opencv_" + self.options.mode + "_"
         self.tests = self.cache.gatherTests(self.nameprefix + "*", self.isTest)
         self.id = id
+        self.timings = TestTimings(self.options.timings) if self.options.timings else None
 
     def getOS(self):
         return getPlatformVersion() or self.cache.getOS()
@@ -88,7 +91,7 @@ class TestSuite(object):
                 else:
                     print("WARNING: Valgrind suppression file is missing, SKIP: %s" % f)
             res.extend(self.options.valgrind_opt)
-            has_gtest_filter = next((True for x in cmd if x.startswith('--gtest_filter=')), False)
+            has_gtest_filter = next((True for x in cmd if x.startswith('--gtest_filter=') or x.startswith('--gtest_flagfile=')), False)
             return res + cmd + ([longTestFilter(LONG_TESTS_DEBUG_VALGRIND, module)] if not has_gtest_filter else [])
         elif self.options.qemu:
             import shlex
@@ -130,6 +133,10 @@ class TestSuite(object):
             module_suffix = '' if 'Visual Studio' not in self.cache.cmake_generator else '/' + self.cache.build_type
             env = {}
             env['PYTHONPATH'] = self.cache.opencv_build + '/lib' + module_suffix + os.pathsep + os.getenv('PYTHONPATH', '')
+            loader = os.path.join(self.cache.opencv_build, 'python_loader')
+            if os.path.isfile(os.path.join(loader, 'cv2', 'config.py')):
+                # Python submodules of the package (cv2.aio) are available through the loader only
+                env['PYTHONPATH'] = loader + os.pathsep + env['PYTHONPATH']
             if self.cache.getOS() == 'nt':
                 env['PATH'] = self.cache.opencv_build + '/bin' + module_suffix + os.pathsep + os.getenv('PATH', '')
             else:
@@ -146,9 +153,12 @@ class TestSuite(object):
                 env['OPENCV_TRACE_SYNC_OPENCL'] = '1'
             tempDir = TempEnvDir('OPENCV_TEMP_PATH', "__opencv_temp.")
             tempDir.init()
-            cmd = self.wrapCommand(module, [exe] + args, env)
-            log.warning("Run: %s" % " ".join(cmd))
-            ret = execute(cmd, cwd=workingDir, env=env)
+            if self.getShardsCount() > 1:
+                ret = self.runShards(module, exe, logfile, workingDir, args, env)
+            else:
+                cmd = self.wrapCommand(module, [exe] + args, env)
+                log.warning("Run: %s" % " ".join(cmd))
+                ret = execute(cmd, cwd=workingDir, env=env)
             try:
                 if not self.options.valgrind and self.options.trace and int(self.options.trace_dump) >= 0:
                     import trace_profiler
@@ -162,9 +172,110 @@ class TestSuite(object):
             tempDir.clean()
             hostlogpath = os.path.join(workingDir, logfile)
             if os.path.isfile(hostlogpath):
+                if self.timings:
+                    try:
+                        self.timings.update(self.getTimingsConfig(), self.getAlias(exe), hostlogpath)
+                        self.timings.save()
+                    except Exception as e:
+                        log.warning("Can not store the durations of the tests: %s", e)
                 return hostlogpath, ret
             return None, ret
 
+    def getShardsCount(self):
+        # performance tests are run serially, concurrent processes disturb the timings
+        if self.options.mode != "test" or self.options.trace:
+            return 1
+        return max(1, self.options.jobs)
+
+    def getTimingsConfig(self):
+        # durations of the tests depend on the configuration
+        config = self.cache.build_type
+        if self.options.valgrind:
+            config += "-valgrind"
+        if self.options.qemu:
+            config += "-qemu"
+        return config
+
+    def listTestCases(self, module, exe, workingDir, args, env):
+        # tests are listed without valgrind, listing doesn't run them
+        cmd = [exe, "--gtest_list_tests"] + args
+        if not self.options.valgrind:
+            cmd = self.wrapCommand(module, cmd, env)
+        return parseTestList(execute(cmd, silent=True, cwd=workingDir, env=env))
+
+    def scheduleShards(self, module, exe, workingDir, args, env, count):
+        """
+        Splits the tests into shards by the durations from the previous runs (longest first).
+        Returns list of '--gtest_filter' values, None if the durations are not available.
+        """
+        if not self.timings:
+            return None
+        userFilter = [a for a in args if a.startswith("--gtest_filter=")]
+        if not userFilter and self.options.valgrind:
+            userFilter = [longTestFilter(LONG_TESTS_DEBUG_VALGRIND, self.getAlias(exe))]
+        allTests = self.listTestCases(module, exe, workingDir, [], env)
+        tests = self.listTestCases(module, exe, workingDir, userFilter, env) if userFilter else allTests
+        if not tests:
+            return None
+        times = self.timings.get(self.getTimingsConfig(), self.getAlias(exe))
+        shards = scheduleTests(tests, times, count)
+        log.info("Shards of %s by the durations of %d/%d tests: %s", self.getAlias(exe),
+                 len([t for t in tests if t in times]), len(tests), ", ".join("%.1fs" % total for total, _ in shards))
+        return [shardFilter(shard, allTests) for _, shard in shards]
+
+    def runShards(self, module, exe, logfile, workingDir, args, env):
+        """
+        Runs the gtest shards of the test executable concurrently.
+        The tests are split by the durations from the previous runs (see --timings),
+        without the durations the shards are made by gtest (GTEST_TOTAL_SHARDS/GTEST_SHARD_INDEX).
+        Each shard has own OPENCV_TEMP_PATH, the logs of the shards are merged into the logfile.
+        """
+        count = self.getShardsCount()
+        args = [a for a in args if not a.startswith("--gtest_output=")]
+        shardsDir = os.environ['OPENCV_TEMP_PATH']  # removed with the temp dir of the test
+        filters = self.scheduleShards(module, exe, workingDir, args, env, count)
+        if filters is not None:
+            count = len(filters)
+            args = [a for a in args if not a.startswith("--gtest_filter=")]
+        lock = threading.Lock()
+
+        def runShard(index):
+            shardEnv = dict(env, OPENCV_TEMP_PATH=shardsDir)
+            shardArgs = ["--gtest_output=xml:" + os.path.join(shardsDir, "shard%d.xml" % index)]
+            if filters is None:
+                shardEnv.update(GTEST_TOTAL_SHARDS=str(count), GTEST_SHARD_INDEX=str(index))
+            else:
+                # the filter may be too long for the command line
+                flagfile = os.path.join(shardsDir, "shard%d.flags" % index)
+                with open(flagfile, "w") as f:
+                    f.write("--gtest_filter=%s\n" % filters[index])
+                shardArgs.append("--gtest_flagfile=" + flagfile)
+            tempDir = TempEnvDir('OPENCV_TEMP_PATH', "__opencv_temp.", shardEnv)
+            tempDir.init()
+            cmd = self.wrapCommand(module, [exe] + args + shardArgs, shardEnv)
+            log.warning("Run shard %d/%d: %s" % (index + 1, count, " ".join(cmd)))
+            # output of the shard is printed at once when it is finished
+            with open(os.path.join(shardsDir, "shard%d.txt" % index), "w+b") as output:
+                ret = execute(cmd, cwd=workingDir, env=shardEnv, output=output)
+                output.seek(0)
+                with lock:
+                    log.info("===== Shard %d/%d of %s (returned %s) =====", index + 1, count, module, ret)
+                    sys.stdout.write(output.read().decode("latin-1"))  # like execute(silent=True)
+                    sys.stdout.flush()
+            tempDir.clean()
+            return ret
+
+        pool = ThreadPool(count)
+        try:
+            results = pool.map(runShard, range(count))
+        finally:
+            pool.close()
+            pool.join()
+        if logfile:
+            shardLogs = [os.path.join(shardsDir, "shard%d.xml" % i) for i in range(count)]
+            mergeTestLogs([f for f in shardLogs if os.path.isfile(f)], os.path.join(workingDir, logfile))
+        return next((r for r in results if r != 0), 0)
+
     def runTests(self, tests, black, workingDir, args=[]):
         args = args[:]
         logs = []
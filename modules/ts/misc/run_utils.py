@@ -7,6 +7,7 @@ import tempfile
 import glob
 import logging
 import shutil
+import xml.etree.ElementTree as ET
 from subprocess import check_call, check_output, CalledProcessError, STDOUT
 
 
@@ -28,7 +29,7 @@ class Err(Exception):
         self.msg = msg % args
 
 
-def execute(cmd, silent=False, cwd=".", env=None):
+def execute(cmd, silent=False, cwd=".", env=None, output=None):
     try:
         log.debug("Run: %s", cmd)
         if env is not None:
@@ -47,7 +48,7 @@ def execute(cmd, silent=False, cwd=".", env=None):
         if silent:
             return check_output(cmd, stderr=STDOUT, cwd=cwd, env=env).decode("latin-1")
         else:
-            return check_call(cmd, cwd=cwd, env=env)
+            return check_call(cmd, cwd=cwd, env=env, stdout=output, stderr=STDOUT if output else None)
     except CalledProcessError as e:
         if silent:
             log.debug("Process returned: %d", e.returncode)
@@ -177,27 +178,71 @@ class CMakeCache:
 
 
 class TempEnvDir:
-    def __init__(self, envname, prefix):
+    def __init__(self, envname, prefix, environ=None):
         self.envname = envname
         self.prefix = prefix
+        self.environ = os.environ if environ is None else environ  # environment of a child process
         self.saved_name = None
         self.new_name = None
 
     def init(self):
-        self.saved_name = os.environ.get(self.envname)
+        self.saved_name = self.environ.get(self.envname)
         self.new_name = tempfile.mkdtemp(prefix=self.prefix, dir=self.saved_name or None)
-        os.environ[self.envname] = self.new_name
+        self.environ[self.envname] = self.new_name
 
     def clean(self):
         if self.saved_name:
-            os.environ[self.envname] = self.saved_name
+            self.environ[self.envname] = self.saved_name
         else:
-            del os.environ[self.envname]
+            del self.environ[self.envname]
         try:
             shutil.rmtree(self.new_name)
         except:
             pass
 
 
+def mergeTestLogs(inputs, output):
+    """
+    Merges Google Test XML logs of the shards of one test executable into one log.
+    Returns False if there is nothing to merge.
+    """
+    counters = ["tests", "failures", "disabled", "errors"]
+
+    def add(dst, src):
+        for name in counters:
+            dst.set(name, str(int(dst.get(name, 0)) + int(src.get(name, 0))))
+
+    root = None
+    suites = {}
+    for fname in inputs:
+        try:
+            shard = ET.parse(fname).getroot()
+        except (IOError, OSError, ET.ParseError) as e:
+            log.error("Can not read the log of the shard: %s (%s)", fname, e)
+            continue
+        if root is None:
+            root = ET.Element(shard.tag, shard.attrib)  # cv_* properties are the same in all shards
+            for name in counters:
+                root.set(name, "0")
+        add(root, shard)
+        # the shards are run concurrently
+        root.set("time", "%.3f" % max(float(root.get("time", 0)), float(shard.get("time", 0))))
+        timestamp = shard.get("timestamp")
+        if timestamp and (root.get("timestamp") is None or timestamp < root.get("timestamp")):
+            root.set("timestamp", timestamp)
+        for suite in shard.findall("testsuite"):
+            merged = suites.get(suite.get("name"))
+            if merged is None:
+                merged = suites[suite.get("name")] = ET.SubElement(root, suite.tag, suite.attrib)
+            else:
+                add(merged, suite)
+                merged.set("time", "%.3f" % (float(merged.get("time", 0)) + float(suite.get("time", 0))))
+            merged.extend(list(suite))
+    if root is None:
+        return False
+    ET.ElementTree(root).write(output, encoding="UTF-8", xml_declaration=True)
+    return True
+
+
 if __name__ == "__main__":
     log.error("This is utility file, please execute run.py script")
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import testlog_parser, sys, os, xml, glob, re
+import multiprocessing
 from table_formatter import *
 from optparse import OptionParser
 
@@ -24,6 +25,69 @@ def getSetName(tset, idx, columns, short = True):
         return prefix + "\n" + ("-"*int(len(max(prefix.split("\n"), key=len))*1.5)) + "\n" + name
     return name
 
+def loadTestSet(task):
+    """
+    Parses one log, returns (TestRunInfo or None, error message or None).
+    Called in the worker processes, so the tests are returned in the compact form if 'compact' is set.
+    """
+    fname, filter_regex, skip_notrun, cache, compact = task
+    expr = re.compile(filter_regex) if filter_regex else None
+    def test_filter(t):
+        if expr and not expr.search(str(t)):
+            return False
+        if skip_notrun and t.get("status") == "notrun":
+            return False
+        return True
+    try:
+        tests = testlog_parser.parseLogFile(fname, test_filter, cache)
+        return (testlog_parser.runToColumns(tests) if compact else tests), None
+    except IOError as err:
+        return None, "IOError reading \"" + fname + "\" - " + str(err)
+    except testlog_parser.ParseError as err:
+        return None, "ParseError reading \"" + fname + "\" - " + str(err)
+
+def loadTestSets(files, filter_regex, skip_notrun, cache, jobs):
+    """
+    Parses the logs with 'jobs' processes, returns the list of (file name, TestRunInfo) in the order of 'files'.
+    The logs without tests are skipped.
+    """
+    jobs = min(jobs, len(files))
+    tasks = [(fname, filter_regex, skip_notrun, cache, jobs > 1) for fname in files]
+    if jobs > 1:
+        pool = multiprocessing.Pool(jobs)
+        try:
+            results = pool.map(loadTestSet, tasks, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+        results = [(testlog_parser.runFromColumns(tests) if tests is not None else None, error)
+                   for tests, error in results]
+    else:
+        results = [loadTestSet(task) for task in tasks]
+
+    test_sets = []
+    for fname, (tests, error) in zip(files, results):
+        if error:
+            sys.stderr.write(error + os.linesep)
+        elif tests:
+            test_sets.append((os.path.basename(fname), tests))
+    return test_sets
+
+def buildTestIndex(test_sets, name_extractor):
+    """
+    Returns dict: test name -> list of the test cases of each set (None if the set has no such test).
+    """
+    setsCount = len(test_sets)
+    test_cases = {}
+    for i in range(setsCount):
+        for case in test_sets[i][1]:
+            name = name_extractor(case)
+            cases = test_cases.get(name)
+            if cases is None:
+                cases = test_cases[name] = [None] * setsCount
+            cases[i] = case
+    return test_cases
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print >> sys.stderr, "Usage:\n", os.path.basename(sys.argv[0]), "<log_name1>.xml [<log_name2>.xml ...]"
@@ -47,6 +111,8 @@ if __name__ == "__main__":
     parser.add_option("", "--regressions-only", dest="regressionsOnly", default=None, metavar="X-FACTOR", help="show only tests with performance regressions not")
     parser.add_option("", "--intersect-logs", dest="intersect_logs", default=False, help="show only tests present in all log files")
     parser.add_option("", "--show_units", action="store_true", dest="show_units", help="append units into table cells")
+    parser.add_option("", "--no-cache", action="store_false", dest="cache", default=True, help="do not use the cache of parsed logs")
+    parser.add_option("-j", "--jobs", dest="jobs", type="int", default=None, metavar="N", help="number of processes parsing the logs (default: number of CPUs)")
     (options, args) = parser.parse_args()
 
     options.generateHtml = detectHtmlOutputType(options.format)
@@ -91,22 +157,9 @@ if __name__ == "__main__":
             if fname not in seen and not seen.add(fname):
                 files.append(fname)
 
-    # read all passed files
-    test_sets = []
-    for arg in files:
-        try:
-            tests = testlog_parser.parseLogFile(arg)
-            if options.filter:
-                expr = re.compile(options.filter)
-                tests = [t for t in tests if expr.search(str(t))]
-            if options.match:
-                tests = [t for t in tests if t.get("status") != "notrun"]
-            if tests:
-                test_sets.append((os.path.basename(arg), tests))
-        except IOError as err:
-            sys.stderr.write("IOError reading \"" + arg + "\" - " + str(err) + os.linesep)
-        except xml.parsers.expat.ExpatError as err:
-            sys.stderr.write("ExpatError reading \"" + arg + "\" - " + str(err) + os.linesep)
+    # read all passed files, the filtered out tests are dropped while the logs are parsed
+    jobs = options.jobs if options.jobs is not None else multiprocessing.cpu_count()
+    test_sets = loadTestSets(files, options.filter, bool(options.match), options.cache, max(1, jobs))
 
     if not test_sets:
         sys.stderr.write("Error: no test data found" + os.linesep)
@@ -124,21 +177,15 @@ if __name__ == "__main__":
         assert ref < setsCount
 
     # find matches
-    test_cases = {}
-
     name_extractor = lambda name: str(name)
     if options.match:
         reg = re.compile(options.match)
         name_extractor = lambda name: reg.sub(options.match_replace, str(name))
+    if options.module:
+        module_extractor = name_extractor
+        name_extractor = lambda name: options.module + "::" + module_extractor(name)
 
-    for i in range(setsCount):
-        for case in test_sets[i][1]:
-            name = name_extractor(case)
-            if options.module:
-                name = options.module + "::" + name
-            if name not in test_cases:
-                test_cases[name] = [None] * setsCount
-            test_cases[name][i] = case
+    test_cases = buildTestIndex(test_sets, name_extractor)
 
     # build table
     getter = metrix_table[options.metric][1]
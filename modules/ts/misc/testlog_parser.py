@@ -1,33 +1,48 @@
 #!/usr/bin/env python
 
 from __future__ import print_function
-import collections
+import array
+import hashlib
 import re
 import os.path
+import pickle
 import sys
-from xml.dom.minidom import parse
+import time
+try:
+    import xml.etree.cElementTree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+try:
+    from collections.abc import Sequence
+except ImportError:  # Python 2
+    from collections import Sequence
 
 if sys.version_info > (3,):
     long = int
     def cmp(a, b): return (a>b)-(a<b)
 
+ParseError = ET.ParseError
+
 class TestInfo(object):
+    __slots__ = ("fixture", "name", "value_param", "type_param", "status", "properties", "metrix")
 
     def __init__(self, xmlnode):
-        self.fixture = xmlnode.getAttribute("classname")
-        self.name = xmlnode.getAttribute("name")
-        self.value_param = xmlnode.getAttribute("value_param")
-        self.type_param = xmlnode.getAttribute("type_param")
+        # xmlnode is ElementTree element of <testcase>
+        attrs = xmlnode.attrib
+        self.fixture = attrs.get("classname", "")
+        self.name = attrs.get("name", "")
+        self.value_param = attrs.get("value_param", "")
+        self.type_param = attrs.get("type_param", "")
 
-        custom_status = xmlnode.getAttribute("custom_status")
-        failures = xmlnode.getElementsByTagName("failure")
+        custom_status = attrs.get("custom_status", "")
+        failures = xmlnode.find(".//failure")
 
         if len(custom_status) > 0:
             self.status = custom_status
-        elif len(failures) > 0:
+        elif failures is not None:
             self.status = "failed"
         else:
-            self.status = xmlnode.getAttribute("status")
+            self.status = attrs.get("status", "")
 
         if self.name.startswith("DISABLED_"):
             if self.status == 'notrun':
@@ -35,54 +50,54 @@ class TestInfo(object):
             self.fixture = self.fixture.replace("DISABLED_", "")
             self.name = self.name.replace("DISABLED_", "")
         self.properties = {
-            prop.getAttribute("name") : prop.getAttribute("value")
-            for prop in xmlnode.getElementsByTagName("property")
-            if prop.hasAttribute("name") and prop.hasAttribute("value")
+            prop.get("name") : prop.get("value")
+            for prop in xmlnode.iter("property")
+            if "name" in prop.attrib and "value" in prop.attrib
         }
         self.metrix = {}
-        self.parseLongMetric(xmlnode, "bytesIn");
-        self.parseLongMetric(xmlnode, "bytesOut");
-        self.parseIntMetric(xmlnode, "samples");
-        self.parseIntMetric(xmlnode, "outliers");
-        self.parseFloatMetric(xmlnode, "frequency", 1);
-        self.parseLongMetric(xmlnode, "min");
-        self.parseLongMetric(xmlnode, "median");
-        self.parseLongMetric(xmlnode, "gmean");
-        self.parseLongMetric(xmlnode, "mean");
-        self.parseLongMetric(xmlnode, "stddev");
-        self.parseFloatMetric(xmlnode, "gstddev");
-        self.parseFloatMetric(xmlnode, "time");
-        self.parseLongMetric(xmlnode, "total_memory_usage");
-
-    def parseLongMetric(self, xmlnode, name, default = 0):
+        self.parseLongMetric(attrs, "bytesIn");
+        self.parseLongMetric(attrs, "bytesOut");
+        self.parseIntMetric(attrs, "samples");
+        self.parseIntMetric(attrs, "outliers");
+        self.parseFloatMetric(attrs, "frequency", 1);
+        self.parseLongMetric(attrs, "min");
+        self.parseLongMetric(attrs, "median");
+        self.parseLongMetric(attrs, "gmean");
+        self.parseLongMetric(attrs, "mean");
+        self.parseLongMetric(attrs, "stddev");
+        self.parseFloatMetric(attrs, "gstddev");
+        self.parseFloatMetric(attrs, "time");
+        self.parseLongMetric(attrs, "total_memory_usage");
+
+    def parseLongMetric(self, attrs, name, default = 0):
         if name in self.properties:
             self.metrix[name] = long(self.properties[name])
-        elif xmlnode.hasAttribute(name):
-            self.metrix[name] = long(xmlnode.getAttribute(name))
+        elif name in attrs:
+            self.metrix[name] = long(attrs[name])
         else:
             self.metrix[name] = default
 
-    def parseIntMetric(self, xmlnode, name, default = 0):
+    def parseIntMetric(self, attrs, name, default = 0):
         if name in self.properties:
             self.metrix[name] = int(self.properties[name])
-        elif xmlnode.hasAttribute(name):
-            self.metrix[name] = int(xmlnode.getAttribute(name))
+        elif name in attrs:
+            self.metrix[name] = int(attrs[name])
         else:
             self.metrix[name] = default
 
-    def parseFloatMetric(self, xmlnode, name, default = 0):
+    def parseFloatMetric(self, attrs, name, default = 0):
         if name in self.properties:
             self.metrix[name] = float(self.properties[name])
-        elif xmlnode.hasAttribute(name):
-            self.metrix[name] = float(xmlnode.getAttribute(name))
+        elif name in attrs:
+            self.metrix[name] = float(attrs[name])
         else:
             self.metrix[name] = default
 
-    def parseStringMetric(self, xmlnode, name, default = None):
+    def parseStringMetric(self, attrs, name, default = None):
         if name in self.properties:
             self.metrix[name] = self.properties[name].strip()
-        elif xmlnode.hasAttribute(name):
-            self.metrix[name] = xmlnode.getAttribute(name).strip()
+        elif name in attrs:
+            self.metrix[name] = attrs[name].strip()
         else:
             self.metrix[name] = default
 
@@ -184,7 +199,7 @@ class TestInfo(object):
 
 # This is a Sequence for compatibility with old scripts,
 # which treat parseLogFile's return value as a list.
-class TestRunInfo(collections.Sequence):
+class TestRunInfo(Sequence):
     def __init__(self, properties, tests):
         self.properties = properties
         self.tests = tests
@@ -195,18 +210,183 @@ class TestRunInfo(collections.Sequence):
     def __getitem__(self, key):
         return self.tests[key]
 
-def parseLogFile(filename):
-    log = parse(filename)
-
-    properties = {
-        attr_name[3:]: attr_value
-        for (attr_name, attr_value) in log.documentElement.attributes.items()
-        if attr_name.startswith('cv_')
-    }
-
-    tests = list(map(TestInfo, log.getElementsByTagName("testcase")))
-
-    return TestRunInfo(properties, tests)
+def iterLogFile(filename, properties=None):
+    """
+    Yields TestInfo of each testcase of the log while the file is parsed, the document tree is not built.
+    The attributes of the root element with 'cv_' prefix are stored into the 'properties' dict (if it is given).
+    """
+    stack = []
+    for event, elem in ET.iterparse(filename, events=("start", "end")):
+        if event == "start":
+            if not stack and properties is not None:
+                properties.update(
+                    (attr_name[3:], attr_value)
+                    for (attr_name, attr_value) in elem.attrib.items()
+                    if attr_name.startswith('cv_')
+                )
+            stack.append(elem)
+            continue
+        stack.pop()
+        if elem.tag == "testcase":
+            yield TestInfo(elem)
+            if stack:
+                del stack[-1][-1]  # parsed testcase is the last child, drop it
+
+def parseLogFile(filename, test_filter=None, cache=False):
+    """
+    Returns TestRunInfo of the log. Only the tests accepted by test_filter(test) are kept, if it is given.
+
+    With 'cache' the parsed run is stored in the cache directory (see getCacheDir()) by the hash of the file
+    content, the next calls load it from there instead of parsing the XML. The command line tools enable it.
+    """
+    cache_dir = getCacheDir() if cache else None
+    if not cache_dir:
+        properties = {}
+        tests = [t for t in iterLogFile(filename, properties) if test_filter is None or test_filter(t)]
+        return TestRunInfo(properties, tests)
+
+    entry = _run_cache_entry(cache_dir, filename)
+    columns = _run_cache_load(entry)
+    if columns is not None:
+        run = runFromColumns(columns)
+    else:
+        properties = {}
+        run = TestRunInfo(properties, list(iterLogFile(filename, properties)))
+        _run_cache_store(entry, runToColumns(run))
+    if test_filter is not None:
+        run.tests = [t for t in run.tests if test_filter(t)]
+    return run
+
+# Cache of the parsed logs.
+# A run is stored in the columnar form: the string fields of the tests are dictionary-encoded,
+# the metrics are arrays (if all values have the same type), the test properties are kept for the tests
+# which have them only.
+
+_CACHE_VERSION = 2
+_STRING_FIELDS = ("fixture", "name", "value_param", "type_param", "status")
+_INT_TYPECODE = "q" if sys.version_info > (3,) else "l"
+
+def getCacheDir():
+    """
+    Returns the directory of the parsed logs cache: $OPENCV_TESTLOG_CACHE_DIR or ~/.cache/opencv/testlog.
+    An empty OPENCV_TESTLOG_CACHE_DIR disables the cache.
+    """
+    cache_dir = os.environ.get("OPENCV_TESTLOG_CACHE_DIR")
+    if cache_dir is None:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        cache_dir = os.path.join(base, "opencv", "testlog")
+    return cache_dir
+
+# The cache is shared by all logs and builds, so the entries are evicted by age: an entry which is not loaded
+# for _CACHE_MAX_AGE seconds is removed when a new one is stored (loading an entry updates its modification time).
+
+_CACHE_MAX_AGE = 30 * 24 * 3600
+_parser_hash = None
+
+def _run_cache_entry(cache_dir, filename):
+    """
+    Returns the path of the cache entry of the log. Its name is the hash of the log content,
+    of this parser source, of the Python version and of _CACHE_VERSION.
+    """
+    global _parser_hash
+    if _parser_hash is None:
+        with open(os.path.splitext(os.path.abspath(__file__))[0] + ".py", "rb") as f:
+            _parser_hash = hashlib.sha1(f.read()).hexdigest()
+    h = hashlib.sha1()
+    h.update(("%s|%d|%d|" % (_parser_hash, sys.version_info[0], _CACHE_VERSION)).encode("utf-8"))
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return os.path.join(cache_dir, h.hexdigest() + ".pickle")
+
+def _run_cache_load(entry):
+    try:
+        with open(entry, "rb") as f:
+            columns = pickle.load(f)
+    except Exception:
+        return None
+    try:
+        os.utime(entry, None)
+    except OSError:
+        pass
+    return columns
+
+def _run_cache_store(entry, columns):
+    cache_dir = os.path.dirname(entry)
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        tmp_entry = "%s.%d.tmp" % (entry, os.getpid())
+        with open(tmp_entry, "wb") as f:
+            pickle.dump(columns, f, 2)
+        try:
+            os.rename(tmp_entry, entry)
+        except OSError:
+            os.remove(tmp_entry)  # Windows: already stored by a concurrent process
+        _run_cache_evict(cache_dir)
+    except (IOError, OSError) as e:
+        sys.stderr.write("Warning: can't store the cache entry in %s: %s\n" % (cache_dir, e))
+
+def _run_cache_evict(cache_dir):
+    deadline = time.time() - _CACHE_MAX_AGE
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".pickle"):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            if os.path.getmtime(path) < deadline:
+                os.remove(path)
+        except OSError:
+            pass  # removed by a concurrent process
+
+def runToColumns(run):
+    """
+    Returns the compact (columnar) picklable form of TestRunInfo, see runFromColumns().
+    """
+    strings = {}
+    for field in _STRING_FIELDS:
+        values, indexes = {}, array.array("i")
+        for t in run.tests:
+            indexes.append(values.setdefault(getattr(t, field), len(values)))
+        strings[field] = (sorted(values, key=values.get), indexes)
+    metrix = {}
+    for name in (run.tests[0].metrix if run.tests else ()):
+        metrix[name] = _metricColumn([t.metrix[name] for t in run.tests])
+    test_properties = dict((i, t.properties) for i, t in enumerate(run.tests) if t.properties)
+    return dict(version=_CACHE_VERSION, count=len(run.tests), properties=run.properties,
+                strings=strings, metrix=metrix, test_properties=test_properties)
+
+def _metricColumn(values):
+    # the values keep their types: a metric which isn't in the log has an int default value
+    # even if the metric is float, such column is stored as the list
+    if all(type(v) is float for v in values):
+        return array.array("d", values)
+    if all(type(v) is int for v in values):  # Python 2: the longs are kept in the list
+        try:
+            return array.array(_INT_TYPECODE, values)
+        except OverflowError:
+            pass
+    return values
+
+def runFromColumns(columns):
+    """
+    Restores TestRunInfo from the result of runToColumns().
+    """
+    count = columns["count"]
+    fields = [[values[j] for j in indexes] for values, indexes in
+              (columns["strings"][field] for field in _STRING_FIELDS)]
+    names = list(columns["metrix"].keys())
+    rows = zip(*[list(columns["metrix"][name]) for name in names]) if names else [()] * count
+    test_properties = columns["test_properties"]
+    new = TestInfo.__new__
+    tests = []
+    for i, (fixture, name, value_param, type_param, status), row in zip(range(count), zip(*fields), rows):
+        t = new(TestInfo)
+        t.fixture, t.name, t.value_param, t.type_param, t.status = fixture, name, value_param, type_param, status
+        t.metrix = dict(zip(names, row))
+        t.properties = test_properties.get(i, {})
+        tests.append(t)
+    return TestRunInfo(columns["properties"], tests)
 
 
 if __name__ == "__main__":
@@ -110,8 +110,9 @@ header_style = xlwt.easyxf('font: bold true; alignment: horizontal centre, verti
 subheader_style = xlwt.easyxf('alignment: horizontal centre, vertical top')
 
 class Collector(object):
-    def __init__(self, config_match_func, include_unmatched):
+    def __init__(self, config_match_func, include_unmatched, use_cache=False):
         self.__config_cache = {}
+        self.use_cache = use_cache
         self.config_match_func = config_match_func
         self.include_unmatched = include_unmatched
         self.tests = {}
@@ -129,7 +130,7 @@ class Collector(object):
         )
 
     def collect_from(self, xml_path, default_configuration):
-        run = parseLogFile(xml_path)
+        run = parseLogFile(xml_path, cache=self.use_cache)
 
         module = run.properties['module_name']
 
@@ -199,6 +200,8 @@ def main():
         help='include results from XML files that were not recognized by configuration matchers')
     arg_parser.add_argument('--show-times-per-pixel', action='store_true',
         help='for tests that have an image size parameter, show per-pixel time, as well as total time')
+    arg_parser.add_argument('--no-cache', dest='cache', action='store_false',
+        help='do not use the cache of parsed logs')
 
     args = arg_parser.parse_args()
 
@@ -226,7 +229,7 @@ def main():
         config_names = sheet_conf.get('configurations', [])
         config_matchers = sheet_conf.get('configuration_matchers', [])
 
-        collector = Collector(make_match_func(config_matchers), args.include_unmatched)
+        collector = Collector(make_match_func(config_matchers), args.include_unmatched, args.cache)
 
         for root, _, filenames in os.walk(sheet_path):
             logging.info('looking in %s', root)
@@ -14,6 +14,9 @@ args = parser.parse_args()
 
 #! [CropLayer]
 class CropLayer(object):
+    # forward() fills the preallocated outputs
+    forwardOutputs = True
+
     def __init__(self, params, blobs):
         self.xstart = 0
         self.xend = 0
@@ -34,8 +37,10 @@ class CropLayer(object):
 
         return [[batchSize, numChannels, height, width]]
 
-    def forward(self, inputs):
-        return [inputs[0][:,:,self.ystart:self.yend,self.xstart:self.xend]]
+    # Outputs are preallocated with the shapes returned by getMemoryShapes,
+    # the layer fills them in-place
+    def forward(self, inputs, outputs):
+        outputs[0][...] = inputs[0][:,:,self.ystart:self.yend,self.xstart:self.xend]
 #! [CropLayer]
 
 #! [Register]